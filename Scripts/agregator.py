@@ -628,7 +628,7 @@ def run_unified_pipeline():
         'phillipjones': 'phillipjoneslaw_foreclosures.csv',
         'tnledger': 'foreclosure_notices_tnledger_detailed.csv',
         'powerbi': 'logs_com_powerbi_data.csv',
-        'wilson': 'wilson_assoc_foreclosures.csv'
+        'wilson': 'wilson_assoc_foreclosures/SearchState=TN/sales.csv'
     }
     
     # Load and standardize each source
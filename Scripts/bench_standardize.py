@@ -0,0 +1,303 @@
+"""Benchmark the vectorized source standardization against the row-wise code it replaced.
+
+    python bench_standardize.py [--rows 100000] [--repeat 1]
+
+Generates --rows synthetic raw records split evenly across the sources, standardizes them both ways and prints
+the best of --repeat timings; the row-wise code needs about a minute for the default 100k rows.
+The legacy_* functions are the pre-vectorization standardize_* code, kept unchanged as the reference that
+tests/test_standardize_golden.py checks the current output against.
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from unifier import SOURCE_SPECS, standardize_source
+
+# --- Configuration ---
+DEFAULT_ROWS = 100000   # Synthetic records across all sources
+DEFAULT_REPEAT = 1      # Timed runs per implementation; the best one is reported
+SEED = 26
+
+# --- The row-wise implementation, as it was before vectorization ---
+class LegacyAddressParser:
+    @staticmethod
+    def extract_city_from_address(address):
+        if not address or pd.isna(address):
+            return ""
+
+        address = str(address)
+        patterns = [
+            r',\s*([A-Za-z\s]+)\s+TN\s*,?\s*\d{5}',
+            r',\s*([A-Za-z\s]+)\s*,\s*TN',
+            r',\s*([A-Za-z\s]+)\s+Tennessee',
+            r'\b([A-Za-z\s]+),\s*Tennessee\s*\d{5}',
+        ]
+
+        for pattern in patterns:
+            match = re.search(pattern, address, re.IGNORECASE)
+            if match:
+                city = match.group(1).strip()
+                city = re.sub(r'\s+(TN|Tennessee)$', '', city, flags=re.IGNORECASE)
+                return city.title()
+        return ""
+
+    @staticmethod
+    def get_county_first_letter(county):
+        if not county or pd.isna(county):
+            return ""
+        county = str(county).strip()
+        return county[0].upper() if county else ""
+
+    @staticmethod
+    def standardize_date(date_str):
+        if not date_str or pd.isna(date_str):
+            return ""
+
+        try:
+            dt = pd.to_datetime(date_str, errors='coerce')
+            if pd.notna(dt):
+                return dt.strftime('%m/%d/%Y')
+        except:
+            pass
+        return str(date_str)
+
+    @staticmethod
+    def standardize_time(time_str):
+        if not time_str or pd.isna(time_str):
+            return ""
+
+        time_str = str(time_str).strip()
+        time_formats = ['%I:%M %p', '%H:%M', '%I:%M:%S %p', '%H:%M:%S']
+
+        for fmt in time_formats:
+            try:
+                dt = datetime.strptime(time_str, fmt)
+                return dt.strftime('%I:%M %p')
+            except ValueError:
+                continue
+        return time_str
+
+def legacy_standardize_clearrecon(df):
+    if df.empty:
+        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+
+    result = pd.DataFrame()
+    result['SOURCE'] = df['SourceWebsite']
+    result['DATE'] = df['SaleDate'].apply(LegacyAddressParser.standardize_date)
+    result['TIME'] = ""
+    result['ADDRESS'] = df['PropertyAddress']
+    result['CTY'] = df['PropertyAddress'].apply(LegacyAddressParser.extract_city_from_address)
+    result['FIRM'] = "ClearRecon"
+
+    # Extract county from address for PL
+    county_from_address = df['PropertyAddress'].apply(lambda x: re.search(r'(\w+)\s+County', str(x), re.IGNORECASE))
+    result['PL'] = county_from_address.apply(lambda x: x.group(1)[0].upper() if x else "")
+
+    return result
+
+def legacy_standardize_phillipjones(df):
+    if df.empty:
+        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+
+    result = pd.DataFrame()
+    result['SOURCE'] = df['SourceWebsite']
+    result['DATE'] = df['SaleDate'].apply(LegacyAddressParser.standardize_date)
+    result['TIME'] = df['SaleTime'].apply(LegacyAddressParser.standardize_time)
+    result['ADDRESS'] = df['PropertyAddress']
+    result['CTY'] = df['PropertyAddress'].apply(LegacyAddressParser.extract_city_from_address)
+    result['FIRM'] = "Phillip Jones Law"
+    result['PL'] = df['County'].apply(LegacyAddressParser.get_county_first_letter)
+
+    return result
+
+def legacy_standardize_tnledger(df):
+    if df.empty:
+        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+
+    result = pd.DataFrame()
+    result['SOURCE'] = df.get('details_url', 'tnledger.com')
+
+    # Use detailed date if available, otherwise list date
+    date_field = df['advertised_auction_date_detail'].fillna(df['advertised_auction_date_list'])
+    result['DATE'] = date_field.apply(LegacyAddressParser.standardize_date)
+
+    # Extract time from sale details text
+    def extract_time(row):
+        sale_text = row.get('sale_details_text', '')
+        if not sale_text or pd.isna(sale_text):
+            return ""
+
+        time_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)', str(sale_text), re.IGNORECASE)
+        return LegacyAddressParser.standardize_time(time_match.group(1)) if time_match else ""
+
+    result['TIME'] = df.apply(extract_time, axis=1)
+
+    # Use detailed address if available
+    address_field = df['address_detail'].fillna(df['property_address_list'])
+    result['ADDRESS'] = address_field
+    result['CTY'] = address_field.apply(LegacyAddressParser.extract_city_from_address)
+
+    # Extract firm from attorney or substitute_trustee
+    def extract_firm(row):
+        attorney = row.get('attorney', '')
+        substitute_trustee = row.get('substitute_trustee', '')
+
+        if substitute_trustee and substitute_trustee not in ["Not found", "", None]:
+            return str(substitute_trustee)
+        elif attorney and attorney not in ["Not found", "", None]:
+            return str(attorney)
+        else:
+            return "TN Ledger"
+
+    result['FIRM'] = df.apply(extract_firm, axis=1)
+
+    # Extract county from address or sale details
+    def extract_county_pl(row):
+        address = row.get('address_detail', row.get('property_address_list', ''))
+        sale_text = row.get('sale_details_text', '')
+
+        # Try address first
+        county_match = re.search(r'(\w+)\s+County', str(address), re.IGNORECASE)
+        if county_match:
+            return county_match.group(1)[0].upper()
+
+        # Try sale details
+        county_match = re.search(r'(\w+)\s+County,?\s+Tennessee', str(sale_text), re.IGNORECASE)
+        if county_match:
+            return county_match.group(1)[0].upper()
+
+        return ""
+
+    result['PL'] = df.apply(extract_county_pl, axis=1)
+
+    return result
+
+def legacy_standardize_powerbi(df):
+    if df.empty:
+        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+
+    result = pd.DataFrame()
+    result['SOURCE'] = df['SourceWebsite']
+    result['DATE'] = df['SALE_DATE'].apply(LegacyAddressParser.standardize_date)
+    result['TIME'] = df['SALE_TIME'].apply(LegacyAddressParser.standardize_time)
+    result['ADDRESS'] = df['FULL_ADDRESS']
+    result['CTY'] = df['FULL_ADDRESS'].apply(LegacyAddressParser.extract_city_from_address)
+    result['FIRM'] = "Logs.com"
+    result['PL'] = df['COUNTY_NAME'].apply(LegacyAddressParser.get_county_first_letter)
+
+    return result
+
+def legacy_standardize_wilson(df):
+    if df.empty:
+        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+
+    result = pd.DataFrame()
+    result['SOURCE'] = df['SourceWebsite']
+    result['DATE'] = df['SaleDate'].apply(LegacyAddressParser.standardize_date)
+    result['TIME'] = df['SaleTime'].apply(LegacyAddressParser.standardize_time)
+    result['ADDRESS'] = df['PropertyAddress']
+    result['CTY'] = df.get('City', '')
+    result['FIRM'] = df.get('Auctioneer', 'Wilson Associates')
+    result['PL'] = df['County'].apply(LegacyAddressParser.get_county_first_letter)
+
+    return result
+
+LEGACY_STANDARDIZERS = {
+    'clearrecon': legacy_standardize_clearrecon,
+    'phillipjones': legacy_standardize_phillipjones,
+    'tnledger': legacy_standardize_tnledger,
+    'powerbi': legacy_standardize_powerbi,
+    'wilson': legacy_standardize_wilson,
+}
+
+# --- Synthetic input ---
+STREETS = ['1512 Elm Hill Pike', '400 Lake Rd', '88 Cedar Ct', '12 Main St', '2301 Old Hickory Blvd']
+CITIES = ['Nashville', 'Lebanon', 'Murfreesboro', 'Franklin', 'Mt Juliet']
+COUNTIES = ['Davidson', 'Wilson', 'Rutherford', 'Williamson', 'Sumner']
+ZIPS = ['37210', '37087', '37130', '37064', '37122']
+TIMES = ['10:00 AM', '11:00 AM', '12:00 PM', '01:00 PM', '9:30 AM']
+FIRMS = ['Rubin Lublin TN, PLLC', 'Mackie Wolf Zientz & Mann, P.C.', 'Brock & Scott, PLLC', 'Not found']
+
+def synthetic_sources(rows, seed=SEED):
+    """Raw DataFrames shaped like each scraper's CSV, with the same mix of formats and gaps"""
+    rng = np.random.default_rng(seed)
+
+    def pick(values):
+        return pd.Series(np.asarray(values, dtype=object)[rng.integers(len(values), size=rows)])
+
+    def with_gaps(values, rate):
+        return values.where(rng.random(rows) >= rate)
+
+    dates = pd.Timestamp('2025-07-01') + pd.to_timedelta(rng.integers(0, 120, size=rows), unit='D')
+    us_dates = pd.Series(dates.strftime('%m/%d/%Y'))
+    place = rng.integers(len(CITIES), size=rows)
+    street = pick(STREETS)
+    city = pd.Series(np.asarray(CITIES, dtype=object)[place])
+    county = pd.Series(np.asarray(COUNTIES, dtype=object)[place])
+    zip_code = pd.Series(np.asarray(ZIPS, dtype=object)[place])
+    full_address = street + ', ' + city + ', TN ' + zip_code
+    sale_time = pick(TIMES)
+
+    return {
+        'clearrecon': pd.DataFrame({
+            'SourceWebsite': 'clearrecon-tn.com', 'TS_Number': pd.Series(range(rows)).astype(str),
+            'PropertyAddress': street + ', ' + county + ' County, ' + city + ', TN ' + zip_code,
+            'SaleDate': us_dates, 'CurrentBid': '',
+        }),
+        'phillipjones': pd.DataFrame({
+            'SourceWebsite': 'phillipjoneslaw.com', 'CaseNumber': pd.Series(range(rows)).astype(str),
+            'PropertyAddress': full_address, 'County': county, 'SaleDate': us_dates,
+            'SaleTime': with_gaps(sale_time, 0.1), 'Status': with_gaps(pick(['Postponed']), 0.8),
+        }),
+        'tnledger': pd.DataFrame({
+            'property_address_list': street + ' ' + city, 'advertised_auction_date_list': us_dates,
+            'details_url': 'https://www.tnledger.com/Search/Details/ViewNotice.aspx?id=' + pd.Series(range(rows)).astype(str),
+            'address_detail': with_gaps(full_address, 0.05), 'attorney': with_gaps(pick(FIRMS), 0.05),
+            'substitute_trustee': with_gaps(pick(FIRMS), 0.05), 'advertised_auction_date_detail': with_gaps(us_dates, 0.05),
+            'sale_details_text': with_gaps('will be sold at public auction at ' + sale_time + ' at the ' + county
+                                           + ' County Courthouse, ' + county + ' County, Tennessee', 0.05),
+        }),
+        'powerbi': pd.DataFrame({
+            'COUNTY_NAME': county.str.upper(), 'SALE_DATE': pd.Series(dates.strftime('%Y-%m-%dT%H:%M:%S')),
+            'SALE_TIME': with_gaps(sale_time, 0.1), 'FULL_ADDRESS': full_address.str.upper(), 'BID_AMNT': None,
+            'SourceWebsite': 'logs.com (Power BI)',
+        }),
+        'wilson': pd.DataFrame({
+            'SourceWebsite': 'sales.wilson-assoc.com', 'SaleDate': us_dates, 'SaleTime': sale_time,
+            'PriorSaleDate': '', 'PropertyAddress': street, 'City': city, 'County': county, 'State': 'TN',
+            'ZipCode': zip_code, 'SaleLocation': county + ' County Courthouse', 'Auctioneer': 'Wilson & Associates',
+        }),
+    }
+
+def best_time(fn, df, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time row-wise vs vectorized source standardization")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="synthetic records across all sources")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timed runs per implementation")
+    args = parser.parse_args()
+
+    sources = synthetic_sources(max(args.rows // len(SOURCE_SPECS), 1))
+    print(f"{'source':<14}{'row-wise':>12}{'vectorized':>12}{'speedup':>10}")
+    total_old = total_new = 0.0
+    for source_name in SOURCE_SPECS:
+        df = sources[source_name]
+        old = best_time(LEGACY_STANDARDIZERS[source_name], df, args.repeat)
+        new = best_time(lambda raw: standardize_source(source_name, raw), df, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{source_name:<14}{old:>11.3f}s{new:>11.3f}s{old / new:>9.1f}x")
+    print(f"{'total':<14}{total_old:>11.3f}s{total_new:>11.3f}s{total_old / total_new:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
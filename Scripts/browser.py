@@ -0,0 +1,365 @@
+import atexit
+import importlib.util
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from run_metrics import METRICS
+
+# --- Configuration ---
+CHROMEDRIVER_PATH_ENV = 'CHROMEDRIVER_PATH'   # Use this chromedriver and never ask webdriver-manager
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'foreclosure-pipeline', 'chromedriver.json')
+DRIVER_CACHE_MAX_AGE_DAYS = 7                  # Re-resolve weekly so Chrome auto-updates are followed
+BROWSER_POOL_SIZE = 1                          # Warm Chrome instances kept per process (warm across runs only under --daemon)
+BROWSER_MAX_JOBS = 20                          # Restart an instance after this many jobs...
+BROWSER_MAX_MEMORY_GROWTH_MB = 500             # ...or once it has grown this much since launch (needs psutil)
+PAGE_LOAD_TIMEOUT = 60
+WINDOW_SIZE = "1920x1080"
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/91.0.4472.124 Safari/537.36")
+
+# Lean profile: the scrapers only read one table per site, so skip everything that only paints the page
+LEAN_PROFILE = True
+PAGE_LOAD_STRATEGY = 'eager'                   # driver.get() returns at DOMContentLoaded; scrapers wait for their table
+# Resource types blocked by file extension (CDP can only block by URL without intercepting every request)
+BLOCKED_RESOURCE_TYPES = {
+    'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp'],
+    'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+    'stylesheet': ['css'],
+    'media': ['mp4', 'webm', 'mp3'],
+}
+BLOCKED_DOMAINS = [
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+    'facebook.net', 'facebook.com', 'hotjar.com', 'clarity.ms', 'fonts.googleapis.com', 'fonts.gstatic.com',
+    'gravatar.com', 'youtube.com', 'vimeo.com', 'addthis.com', 'sharethis.com',
+]
+
+def _cached_driver(max_age_days=DRIVER_CACHE_MAX_AGE_DAYS):
+    try:
+        with open(DRIVER_CACHE_FILE, encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.isfile(cached.get('path', '')):
+        return None
+    if max_age_days is not None and time.time() - cached.get('resolved_at', 0) > max_age_days * 86400:
+        return None
+    return cached['path']
+
+def chromedriver_path(refresh=False):
+    """Local chromedriver executable, resolved without a network round-trip whenever possible.
+
+    Order: $CHROMEDRIVER_PATH, the path webdriver-manager resolved on an earlier run (for up to a week),
+    webdriver-manager itself; offline, a stale cached path or a chromedriver on PATH.
+    """
+    configured = os.environ.get(CHROMEDRIVER_PATH_ENV)
+    if configured:
+        return configured
+    if not refresh:
+        cached = _cached_driver()
+        if cached:
+            return cached
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception as e:
+        fallback = _cached_driver(max_age_days=None) or shutil.which('chromedriver')
+        if not fallback:
+            raise
+        print(f"⚠️ Could not resolve chromedriver ({e}), using {fallback}")
+        return fallback
+    os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+    with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump({'path': path, 'resolved_at': time.time()}, f)
+    return path
+
+def start_chrome(options):
+    """Start Chrome with the cached chromedriver; if that driver no longer matches Chrome, re-resolve once"""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    try:
+        return webdriver.Chrome(service=ChromeService(chromedriver_path()), options=options)
+    except SessionNotCreatedException:
+        if os.environ.get(CHROMEDRIVER_PATH_ENV):
+            raise
+        return webdriver.Chrome(service=ChromeService(chromedriver_path(refresh=True)), options=options)
+
+def chrome_options():
+    """Headless Chrome settings shared by every Selenium scraper"""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"window-size={WINDOW_SIZE}")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    if LEAN_PROFILE:
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    return options
+
+def blocked_url_patterns():
+    patterns = [f"*.{extension}*" for extensions in BLOCKED_RESOURCE_TYPES.values() for extension in extensions]
+    return patterns + [f"*{domain}/*" for domain in BLOCKED_DOMAINS]
+
+def apply_lean_profile(driver):
+    """Block the lean profile's URL patterns in the driver's current tab"""
+    if not LEAN_PROFILE:
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns()})
+
+# --- In-browser extraction ---
+IN_BROWSER_EXTRACTION = True   # Read result tables with one execute_script call instead of shipping page_source
+
+# Rows of the first <tbody> of the table matching arguments[0], as the BeautifulSoup parsers see them:
+# whether the row has a <th>, the stripped text of each <td>, whether it is a single colspan cell, and whether
+# it holds or sits in a nested table (e.g. a GridView pager)
+TABLE_ROWS_SCRIPT = """
+const table = document.querySelector(arguments[0]);
+if (!table) return null;
+const body = table.querySelector('tbody');
+if (!body) return [];
+return Array.from(body.querySelectorAll('tr'), row => {
+    const cells = Array.from(row.querySelectorAll('td'));
+    return {
+        header: row.querySelector('th') !== null,
+        colspan: cells.length === 1 && cells[0].hasAttribute('colspan'),
+        nested: row.querySelector('table') !== null || row.closest('table') !== table,
+        cells: cells.map(cell => cell.textContent.trim()),
+    };
+});
+"""
+
+def extract_table_rows(driver, selector):
+    """Rows of the table matching a CSS selector, serialized in the page; None if it isn't there or the call fails"""
+    if not IN_BROWSER_EXTRACTION:
+        return None
+    try:
+        return driver.execute_script(TABLE_ROWS_SCRIPT, selector)
+    except Exception as e:
+        print(f"In-browser table extraction failed ({e}), falling back to page_source")
+        return None
+
+def soup_table_rows(table_body):
+    """The same row layout as TABLE_ROWS_SCRIPT, from a BeautifulSoup <tbody> (or the <table> itself, for
+    server HTML without one)"""
+    table = table_body if table_body.name == 'table' else table_body.find_parent('table')
+    rows = []
+    for row in table_body.find_all('tr'):
+        cells = row.find_all('td')
+        rows.append({'header': row.find('th') is not None,
+                     'colspan': len(cells) == 1 and cells[0].get('colspan') is not None,
+                     'nested': row.find('table') is not None or row.find_parent('table') is not table,
+                     'cells': [cell.text.strip() for cell in cells]})
+    return rows
+
+# Bytes fetched for the current document and every resource it loaded (cross-origin resources without
+# Timing-Allow-Origin report 0, so this is a lower bound)
+PAGE_BYTES_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return [entries.reduce((total, entry) => total + (entry.transferSize || 0), 0), entries.length];
+"""
+
+def report_page_bytes(driver, page):
+    """Record and print how much the current page downloaded"""
+    try:
+        transferred, requests = driver.execute_script(PAGE_BYTES_SCRIPT)
+    except Exception as e:
+        print(f"Could not measure page size: {e}")
+        return None
+    METRICS.page_bytes(page, transferred, requests)
+    print(f"📦 {page}: {transferred / 1024:.0f} KB in {requests} requests")
+    return transferred
+
+def _memory_mb(driver):
+    """Resident memory of chromedriver and every Chrome process under it, or None without psutil"""
+    if importlib.util.find_spec('psutil') is None:
+        return None
+    import psutil
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return sum(p.memory_info().rss for p in [root] + root.children(recursive=True)) / 2**20
+    except (psutil.Error, AttributeError):
+        return None
+
+class _Instance:
+    def __init__(self, driver):
+        self.driver = driver
+        self.home_window = driver.current_window_handle
+        self.jobs = 0
+        self.context = None
+        self.baseline_mb = _memory_mb(driver)
+
+class BrowserPool:
+    """Warm headless Chrome instances shared by the Selenium scrapers of one process.
+
+    acquire() hands out a driver focused on a fresh tab in its own browser context (separate cookies,
+    storage and cache, like an incognito window); release() disposes of that context and keeps Chrome
+    running for the next job, unless it has served BROWSER_MAX_JOBS jobs or grown past
+    BROWSER_MAX_MEMORY_GROWTH_MB, in which case it is restarted. With LEAN_PROFILE, each tab blocks
+    images, fonts, CSS, media and BLOCKED_DOMAINS.
+
+    Instances live as long as their process. Only the scheduler daemon (unifier.py --daemon) runs the
+    scrapers inside one long-lived process, so only there does Chrome stay warm from one run to the next;
+    batch and streaming runs start every scraper as its own subprocess, where the pool shares one Chrome
+    launch between that scraper's searches but each run still starts Chrome once per Selenium scraper.
+    """
+    def __init__(self, size=BROWSER_POOL_SIZE, max_jobs=BROWSER_MAX_JOBS,
+                 max_memory_growth_mb=BROWSER_MAX_MEMORY_GROWTH_MB):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self._idle = []
+        self._busy = {}        # id(driver) -> _Instance
+        self._count = 0        # Instances idle, busy or starting
+        self._condition = threading.Condition()
+
+    def _launch(self):
+        driver = start_chrome(chrome_options())
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        return _Instance(driver)
+
+    def acquire(self):
+        with self._condition:
+            while not self._idle and self._count >= self.size:
+                self._condition.wait()
+            instance = self._idle.pop() if self._idle else None
+            if instance is None:
+                self._count += 1
+        try:
+            if instance is None:
+                print("Starting a headless Chrome instance for the browser pool...")
+                instance = self._launch()
+                METRICS.cache('browser_pool', misses=1)
+            else:
+                METRICS.cache('browser_pool', hits=1)
+            try:
+                self._open_context(instance)
+            except Exception:
+                # A warm instance that can no longer open a tab has died; replace it once
+                self._quit(instance)
+                instance = self._launch()
+                METRICS.cache('browser_pool', misses=1)
+                self._open_context(instance)
+        except BaseException:
+            with self._condition:
+                self._count -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._busy[id(instance.driver)] = instance
+        return instance.driver
+
+    def release(self, driver):
+        with self._condition:
+            instance = self._busy.pop(id(driver), None)
+        if instance is None:
+            return
+        instance.jobs += 1
+        keep = self._close_context(instance) and instance.jobs < self.max_jobs
+        memory = _memory_mb(driver)
+        if keep and memory is not None and instance.baseline_mb is not None:
+            keep = memory - instance.baseline_mb < self.max_memory_growth_mb
+        if not keep:
+            print(f"Recycling Chrome instance after {instance.jobs} jobs" +
+                  (f" ({memory:.0f} MB)" if memory is not None else ""))
+            self._quit(instance)
+        with self._condition:
+            if keep:
+                self._idle.append(instance)
+            else:
+                self._count -= 1
+            self._condition.notify()
+
+    def grow(self, size):
+        """Allow up to `size` instances at once, for jobs that run several browsers in parallel"""
+        with self._condition:
+            self.size = max(self.size, size)
+            self._condition.notify_all()
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+        for instance in idle:
+            self._quit(instance)
+
+    # --- Per-job isolation ---
+    def _open_context(self, instance):
+        driver = instance.driver
+        try:
+            context = driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+            target = driver.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank',
+                                                                    'browserContextId': context})['targetId']
+            driver.switch_to.window(target)
+            instance.context = context
+        except Exception:
+            # No browser contexts (an old driver): use the instance's own tab, which _close_context wipes
+            driver.switch_to.window(instance.home_window)
+            driver.get('about:blank')
+            instance.context = None
+        try:
+            apply_lean_profile(driver)
+        except Exception as e:
+            print(f"Could not apply the lean browser profile: {e}")
+
+    def _close_context(self, instance):
+        """Dispose of (or wipe) the job's context; False if the instance can't be reused"""
+        driver = instance.driver
+        try:
+            if instance.context is not None:
+                driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': instance.context})
+                instance.context = None
+            else:
+                self._wipe(driver)
+            driver.switch_to.window(instance.home_window)
+            return True
+        except Exception as e:
+            print(f"Could not clean up after the job, recycling the Chrome instance: {e}")
+            return False
+
+    @staticmethod
+    def _wipe(driver):
+        """Clear what a job left in the default context: every cookie of every domain, the cache, and the
+        storage of the origin it ended on. If CDP can't do it, the instance is recycled instead."""
+        origin = driver.execute_script('return location.origin')
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        if origin and origin != 'null':
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+        driver.get('about:blank')
+
+    @staticmethod
+    def _quit(instance):
+        try:
+            instance.driver.quit()
+        except Exception:
+            pass
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+def browser_pool():
+    """The process-wide pool, shut down at exit; under the scheduler daemon it stays warm between runs"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = BrowserPool()
+            atexit.register(_POOL.close)
+        return _POOL
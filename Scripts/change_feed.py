@@ -0,0 +1,113 @@
+import json
+import os
+from datetime import datetime
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# --- Configuration ---
+CHANGE_FEED_FILENAME = "auction_change_feed.jsonl"   # Append-only, one JSON entry per change
+SCHEDULE_FIELDS = ['DATE', 'TIME']
+TRACKED_FIELDS = ['FIRM', 'ADDRESS', 'CTY', 'PL', 'STATUS']
+POSTPONED_STATUS_PATTERN = r'postpon|continued|reschedul|reset'
+
+# Change types
+NEW = 'new'
+POSTPONED = 'postponed'
+DISAPPEARED = 'disappeared'
+FIELD_CHANGED = 'field_changed'
+
+# --- Snapshots ---
+def as_snapshot(df):
+    """PROPERTY_ID-indexed text view of a unified table (DATE/TIME already formatted as in the CSV)"""
+    columns = ['PROPERTY_ID', 'FIELD_SOURCES'] + SCHEDULE_FIELDS + TRACKED_FIELDS
+    snapshot = pd.DataFrame({
+        column: (df[column].astype(object).where(df[column].notna(), "").astype(str)
+                 if column in df.columns else "")
+        for column in columns
+    }, index=df.index)
+    snapshot = snapshot[snapshot['PROPERTY_ID'] != ""]
+    return snapshot.drop_duplicates(subset=['PROPERTY_ID']).set_index('PROPERTY_ID')
+
+def load_snapshot(path):
+    """Previous run's unified CSV, or None if there is none (or it predates PROPERTY_ID)"""
+    if not os.path.exists(path):
+        return None
+    previous = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if 'PROPERTY_ID' not in previous.columns:
+        return None
+    return previous
+
+# --- Change detection ---
+def detect_changes(previous, current, loaded_sources=None, run_at=None):
+    """Change feed entries between the previous and current unified tables.
+
+    A record only counts as disappeared if the source that supplied it was loaded this run, so a
+    scraper that failed doesn't read as every one of its auctions being cancelled.
+    """
+    run_at = (run_at or datetime.now()).isoformat(timespec='seconds')
+    curr = as_snapshot(current)
+    if previous is None:
+        return []
+    prev = as_snapshot(previous)
+
+    joined = prev.join(curr, how='outer', lsuffix='_old', rsuffix='_new')
+    in_prev = joined.index.isin(prev.index)
+    in_curr = joined.index.isin(curr.index)
+
+    fields = SCHEDULE_FIELDS + TRACKED_FIELDS
+    old = joined[[f"{field}_old" for field in fields]].fillna("").set_axis(fields, axis=1)
+    new = joined[[f"{field}_new" for field in fields]].fillna("").set_axis(fields, axis=1)
+    differs = old != new
+    differs.loc[~(in_prev & in_curr)] = False
+
+    newly_postponed = (new['STATUS'].str.contains(POSTPONED_STATUS_PATTERN, case=False, regex=True)
+                       & ~old['STATUS'].str.contains(POSTPONED_STATUS_PATTERN, case=False, regex=True))
+    postponed = in_prev & in_curr & (differs[SCHEDULE_FIELDS].any(axis=1) | newly_postponed)
+    field_changed = in_prev & in_curr & ~postponed & differs[TRACKED_FIELDS].any(axis=1)
+
+    disappeared = in_prev & ~in_curr
+    if loaded_sources is not None:
+        previous_source = joined['FIELD_SOURCES_old'].fillna("").str.extract(r'SOURCE=(\w+)', expand=False)
+        disappeared &= previous_source.isin(list(loaded_sources)).to_numpy()
+
+    change_type = pd.Series(None, index=joined.index, dtype=object)
+    change_type[in_curr & ~in_prev] = NEW
+    change_type[postponed] = POSTPONED
+    change_type[field_changed] = FIELD_CHANGED
+    change_type[disappeared] = DISAPPEARED
+
+    entries = []
+    for property_id in change_type.dropna().index:
+        kind = change_type[property_id]
+        row = new.loc[property_id] if kind != DISAPPEARED else old.loc[property_id]
+        entry = {
+            'run_at': run_at,
+            'change': kind,
+            'property_id': property_id,
+            'address': row['ADDRESS'],
+            'date': row['DATE'],
+            'time': row['TIME'],
+        }
+        if kind in (POSTPONED, FIELD_CHANGED):
+            changed = differs.loc[property_id]
+            entry['changes'] = {
+                field: {'old': old.at[property_id, field], 'new': new.at[property_id, field]}
+                for field in fields if changed[field]
+            }
+        entries.append(entry)
+    return entries
+
+def append_change_feed(entries, path=CHANGE_FEED_FILENAME):
+    """Append entries as JSON Lines"""
+    if not entries:
+        return
+    with open(path, 'a', encoding='utf-8') as feed:
+        for entry in entries:
+            feed.write(json.dumps(entry) + '\n')
+
+def summarize_changes(entries):
+    counts = {NEW: 0, POSTPONED: 0, DISAPPEARED: 0, FIELD_CHANGED: 0}
+    for entry in entries:
+        counts[entry['change']] += 1
+    return counts
@@ -0,0 +1,131 @@
+import atexit
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from run_metrics import METRICS
+
+# --- Configuration ---
+CHECKPOINT_DIR = "checkpoints"     # One <name>.journal + <name>.snapshot.json pair per checkpointed stage
+COMPACT_EVERY = 500                # Journal appends between compactions into the snapshot
+CHECKPOINT_MAX_AGE_HOURS = 12      # Checkpoints untouched for longer belong to an abandoned run and are discarded
+PARTIAL_RESULTS_EXIT_CODE = 3      # A stopped scraper that saved what it had exits with this (see run_scraper)
+
+class Journal:
+    """Durable key -> value checkpoints for one stage of a run: an append-only JSON-lines journal, compacted
+    into a snapshot every COMPACT_EVERY appends.
+
+    Each record() is flushed before it returns, so a run killed at any point loses at most the entry being
+    written; a restarted run reopens the journal and skips every key already in it. Call clear() once the
+    stage's output is safely written elsewhere, so the next run starts fresh.
+    """
+    def __init__(self, name, directory=CHECKPOINT_DIR, compact_every=COMPACT_EVERY):
+        self.name = name
+        self.journal_path = os.path.join(directory, f"{name}.journal")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot.json")
+        self.compact_every = compact_every
+        self.entries = {}
+        self._appended = 0
+        self._file = None     # Opened on the first record()
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        if self._is_stale():
+            self.clear()
+        self._load()
+
+    def _is_stale(self):
+        mtimes = [os.path.getmtime(path) for path in (self.journal_path, self.snapshot_path) if os.path.exists(path)]
+        return bool(mtimes) and time.time() - max(mtimes) > CHECKPOINT_MAX_AGE_HOURS * 3600
+
+    def _load(self):
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Could not read {self.snapshot_path} ({e}), replaying the journal only")
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding='utf-8') as f:
+                text = f.read()
+            for line in text.splitlines():
+                try:
+                    key, value = json.loads(line)
+                except ValueError:
+                    break   # A line cut short by the kill; everything before it is intact
+                self.entries[key] = value
+            if text and not text.endswith('\n'):
+                self._compact()   # Start appending on a clean line
+        if self.entries:
+            print(f"   ⏮️ Resuming {self.name}: {len(self.entries)} checkpointed entries")
+
+    # --- Access ---
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        found = key in self.entries
+        METRICS.cache(f"checkpoint_{self.name}", hits=int(found), misses=int(not found))
+        return self.entries[key] if found else default
+
+    def record(self, key, value):
+        with self._lock:
+            self.entries[key] = value
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._file.write(json.dumps([key, value], default=str) + '\n')
+            self._file.flush()
+            self._appended += 1
+            if self._appended >= self.compact_every:
+                self._compact()
+
+    # --- Compaction ---
+    def _compact(self):
+        """Fold the journal into the snapshot; a crash between the two steps only replays entries twice"""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, default=str)
+        os.replace(tmp_path, self.snapshot_path)
+        self.close_file()
+        open(self.journal_path, 'w', encoding='utf-8').close()
+        self._appended = 0
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def clear(self):
+        """Drop every checkpoint, once the stage has completed"""
+        with self._lock:
+            self.close_file()
+            for path in (self.journal_path, self.snapshot_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.entries = {}
+            self._appended = 0
+
+    def close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+def interrupt_on_sigterm():
+    """In a scraper subprocess: turn the unifier's timeout SIGTERM into KeyboardInterrupt, so the scraper
+    can save its partial results (and its metrics) before it would be killed"""
+    signal.signal(signal.SIGTERM, _interrupt)
+
+def exit_with_partial_results():
+    """End a stopped scraper once its partial results are saved, with PARTIAL_RESULTS_EXIT_CODE. Exit handlers
+    (the metrics export) run first; worker threads still waiting on the network are not waited for."""
+    atexit._run_exitfuncs()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(PARTIAL_RESULTS_EXIT_CODE)
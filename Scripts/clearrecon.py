@@ -1,15 +1,7 @@
 import time
-import pandas as pd
 import os
-
-# --- Selenium Imports ---
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+from browser import browser_pool, extract_table_rows, report_page_bytes, soup_table_rows
+from run_metrics import METRICS, export_on_exit
 
 # --- Configuration ---
 LISTINGS_URL = "https://clearrecon-tn.com/tennessee-listings/"
@@ -20,26 +12,28 @@ SELENIUM_TIMEOUT = 30  # Timeout for waiting for elements
 # --- Helper Function to Fetch Page Content using Selenium ---
 def fetch_page_with_selenium(url):
     """
-    Fetches the full HTML content of a given URL using Selenium.
+    Fetches the listings table of a given URL using Selenium.
     This version handles the disclaimer and dynamically finds controls to select "All" entries per page.
+    Returns (table_rows, html_content): the rows read inside the browser, or when that isn't possible,
+    the full HTML for parse_listings_data.
     """
-    html_content = None
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("window-size=1920x1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    # Selenium is imported here, not at startup, so the script reaches its first request sooner
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+
+    table_rows, html_content = None, None
 
     driver = None
     try:
-        print("Initializing Selenium WebDriver for Chrome...")
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
-        driver.set_page_load_timeout(60)
+        print("Acquiring a headless Chrome session from the browser pool...")
+        with METRICS.stage('clearrecon_browser_start'):
+            driver = browser_pool().acquire()
 
         print(f"Navigating to URL: {url}")
-        driver.get(url)
+        with METRICS.request(url):
+            driver.get(url)
         time.sleep(5) # Initial wait for the page to start loading scripts
 
         # 1. Handle Disclaimer
@@ -96,8 +90,13 @@ def fetch_page_with_selenium(url):
         )
         print("Data rows found. Page should be fully rendered.")
         
-        html_content = driver.page_source
-        print("Successfully fetched page content using Selenium.")
+        report_page_bytes(driver, 'clearrecon_listings')
+        table_rows = extract_table_rows(driver, 'table.posts-data-table')
+        if table_rows is not None:
+            print(f"Read {len(table_rows)} table rows inside the browser.")
+        else:
+            html_content = driver.page_source
+            print("Successfully fetched page content using Selenium.")
         
     except TimeoutException:
         print(f"TimeoutException: Table content (class='post-row') did not appear within {SELENIUM_TIMEOUT} seconds.")
@@ -114,16 +113,18 @@ def fetch_page_with_selenium(url):
         traceback.print_exc() 
     finally:
         if driver:
-            print("Closing Selenium WebDriver.")
-            driver.quit()
+            print("Returning the Chrome session to the pool.")
+            browser_pool().release(driver)
             
-    return html_content
+    return table_rows, html_content
 
 # --- Function to Parse the Listings Data Table ---
 def parse_listings_data(html_content):
     """
     Parses the HTML content to extract listing data from the table.
     """
+    from bs4 import BeautifulSoup
+
     if not html_content:
         print("HTML content is empty, cannot parse.")
         return []
@@ -143,58 +144,62 @@ def parse_listings_data(html_content):
         print("Could not find the tbody within the listings table.")
         return listings_list
     
-    rows = table_body.find_all('tr') # Get all rows
+    return listings_from_rows(soup_table_rows(table_body))
 
+def listings_from_rows(rows):
+    """Listing dicts from table rows (see browser.TABLE_ROWS_SCRIPT), however they were read"""
+    listings_list = []
     if not rows:
         print("No <tr> data rows found in the table body.")
         return listings_list
 
     for row_index, row in enumerate(rows, start=1):
-        if row.find('th'): # Skip header rows if they are inside tbody
+        if row['header']: # Skip header rows if they are inside tbody
             continue
 
-        cells = row.find_all('td')
+        cells = row['cells']
         if len(cells) == 4:
-            try:
-                ts_number = cells[0].text.strip()
-                address = cells[1].text.strip()
-                sale_date = cells[2].text.strip()
-                current_bid = cells[3].text.strip()
-
-                listings_list.append({
-                    'SourceWebsite': SOURCE_WEBSITE_NAME,
-                    'TS_Number': ts_number,
-                    'PropertyAddress': address,
-                    'SaleDate': sale_date,
-                    'CurrentBid': current_bid
-                })
-            except Exception as e:
-                print(f"Row {row_index}: Error parsing row. Details: {e}. Row content: {row.get_text(strip=True, separator='|')}")
+            ts_number, address, sale_date, current_bid = cells
+            listings_list.append({
+                'SourceWebsite': SOURCE_WEBSITE_NAME,
+                'TS_Number': ts_number,
+                'PropertyAddress': address,
+                'SaleDate': sale_date,
+                'CurrentBid': current_bid
+            })
         else:
-            if any(c.text.strip() for c in cells):
-                print(f"Row {row_index}: Skipping row, expected 4 cells, got {len(cells)}. Content: {row.get_text(strip=True, separator='|')}")
+            if any(cells):
+                print(f"Row {row_index}: Skipping row, expected 4 cells, got {len(cells)}. Content: {'|'.join(cells)}")
             
     return listings_list
 
 # --- Main Script Logic ---
-if __name__ == "__main__":
+def main():
+    """Scrape the ClearRecon Tennessee listings into clearrecon_tn_foreclosures.csv"""
     print(f"--- Starting Scraper for {SOURCE_WEBSITE_NAME} ---")
     
-    html_content_selenium = fetch_page_with_selenium(LISTINGS_URL)
+    table_rows, html_content_selenium = fetch_page_with_selenium(LISTINGS_URL)
     
-    if html_content_selenium:
+    if table_rows is not None or html_content_selenium:
         print("\n--- Parsing Listings Data (from Selenium-fetched content) ---")
-        listings = parse_listings_data(html_content_selenium)
+        with METRICS.stage('clearrecon_parse'):
+            if table_rows is not None:
+                listings = listings_from_rows(table_rows)
+            else:
+                listings = parse_listings_data(html_content_selenium)
+        METRICS.rows('clearrecon_parse', rows_out=len(listings))
         print(f"Found {len(listings)} listing entries.")
         
         if listings:
+            import pandas as pd
             df = pd.DataFrame(listings)
             
             print(f"\n--- First 5 Listing Entries ---")
             print(df.head().to_string())
             
             try:
-                df.to_csv(CSV_OUTPUT_FILENAME, index=False, encoding='utf-8')
+                df.to_csv(f"{CSV_OUTPUT_FILENAME}.tmp", index=False, encoding='utf-8')
+                os.replace(f"{CSV_OUTPUT_FILENAME}.tmp", CSV_OUTPUT_FILENAME)
                 print(f"\nData successfully saved to {CSV_OUTPUT_FILENAME}")
             except Exception as e:
                 print(f"Error saving data to CSV: {e}")
@@ -204,3 +209,7 @@ if __name__ == "__main__":
         print("Failed to fetch HTML content using Selenium. Scraper cannot proceed.")
         
     print(f"\n--- End of Scraper for {SOURCE_WEBSITE_NAME} ---")
+
+if __name__ == "__main__":
+    export_on_exit()
+    main()
@@ -0,0 +1,96 @@
+import importlib.util
+import os
+import shutil
+import uuid
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# --- Configuration ---
+UNIFIED_DATASET_DIR = "Auction_Info_Unified.parquet"   # Partitioned by SALE_MONTH
+INTERMEDIATE_DIR = "standardized"                      # One Parquet file per source
+PARTITION_COLUMN = 'SALE_MONTH'
+UNDATED_PARTITION = 'undated'
+
+# Highly repetitive string columns, stored dictionary-encoded
+CATEGORICAL_COLUMNS = ['SOURCE', 'SOURCE_NAME', 'FIRM', 'PL', 'CTY', 'CLOSEST_CITY', 'WITHIN_30MIN', 'GEOCODE_METHOD']
+FLOAT32_COLUMNS = ['DISTANCE_MILES', 'EST_DRIVE_TIME']
+
+def columnar_available():
+    """pyarrow is optional; without it only the CSV outputs are written"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+# --- Typed Arrow table ---
+def to_arrow_table(df):
+    """Arrow table with dictionary-encoded strings, float32 measures, date32 DATE and time32 TIME"""
+    import pyarrow as pa
+
+    typed = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in typed.columns:
+            typed[column] = typed[column].astype(object).where(typed[column].notna(), None).astype('category')
+    for column in FLOAT32_COLUMNS:
+        if column in typed.columns:
+            typed[column] = pd.to_numeric(typed[column], errors='coerce').astype('float32')
+
+    time_seconds = None
+    if 'TIME' in typed.columns:
+        time_seconds = (pd.to_timedelta(typed['TIME']).dt.total_seconds()).astype('Int32')
+        typed = typed.drop(columns=['TIME'])
+
+    table = pa.Table.from_pandas(typed, preserve_index=False)
+    if 'DATE' in typed.columns:
+        date_index = table.schema.get_field_index('DATE')
+        table = table.set_column(date_index, 'DATE', table.column('DATE').cast(pa.date32()))
+    if time_seconds is not None:
+        time_array = pa.array(time_seconds.to_numpy(dtype='float64', na_value=float('nan')), from_pandas=True)
+        time_array = time_array.cast(pa.int32()).cast(pa.time32('s'))
+        table = table.add_column(table.schema.get_field_index('DATE') + 1, 'TIME', time_array)
+    return table
+
+# --- Atomic writers ---
+def _swap_into_place(tmp_path, final_path):
+    """Replace final_path with tmp_path; readers see either the old or the new output, never a partial one"""
+    if os.path.isdir(final_path) and os.path.isdir(tmp_path):
+        old_path = f"{final_path}.old-{uuid.uuid4().hex[:8]}"
+        os.replace(final_path, old_path)
+        os.replace(tmp_path, final_path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.replace(tmp_path, final_path)
+
+def write_parquet_file(df, path):
+    """Write one typed Parquet file atomically"""
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    try:
+        pq.write_table(to_arrow_table(df), tmp_path, compression='zstd')
+        _swap_into_place(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def write_partitioned_dataset(df, root_path=UNIFIED_DATASET_DIR):
+    """Write df as a Parquet dataset partitioned by sale month, swapped in atomically"""
+    import pyarrow.parquet as pq
+
+    partitioned = df.copy()
+    sale_month = pd.to_datetime(partitioned['DATE'], errors='coerce').dt.strftime('%Y-%m')
+    partitioned[PARTITION_COLUMN] = sale_month.fillna(UNDATED_PARTITION)
+
+    tmp_path = f"{root_path}.tmp-{uuid.uuid4().hex[:8]}"
+    try:
+        pq.write_to_dataset(to_arrow_table(partitioned), root_path=tmp_path,
+                            partition_cols=[PARTITION_COLUMN], compression='zstd')
+        _swap_into_place(tmp_path, root_path)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return root_path
+
+def write_intermediate(df, source_name, directory=INTERMEDIATE_DIR):
+    """Per-source standardized records in the same typed Parquet layout"""
+    path = os.path.join(directory, f"{source_name}.parquet")
+    write_parquet_file(df, path)
+    return path
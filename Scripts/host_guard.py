@@ -0,0 +1,136 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from rate_limiter import RATE_LIMITER
+from run_metrics import METRICS, host_of
+
+# --- Configuration ---
+FAILURE_THRESHOLD = 5          # Consecutive failed or slow calls that open a host's circuit
+SLOW_CALL_SECONDS = 8          # A call slower than this counts as a failure for the breaker
+OPEN_SECONDS = 60              # How long an open circuit fast-fails before letting one trial call through
+LATENCY_TARGET_SECONDS = 2     # Calls slower than this, 429s and failures halve the host's concurrency limit
+INITIAL_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+DECREASE_FACTOR = 0.5
+# Per-host overrides of the settings above
+HOST_SETTINGS = {
+    # Nominatim's usage policy allows one request at a time per client
+    'nominatim.openstreetmap.org': {'initial_concurrency': 1, 'max_concurrency': 1},
+}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open; callers move on to their fallback"""
+
+class HostGuard:
+    """Circuit breaker and additive-increase/multiplicative-decrease concurrency limit for one host.
+
+    The circuit opens after FAILURE_THRESHOLD consecutive errors, 5xx/429 responses or calls slower than
+    SLOW_CALL_SECONDS; while open, calls fail at once with CircuitOpenError. After OPEN_SECONDS a single
+    trial call is let through (half-open), which closes the circuit again or reopens it.
+    The concurrency limit grows by 1/limit per fast call (about one slot per round of calls) and is halved
+    by every slow, throttled or failed one.
+    """
+    def __init__(self, host, failure_threshold=FAILURE_THRESHOLD, slow_call_seconds=SLOW_CALL_SECONDS,
+                 open_seconds=OPEN_SECONDS, latency_target_seconds=LATENCY_TARGET_SECONDS,
+                 initial_concurrency=INITIAL_CONCURRENCY, min_concurrency=MIN_CONCURRENCY,
+                 max_concurrency=MAX_CONCURRENCY):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.latency_target_seconds = latency_target_seconds
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = float(initial_concurrency)
+        self.state = 'closed'
+        self.failures = 0          # Consecutive failures
+        self.opened_at = None
+        self.trips = 0             # Times the circuit opened
+        self.rejected = 0          # Calls fast-failed while open
+        self.in_flight = 0
+        self._trial = False        # A half-open trial call is running
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Wait for a concurrency slot; returns True for a half-open trial call, raises CircuitOpenError"""
+        with self._condition:
+            while True:
+                if self.state == 'open' and time.monotonic() - self.opened_at >= self.open_seconds:
+                    self.state = 'half_open'
+                if self.state == 'open' or (self.state == 'half_open' and self._trial):
+                    self.rejected += 1
+                    self._publish()
+                    raise CircuitOpenError(f"circuit open for {self.host}")
+                if self.in_flight < max(int(self.limit), self.min_concurrency):
+                    break
+                self._condition.wait()
+            trial = self.state == 'half_open'
+            self._trial = self._trial or trial
+            self.in_flight += 1
+            return trial
+
+    def release(self, trial, seconds, status=None, error=False):
+        """Record a finished call's outcome"""
+        with self._condition:
+            self.in_flight -= 1
+            if trial:
+                self._trial = False
+            failed = error or status == 429 or (status is not None and status >= 500) or seconds > self.slow_call_seconds
+            if failed or seconds > self.latency_target_seconds:
+                self.limit = max(self.min_concurrency, self.limit * DECREASE_FACTOR)
+            else:
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+
+            if failed:
+                self.failures += 1
+                if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+                    self.state = 'open'
+                    self.opened_at = time.monotonic()
+                    self.trips += 1
+                    print(f"⚡ {self.host}: circuit opened after {self.failures} failed or slow calls, "
+                          f"fast-failing for {self.open_seconds}s")
+            else:
+                self.failures = 0
+                if self.state == 'half_open':
+                    self.state = 'closed'
+                    print(f"✅ {self.host}: circuit closed, the trial call succeeded")
+            self._publish()
+            self._condition.notify_all()
+
+    def _publish(self):
+        METRICS.circuit(self.host, state=self.state, concurrency_limit=round(self.limit, 2),
+                        trips=self.trips, rejected=self.rejected)
+
+_GUARDS = {}
+_GUARDS_LOCK = threading.Lock()
+
+def guard_for(host):
+    """The process-wide guard for a host, so every caller of that host shares its breaker and limit"""
+    with _GUARDS_LOCK:
+        if host not in _GUARDS:
+            _GUARDS[host] = HostGuard(host, **HOST_SETTINGS.get(host, {}))
+        return _GUARDS[host]
+
+@contextmanager
+def guarded_request(url):
+    """METRICS.request behind the host's breaker, concurrency limit and shared rate limit:
+    `with guarded_request(url) as call: ...; call['status'] = response.status_code`
+    Raises CircuitOpenError without calling the host while its circuit is open.
+    """
+    host = host_of(url)
+    guard = guard_for(host)
+    trial = guard.acquire()
+    start = time.perf_counter()
+    call, error = {'status': None}, False
+    try:
+        RATE_LIMITER.acquire(host)
+        start = time.perf_counter()   # Waiting for a slot is not the host's latency
+        with METRICS.request(url) as call:
+            yield call
+    except Exception:
+        error = True
+        raise
+    finally:
+        guard.release(trial, time.perf_counter() - start, call['status'], error)
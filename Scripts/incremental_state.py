@@ -0,0 +1,97 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from lazy_imports import lazy_import
+from run_budget import DEADLINE_METHOD_SUFFIX
+
+pd = lazy_import('pandas')
+
+# --- Configuration ---
+STATE_FILENAME = "processed_records_state.csv"   # Shared by batch, streaming and daemon runs
+STATE_RETENTION_DAYS = 90   # Addresses not seen for this long are dropped
+FINGERPRINT_FIELDS = ['ADDRESS', 'CTY', 'DATE', 'TIME', 'PL', 'FIRM']   # A record's full content, for change detection
+LOCATION_KEY_FIELDS = ['ADDRESS', 'CTY']   # The geocoder's inputs: a postponed sale keeps its location
+LOCATION_COLUMNS = ['WITHIN_30MIN', 'CLOSEST_CITY', 'DISTANCE_MILES', 'EST_DRIVE_TIME', 'GEOCODE_METHOD', 'LAT', 'LON']
+STATE_COLUMNS = LOCATION_COLUMNS + ['FINGERPRINT', 'LAST_SEEN']
+
+# --- Fingerprints ---
+def normalized_fields(df, fields=FINGERPRINT_FIELDS):
+    """Case/whitespace-insensitive text form of the given fields"""
+    normalized = pd.DataFrame(index=df.index)
+    for field in fields:
+        values = df[field] if field in df.columns else pd.Series("", index=df.index)
+        text = values.astype(object).where(values.notna(), "").astype(str)
+        normalized[field] = text.str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+    return normalized
+
+def hash_fields(df, fields):
+    """Stable hash of the normalized fields per record (hex string), vectorized via hash_pandas_object"""
+    if df.empty:
+        return pd.Series(dtype=object, index=df.index)
+    hashes = pd.util.hash_pandas_object(normalized_fields(df, fields), index=False)
+    return hashes.map(lambda value: f"{value:016x}")
+
+def fingerprint_records(df):
+    """Content hash of the whole record: changes when a sale is postponed, reassigned, etc."""
+    return hash_fields(df, FINGERPRINT_FIELDS)
+
+def location_keys(df):
+    """Hash of the normalized address and city, the key of the location state and geocode checkpoints"""
+    return hash_fields(df, LOCATION_KEY_FIELDS)
+
+# --- State file ---
+def _empty_state():
+    return pd.DataFrame(columns=STATE_COLUMNS, index=pd.Index([], name='LOCATION_KEY'))
+
+def load_state(path=STATE_FILENAME):
+    """Previously geocoded addresses with their location fields and their record's last FINGERPRINT,
+    indexed by LOCATION_KEY"""
+    if not os.path.exists(path):
+        return _empty_state()
+    try:
+        state = pd.read_csv(path, dtype={'LOCATION_KEY': str, 'FINGERPRINT': str}, keep_default_na=False, na_values=[''])
+    except Exception as e:
+        print(f"   ⚠️ Could not read {path}, processing every record: {e}")
+        return _empty_state()
+    if 'LOCATION_KEY' not in state.columns:
+        print(f"   ⚠️ {path} is keyed by record fingerprint, not address; every address is geocoded once more")
+        return _empty_state()
+    state = state.drop_duplicates(subset=['LOCATION_KEY'], keep='last').set_index('LOCATION_KEY')
+    return state.reindex(columns=STATE_COLUMNS)
+
+def split_by_state(df, state):
+    """(records whose address has cached location fields, filled in; records that still need geocoding)
+
+    State entries written before coordinates were kept don't count, so those addresses are geocoded once more.
+    """
+    cached = df['LOCATION_KEY'].isin(state.index[state['LAT'].notna()])
+    reused = df[cached].copy()
+    for column in LOCATION_COLUMNS:
+        reused[column] = reused['LOCATION_KEY'].map(state[column])
+    return reused, df[~cached].copy()
+
+def changed_records(df, state):
+    """Records at a known address whose content changed since it was last processed (postponed, new firm...)"""
+    previous = df['LOCATION_KEY'].map(state['FINGERPRINT'])
+    return previous.notna() & (previous != df['FINGERPRINT'])
+
+def save_state(df, state, path=STATE_FILENAME, now=None):
+    """Merge this run's successfully geocoded addresses into the state file and write it atomically.
+
+    Centroids used because geocoding ran out of time aren't kept, so the next run geocodes those records properly.
+    """
+    now = now or datetime.now()
+    methods = df['GEOCODE_METHOD'].astype(str).str.lower()
+    geocoded = df[(methods != 'failed') & ~methods.str.endswith(DEADLINE_METHOD_SUFFIX)]
+    current = geocoded.drop_duplicates(subset=['LOCATION_KEY'], keep='last').set_index('LOCATION_KEY')
+    current = current[LOCATION_COLUMNS + ['FINGERPRINT']].copy()
+    current['LAST_SEEN'] = now.strftime('%Y-%m-%d')
+
+    merged = pd.concat([state[~state.index.isin(current.index)], current])
+    cutoff = (now - timedelta(days=STATE_RETENTION_DAYS)).strftime('%Y-%m-%d')
+    merged = merged[merged['LAST_SEEN'].astype(str) >= cutoff]
+
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    merged.rename_axis('LOCATION_KEY').reset_index().to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return merged
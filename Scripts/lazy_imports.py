@@ -0,0 +1,23 @@
+import importlib
+
+class LazyModule:
+    """Stands in for a module and imports it on first attribute access.
+
+    Keeps pandas/numpy/requests off the startup path of entry points that may not need them
+    (or not yet, e.g. the unifier while its scrapers run). import_module is thread-safe, so
+    stage threads may race to be the first user.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        return f"<lazy module '{self._name}'{' (loaded)' if self._module is not None else ''}>"
+
+def lazy_import(name):
+    return LazyModule(name)
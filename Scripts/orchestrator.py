@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# --- Configuration ---
+QUEUE_SIZE = 4   # Items buffered in front of each node; a full channel blocks whoever feeds it
+# Named executors nodes can run in: blocking I/O, Chrome sessions (one at a time) and CPU-bound work
+EXECUTOR_WORKERS = {'thread': 8, 'browser': 1, 'process': 2}
+
+_END = object()
+_EXHAUSTED = object()
+
+class Node:
+    """One stage of a DAG.
+
+    A node without inputs is a source: fn() returns an iterable (or async iterable) of items.
+    Any other node calls fn(item) for every item arriving from its inputs, on up to `concurrency`
+    items at once, and passes non-None results on to every node that lists it as an input.
+    Sync functions run in the named executor ('thread', 'browser', 'process'), or inline when it is None.
+    """
+    def __init__(self, name, fn, inputs=(), concurrency=1, executor=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.concurrency = concurrency
+        self.executor = executor
+
+    @property
+    def is_source(self):
+        return not self.inputs
+
+class NodeStats:
+    def __init__(self):
+        self.status = 'pending'   # pending, running, done, failed, cancelled
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return (f"{self.status}, {self.items_in} in / {self.items_out} out, "
+                f"{self.errors} errors, {self.seconds:.1f}s")
+
+def validate_dag(nodes):
+    """Unique names, known inputs, no cycles, and no generator sources in a process pool"""
+    names = [node.name for node in nodes]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate node names in {names}")
+    by_name = {node.name: node for node in nodes}
+    for node in nodes:
+        unknown = set(node.inputs) - set(by_name)
+        if unknown:
+            raise ValueError(f"Node '{node.name}' has unknown inputs {sorted(unknown)}")
+        if node.executor is not None and node.executor not in EXECUTOR_WORKERS:
+            raise ValueError(f"Node '{node.name}' has unknown executor '{node.executor}'")
+        if node.is_source and node.executor == 'process':
+            raise ValueError(f"Source node '{node.name}' can't iterate in a process pool")
+
+    visiting, finished = set(), set()
+    def visit(name):
+        if name in finished:
+            return
+        if name in visiting:
+            raise ValueError(f"Cycle through node '{name}'")
+        visiting.add(name)
+        for upstream in by_name[name].inputs:
+            visit(upstream)
+        visiting.discard(name)
+        finished.add(name)
+    for name in names:
+        visit(name)
+
+class _DagRun:
+    def __init__(self, nodes, queue_size):
+        self.nodes = nodes
+        self.stats = {node.name: NodeStats() for node in nodes}
+        self.inbox = {node.name: asyncio.Queue(maxsize=queue_size) for node in nodes if not node.is_source}
+        self.downstream = {node.name: [other.name for other in nodes if node.name in other.inputs] for node in nodes}
+        self.open_inputs = {node.name: len(node.inputs) for node in nodes}
+        self.executors = {}
+
+    def executor(self, name):
+        if name not in self.executors:
+            pool = ProcessPoolExecutor if name == 'process' else ThreadPoolExecutor
+            self.executors[name] = pool(max_workers=EXECUTOR_WORKERS[name])
+        return self.executors[name]
+
+    async def call(self, node, fn, *args):
+        if asyncio.iscoroutinefunction(fn):
+            return await fn(*args)
+        if node.executor is None:
+            return fn(*args)
+        if node.executor != 'process':
+            fn = _in_named_thread(fn, f"dag_{node.name}")
+        return await asyncio.get_running_loop().run_in_executor(self.executor(node.executor), fn, *args)
+
+    async def emit(self, node, item):
+        self.stats[node.name].items_out += 1
+        for name in self.downstream[node.name]:
+            await self.inbox[name].put(item)
+
+    async def close(self, node):
+        """Tell downstream nodes this input is finished; a node ends once all its inputs have"""
+        for name in self.downstream[node.name]:
+            self.open_inputs[name] -= 1
+            if self.open_inputs[name] == 0:
+                await self.inbox[name].put(_END)
+
+    async def run_source(self, node, stats):
+        items = node.fn()
+        if hasattr(items, '__aiter__'):
+            async for item in items:
+                stats.items_in += 1
+                await self.emit(node, item)
+            return
+        iterator = iter(items)
+        while True:
+            item = await self.call(node, next, iterator, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            stats.items_in += 1
+            await self.emit(node, item)
+
+    async def run_worker(self, node, stats):
+        inbox = self.inbox[node.name]
+        while True:
+            item = await inbox.get()
+            if item is _END:
+                await inbox.put(_END)   # Let the node's other workers see it too
+                return
+            stats.items_in += 1
+            try:
+                result = await self.call(node, node.fn, item)
+            except Exception as e:
+                stats.errors += 1
+                print(f"   ❌ {node.name} failed on an item: {e}")
+                continue
+            if result is not None:
+                await self.emit(node, result)
+
+    async def run_node(self, node):
+        stats = self.stats[node.name]
+        stats.status = 'running'
+        start = time.monotonic()
+        try:
+            if node.is_source:
+                await self.run_source(node, stats)
+            else:
+                await asyncio.gather(*(self.run_worker(node, stats) for _ in range(node.concurrency)))
+            stats.status = 'done'
+        except asyncio.CancelledError:
+            stats.status = 'cancelled'
+            raise
+        except Exception as e:
+            # A broken source or node only ends its own branch; downstream nodes still finish
+            stats.status = 'failed'
+            stats.errors += 1
+            print(f"   ❌ {node.name} failed: {e}")
+        finally:
+            stats.seconds = time.monotonic() - start
+        await self.close(node)
+
+    async def run(self, deadline, on_deadline=None):
+        tasks = [asyncio.create_task(self.run_node(node), name=node.name) for node in self.nodes]
+        pending = ()
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline)
+            if pending:
+                print(f"   ⏰ Run deadline of {deadline:.0f}s reached, cancelling "
+                      f"{', '.join(sorted(task.get_name() for task in pending))}")
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            # Work already handed to a thread can't be interrupted; it is abandoned, not awaited
+            for pool in self.executors.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            if pending and on_deadline is not None:
+                on_deadline()   # Stop what the abandoned threads started, e.g. subprocesses
+        return self.stats
+
+def _in_named_thread(fn, name):
+    """Name the pool thread after the node while it runs fn, so profiles and tracebacks show which node it is"""
+    def run(*args):
+        thread = threading.current_thread()
+        previous, thread.name = thread.name, name
+        try:
+            return fn(*args)
+        finally:
+            thread.name = previous
+    return run
+
+def run_dag(nodes, deadline=None, queue_size=QUEUE_SIZE, on_deadline=None):
+    """Run the nodes until every one has finished or `deadline` seconds have passed; returns NodeStats by name.
+    When the deadline cancels nodes, `on_deadline()` is called once their executor threads are abandoned."""
+    validate_dag(nodes)
+
+    async def main():
+        return await _DagRun(nodes, queue_size).run(deadline, on_deadline)
+
+    return asyncio.run(main())
+
+def print_dag_report(stats):
+    for name, node_stats in stats.items():
+        print(f"   ⏱️ {name}: {node_stats}")
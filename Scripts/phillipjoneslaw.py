@@ -1,14 +1,13 @@
 import requests
-from bs4 import BeautifulSoup
-import time
-import pandas as pd
 import os # For checking if CSV exists
+from host_guard import CircuitOpenError, guarded_request
+from run_metrics import METRICS, export_on_exit
 
 # --- Configuration ---
 AUCTION_URL = "https://phillipjoneslaw.com/foreclosure-auctions.cfm?accept=yes"
-REQUEST_DELAY = 1 # Seconds to wait between requests (though only one request here)
 CSV_OUTPUT_FILENAME = "phillipjoneslaw_foreclosures.csv"
 SOURCE_WEBSITE_NAME = "phillipjoneslaw.com" # To add a source column
+SESSION = requests.Session()   # Keep-alive connection, reused by every run in a scheduler process
 
 # --- Helper Function to Fetch Page Content ---
 def fetch_page(url):
@@ -21,7 +20,9 @@ def fetch_page(url):
     }
     try:
         print(f"Fetching URL: {url}")
-        response = requests.get(url, headers=headers, timeout=20)
+        with guarded_request(url) as call:
+            response = SESSION.get(url, headers=headers, timeout=20)
+            call['status'] = response.status_code
         response.raise_for_status()
         print(f"Successfully fetched {url} (Status: {response.status_code})")
         return response.text
@@ -34,6 +35,9 @@ def fetch_page(url):
     except requests.exceptions.RequestException as e:
         print(f"Generic error fetching {url}: {e}")
         return None
+    except CircuitOpenError as e:
+        print(f"Skipping {url}: {e}")
+        return None
 
 # --- Function to Parse the Auction Data Table ---
 def parse_auction_data(html_content):
@@ -41,6 +45,7 @@ def parse_auction_data(html_content):
     Parses the HTML content to extract auction data from the table.
     Returns a list of dictionaries, where each dictionary represents an auction.
     """
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     auction_list = []
 
@@ -95,7 +100,8 @@ def parse_auction_data(html_content):
     return auction_list
 
 # --- Main Script Logic ---
-if __name__ == "__main__":
+def main():
+    """Scrape the Phillip Jones auction table into phillipjoneslaw_foreclosures.csv"""
     print(f"--- Starting Scraper for {SOURCE_WEBSITE_NAME} ---")
     print(f"Fetching data from: {AUCTION_URL}")
     
@@ -103,11 +109,14 @@ if __name__ == "__main__":
     
     if html_content:
         print("\n--- Parsing Auction Data ---")
-        auctions = parse_auction_data(html_content)
+        with METRICS.stage('phillipjones_parse'):
+            auctions = parse_auction_data(html_content)
+        METRICS.rows('phillipjones_parse', rows_out=len(auctions))
         print(f"Found {len(auctions)} auction entries.")
         
         if auctions:
             # Convert list of dictionaries to Pandas DataFrame
+            import pandas as pd
             df = pd.DataFrame(auctions)
             
             print(f"\n--- First 5 Auction Entries ---")
@@ -117,7 +126,8 @@ if __name__ == "__main__":
             try:
                 # This script will create/overwrite its own CSV.
                 # Merging with other CSVs will be a separate step as discussed.
-                df.to_csv(CSV_OUTPUT_FILENAME, index=False, encoding='utf-8')
+                df.to_csv(f"{CSV_OUTPUT_FILENAME}.tmp", index=False, encoding='utf-8')
+                os.replace(f"{CSV_OUTPUT_FILENAME}.tmp", CSV_OUTPUT_FILENAME)
                 print(f"\nData successfully saved to {CSV_OUTPUT_FILENAME}")
             except Exception as e:
                 print(f"Error saving data to CSV: {e}")
@@ -128,3 +138,6 @@ if __name__ == "__main__":
         
     print(f"\n--- End of Scraper for {SOURCE_WEBSITE_NAME} ---")
 
+if __name__ == "__main__":
+    export_on_exit()
+    main()
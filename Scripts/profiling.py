@@ -0,0 +1,245 @@
+import cProfile
+import glob
+import json
+import linecache
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+# --- Configuration ---
+PROFILE_ROOT = "profiles"                   # --profile writes each run to profiles/<timestamp>/
+PROFILE_DIR_ENV = 'PIPELINE_PROFILE_DIR'   # Set for scraper subprocesses so they profile themselves into it
+SAMPLE_INTERVAL = 0.005                    # Seconds between stack samples of every thread
+WAIT_CATEGORIES = ['network', 'browser', 'subprocess', 'sleep', 'idle']
+NETWORK_MODULES = ('socket.py', 'ssl.py', 'client.py', 'connection.py', 'connectionpool.py')
+IDLE_MODULES = ('threading.py', 'queue.py', 'selectors.py', 'base_events.py', 'thread.py')
+
+def classify_stack(stack):
+    """Where a sampled thread is spending its time; stack is innermost-first (filename, function, line)"""
+    filename, _, lineno = stack[0]
+    module = os.path.basename(filename)
+    if any(os.sep + 'selenium' + os.sep in frame[0] for frame in stack):
+        return 'browser'
+    if module in NETWORK_MODULES:
+        return 'network'
+    if any(os.path.basename(frame[0]) == 'subprocess.py' for frame in stack):
+        return 'subprocess'
+    if 'sleep(' in linecache.getline(filename, lineno):
+        return 'sleep'
+    if module in IDLE_MODULES:
+        return 'idle'
+    return 'cpu'
+
+class Profiler:
+    """Per-stage cProfile + tracemalloc peaks, and an all-thread stack sampler for flamegraphs and wait attribution.
+
+    Stages are the METRICS.stage blocks; the profiler registers itself as an observer of them.
+    """
+    def __init__(self, output_dir, label='unifier'):
+        self.output_dir = output_dir
+        self.label = label
+        self.folded = Counter()           # "stage;outer;...;inner" -> samples
+        self.waits = Counter()            # (stage, category) -> samples
+        self.peaks = {}                   # stage -> peak traced bytes while it ran
+        self.stage_stats = {}             # stage -> pstats.Stats
+        self._active = {}                 # thread id -> [stage names]
+        self._profiles = {}               # thread id -> (stage, cProfile.Profile)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name='profiler-sampler', daemon=True)
+
+    # --- Lifecycle ---
+    def start(self):
+        from run_metrics import METRICS
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        METRICS.observers.append(self)
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        from run_metrics import METRICS
+        self._stop.set()
+        self._sampler.join()
+        if self in METRICS.observers:
+            METRICS.observers.remove(self)
+        tracemalloc.stop()
+
+    # --- Stage observer ---
+    def stage_started(self, name):
+        thread = threading.get_ident()
+        with self._lock:
+            self._active.setdefault(thread, []).append(name)
+            self.peaks.setdefault(name, 0)
+            start_profile = thread not in self._profiles
+            if start_profile:
+                profile = cProfile.Profile()
+                self._profiles[thread] = (name, profile)
+        if start_profile:
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler already owns this thread; the sampler still covers it
+                with self._lock:
+                    del self._profiles[thread]
+
+    def stage_finished(self, name):
+        thread = threading.get_ident()
+        self._record_memory()
+        with self._lock:
+            stages = self._active.get(thread, [])
+            if name in stages:
+                stages.remove(name)
+            owner = self._profiles.get(thread)
+            finished = owner is not None and owner[0] == name
+            if finished:
+                del self._profiles[thread]
+        if finished:
+            profile = owner[1]
+            profile.disable()
+            with self._lock:
+                if name in self.stage_stats:
+                    self.stage_stats[name].add(profile)
+                else:
+                    self.stage_stats[name] = pstats.Stats(profile)
+
+    # --- Sampling ---
+    def _record_memory(self):
+        current, _ = tracemalloc.get_traced_memory()
+        with self._lock:
+            for stages in self._active.values():
+                for stage in stages:
+                    self.peaks[stage] = max(self.peaks.get(stage, 0), current)
+
+    def _sample_loop(self):
+        me = threading.get_ident()
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread, frame in sys._current_frames().items():
+                if thread == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append((frame.f_code.co_filename, frame.f_code.co_name, frame.f_lineno))
+                    frame = frame.f_back
+                if not stack:
+                    continue
+                with self._lock:
+                    stages = self._active.get(thread)
+                    stage = stages[-1] if stages else names.get(thread, 'thread')
+                if stage.startswith('ThreadPoolExecutor'):
+                    stage = 'pool_threads'   # Pool threads between tasks; busy ones carry their node's name
+                frames = ';'.join(f"{function} ({os.path.basename(filename)})"
+                                  for filename, function, _ in reversed(stack))
+                category = classify_stack(stack)
+                with self._lock:
+                    self.folded[f"{stage};{frames}"] += 1
+                    self.waits[(stage, category)] += 1
+            if tracemalloc.is_tracing():
+                self._record_memory()
+
+    # --- Output ---
+    def write(self):
+        """Write this process's folded stacks, per-stage pstats and wait/memory summary into output_dir"""
+        with open(os.path.join(self.output_dir, f"{self.label}.folded"), 'w', encoding='utf-8') as f:
+            for stack, samples in self.folded.items():
+                f.write(f"{stack} {samples}\n")
+        for stage, stats in self.stage_stats.items():
+            stats.dump_stats(os.path.join(self.output_dir, f"{self.label}__{_safe(stage)}.pstats"))
+        summary = {
+            'label': self.label,
+            'sample_interval': SAMPLE_INTERVAL,
+            'waits': [[stage, category, samples] for (stage, category), samples in self.waits.items()],
+            'peaks': self.peaks,
+        }
+        with open(os.path.join(self.output_dir, f"{self.label}.profile.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f)
+
+def _safe(name):
+    return ''.join(c if c.isalnum() or c in '-_' else '_' for c in name)
+
+def start_subprocess_profiling(label):
+    """In a scraper subprocess started with PIPELINE_PROFILE_DIR set: profile the whole script and write it out on exit"""
+    import atexit
+    from run_metrics import METRICS
+
+    output_dir = os.environ.get(PROFILE_DIR_ENV)
+    if not output_dir:
+        return None
+    profiler = Profiler(output_dir, label).start()
+    METRICS._notify('stage_started', label)
+
+    def finish():
+        METRICS._notify('stage_finished', label)
+        profiler.stop()
+        profiler.write()
+    atexit.register(finish)
+    return profiler
+
+# --- Merged report (parent process) ---
+def merge_profiles(output_dir, stage_metrics):
+    """Merge every process's profile output in output_dir into stacks.folded (flamegraph.pl / speedscope input)
+    and a per-stage summary table, written to profile_summary.txt and returned"""
+    per_stage = {}
+    with open(os.path.join(output_dir, 'stacks.folded'), 'w', encoding='utf-8') as merged:
+        for path in sorted(glob.glob(os.path.join(output_dir, '*.folded'))):
+            if os.path.basename(path) == 'stacks.folded':
+                continue
+            label = os.path.basename(path)[:-len('.folded')]
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    # Root every stack at its process; a subprocess's own stage already is
+                    merged.write(line if line.startswith(f"{label};") else f"{label};{line}")
+
+    for path in sorted(glob.glob(os.path.join(output_dir, '*.profile.json'))):
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+        interval = summary['sample_interval']
+        for stage, category, samples in summary['waits']:
+            row = per_stage.setdefault(stage, {'peak_mb': 0.0})
+            row[category] = row.get(category, 0.0) + samples * interval
+        for stage, peak in summary['peaks'].items():
+            row = per_stage.setdefault(stage, {'peak_mb': 0.0})
+            row['peak_mb'] = max(row['peak_mb'], peak / 2**20)
+
+    for stage, metrics in stage_metrics.items():
+        row = per_stage.setdefault(stage, {'peak_mb': 0.0})
+        row['wall'] = metrics['wall_seconds']
+        row['cpu_time'] = metrics['cpu_seconds']
+
+    header = ['stage', 'wall s', 'cpu s', 'peak MB', 'sampled cpu'] + WAIT_CATEGORIES
+    rows = [header]
+    for stage in sorted(per_stage, key=lambda name: -per_stage[name].get('wall', 0)):
+        row = per_stage[stage]
+        rows.append([stage, f"{row.get('wall', 0):.2f}", f"{row.get('cpu_time', 0):.2f}", f"{row['peak_mb']:.1f}",
+                     f"{row.get('cpu', 0):.2f}"] + [f"{row.get(category, 0):.2f}" for category in WAIT_CATEGORIES])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    table = '\n'.join('  '.join(cell.ljust(width) if i == 0 else cell.rjust(width)
+                                for i, (cell, width) in enumerate(zip(row, widths))) for row in rows)
+    with open(os.path.join(output_dir, 'profile_summary.txt'), 'w', encoding='utf-8') as f:
+        f.write(table + '\n')
+    return table
+
+def profile_pipeline(run, output_dir=None):
+    """Run the pipeline with profiling on here and in every scraper subprocess, then print the merged summary"""
+    from run_metrics import METRICS
+
+    output_dir = os.path.abspath(output_dir or os.path.join(PROFILE_ROOT, datetime.now().strftime('%Y%m%d-%H%M%S')))
+    os.environ[PROFILE_DIR_ENV] = output_dir
+    profiler = Profiler(output_dir).start()
+    try:
+        return run()
+    finally:
+        profiler.stop()
+        del os.environ[PROFILE_DIR_ENV]
+        profiler.write()
+        table = merge_profiles(output_dir, METRICS.snapshot()['stages'])
+        print(f"\n🔬 PROFILE (seconds; waits are sampled every {SAMPLE_INTERVAL * 1000:.0f}ms across all threads):")
+        print(table)
+        print(f"   Flamegraph stacks: {os.path.join(output_dir, 'stacks.folded')} "
+              f"(flamegraph.pl, speedscope); per-stage cProfile: {output_dir}/*.pstats")
@@ -0,0 +1,93 @@
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from run_metrics import METRICS
+
+# --- Configuration ---
+RATE_LIMIT_FILE_ENV = 'PIPELINE_RATE_LIMIT_FILE'   # Overrides where the shared token buckets live
+# Shared by every pipeline process on the machine, whatever directory it runs in
+RATE_LIMIT_FILE = os.path.join(tempfile.gettempdir(), "foreclosure_pipeline_rate_limits.json")
+DEFAULT_RATE = 2.0     # Requests per second to one host, across all processes
+DEFAULT_BURST = 4      # Requests a host may get back to back after a quiet spell
+# Per-host overrides of the settings above
+HOST_RATE_LIMITS = {
+    # Nominatim's usage policy: an absolute maximum of 1 request per second
+    'nominatim.openstreetmap.org': {'rate': 1.0, 'burst': 1},
+    # The county/trustee sites: the pace the scrapers' REQUEST_DELAY used to keep
+    'tnledger.com': {'rate': 1.0, 'burst': 1},
+    'phillipjoneslaw.com': {'rate': 1.0, 'burst': 1},
+    # Results grid pages are posted back in parallel (wilson.PAGE_WORKERS)
+    'sales.wilson-assoc.com': {'rate': 4.0, 'burst': 4},
+}
+
+def shared_limits_available():
+    """Cross-process limits need fcntl file locks; without them (Windows) each process limits only itself"""
+    return importlib.util.find_spec('fcntl') is not None
+
+class RateLimiter:
+    """Host-keyed token buckets shared by every pipeline process through a lock-protected JSON file.
+
+    Each acquire() takes a token under an exclusive flock, letting the bucket go negative to reserve a
+    future slot, then sleeps outside the lock until that slot comes. Concurrent callers, in this process
+    or in a scraper subprocess, are spaced out in arrival order and the aggregate rate to a host never
+    exceeds its limit.
+    """
+    def __init__(self, path=None, host_limits=HOST_RATE_LIMITS):
+        self.path = path or os.environ.get(RATE_LIMIT_FILE_ENV) or RATE_LIMIT_FILE
+        self.host_limits = host_limits
+        self.shared = shared_limits_available()
+        self._local = {}               # Buckets when the file can't be used
+        self._lock = threading.Lock()  # flock is per process, so threads also queue here
+
+    def limits(self, host):
+        settings = self.host_limits.get(host, {})
+        return settings.get('rate', DEFAULT_RATE), settings.get('burst', DEFAULT_BURST)
+
+    @contextmanager
+    def _buckets(self):
+        """The host -> [tokens, updated_at] table, exclusively locked and written back on exit"""
+        with self._lock:
+            if self.shared:
+                try:
+                    f = open(self.path, 'a+', encoding='utf-8')
+                except OSError as e:
+                    print(f"⚠️ Could not open {self.path} ({e}), rate limiting this process only")
+                    self.shared = False
+            if not self.shared:
+                yield self._local
+                return
+            import fcntl
+
+            with f:
+                fcntl.flock(f, fcntl.LOCK_EX)   # Released when the file is closed
+                f.seek(0)
+                try:
+                    buckets = json.loads(f.read() or '{}')
+                except ValueError:
+                    buckets = {}   # Cut short by a kill mid-write; full buckets are the safe restart
+                yield buckets
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(buckets))
+                f.flush()
+
+    def acquire(self, host):
+        """Wait for the host's next request slot; returns the seconds waited"""
+        rate, burst = self.limits(host)
+        with self._buckets() as buckets:
+            now = time.time()   # Wall clock: the one clock every process agrees on
+            tokens, updated_at = buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + max(now - updated_at, 0) * rate) - 1
+            buckets[host] = [tokens, now]
+        wait = max(-tokens / rate, 0.0)
+        if wait > 0:
+            time.sleep(wait)
+        METRICS.throttle(host, wait)
+        return wait
+
+RATE_LIMITER = RateLimiter()
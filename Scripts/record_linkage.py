@@ -0,0 +1,205 @@
+import hashlib
+from difflib import SequenceMatcher
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# --- Configuration ---
+MATCH_THRESHOLD = 0.85          # Weighted score needed to link two records
+MIN_STREET_SIMILARITY = 0.8     # Street names must be close regardless of the other fields
+MAX_DATE_GAP_DAYS = 90          # Sale dates further apart than this score 0 (postponements stay within it)
+MAX_BLOCK_SIZE = 200            # Larger blocks are skipped rather than compared pairwise
+GEOCODE_CELL_DEGREES = 0.001    # ~100 m grid used to block records that already carry LAT/LON
+# GEOCODE_METHODs that locate the house itself; ZIP/city centroids put a whole area in one cell
+PRECISE_GEOCODE_METHODS = ['full_address', 'street_only']
+WEIGHTS = {'street': 0.6, 'city': 0.2, 'date': 0.2}
+
+STREET_ABBREVIATIONS = {
+    'alley': 'aly', 'avenue': 'ave', 'boulevard': 'blvd', 'circle': 'cir', 'court': 'ct',
+    'cove': 'cv', 'drive': 'dr', 'highway': 'hwy', 'lane': 'ln', 'parkway': 'pkwy',
+    'pike': 'pk', 'place': 'pl', 'road': 'rd', 'street': 'st', 'terrace': 'ter', 'trail': 'trl',
+    'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
+}
+ABBREVIATION_PATTERN = r'\b(' + '|'.join(STREET_ABBREVIATIONS) + r')\b'
+STREET_TYPES = ['aly', 'ave', 'blvd', 'cir', 'ct', 'cv', 'dr', 'hwy', 'ln', 'pkwy', 'pk', 'pl', 'rd', 'st', 'ter', 'trl', 'way']
+# House number, at least one name word, then a street type; anything after it (city without a comma) is dropped
+STREET_LINE_PATTERN = r'^(\d+\s+\w.*?\s(?:' + '|'.join(STREET_TYPES) + r')(?:\s+[nsew])?)\b'
+
+# --- Normalization (vectorized) ---
+def normalize_street(addresses):
+    """Lower-cased street line with punctuation, unit markers and state/ZIP tails removed"""
+    street = addresses.astype(object).where(addresses.notna(), "").astype(str).str.lower()
+    street = street.str.split(',', n=1).str[0]
+    street = street.str.replace(r'\b(tn|tennessee)\b.*$', '', regex=True)
+    street = street.str.replace(r'[^\w\s]', ' ', regex=True)
+    street = street.str.replace(r'\b(unit|apt|suite|ste)\b', '#', regex=True)
+    street = street.str.replace(ABBREVIATION_PATTERN, lambda m: STREET_ABBREVIATIONS[m.group(1)], regex=True)
+    street = street.str.replace(r'\s+', ' ', regex=True).str.strip()
+    return street.str.extract(STREET_LINE_PATTERN, expand=False).fillna(street)
+
+def extract_zip(addresses):
+    """Last 5-digit group in the address (house numbers can also be 5 digits)"""
+    text = addresses.astype(object).where(addresses.notna(), "").astype(str)
+    return text.str.extract(r'(\d{5})(?:-\d{4})?\D*$', expand=False)
+
+def build_link_keys(df):
+    """Per-record normalized fields used for blocking and scoring"""
+    keys = pd.DataFrame(index=df.index)
+    keys['street'] = normalize_street(df['ADDRESS'])
+    keys['house_number'] = keys['street'].str.extract(r'^(\d+)\b', expand=False)
+    keys['street_initial'] = keys['street'].str.extract(r'^\d+\s+(?:[nsew]\s+)?(\w)', expand=False)
+    keys['zip'] = extract_zip(df['ADDRESS'])
+    city = df['CTY'] if 'CTY' in df.columns else pd.Series("", index=df.index)
+    keys['city'] = city.astype(object).where(city.notna(), "").astype(str).str.lower().str.strip()
+    if 'DATE' in df.columns:
+        keys['date'] = pd.to_datetime(df['DATE'], errors='coerce').astype('datetime64[ns]')
+    else:
+        keys['date'] = pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+
+    if 'LAT' in df.columns and 'LON' in df.columns:
+        lat_cell = (pd.to_numeric(df['LAT'], errors='coerce') // GEOCODE_CELL_DEGREES).astype('Int64')
+        lon_cell = (pd.to_numeric(df['LON'], errors='coerce') // GEOCODE_CELL_DEGREES).astype('Int64')
+        keys['geo_cell'] = lat_cell.astype(str) + '_' + lon_cell.astype(str)
+        method = df['GEOCODE_METHOD'] if 'GEOCODE_METHOD' in df.columns else pd.Series(None, index=df.index)
+        precise = method.isin(PRECISE_GEOCODE_METHODS)
+        keys.loc[lat_cell.isna() | lon_cell.isna() | ~precise, 'geo_cell'] = None
+    return keys
+
+def canonical_keys(keys):
+    """ZIP|street key per record (None without a street line); equal keys describe the same building, though
+    not necessarily the same sale"""
+    return (keys['zip'].fillna('') + '|' + keys['street']).where(keys['street'] != "")
+
+# --- Blocking ---
+def blocking_keys(keys):
+    """Blocking key Series; records only get compared when they share one of these"""
+    blocks = {
+        'zip_house': keys['zip'] + '|' + keys['house_number'],
+        'city_house': (keys['city'].where(keys['city'] != "") + '|' + keys['house_number']
+                       + '|' + keys['street_initial']),
+    }
+    if 'geo_cell' in keys.columns:
+        blocks['geo_cell'] = keys['geo_cell']
+    return blocks
+
+def candidate_pairs(keys):
+    """DataFrame of (left, right) positional row pairs sharing at least one block"""
+    has_zip = keys['zip'].notna().to_numpy()
+    pairs = []
+    for name, block in blocking_keys(keys).items():
+        block = pd.DataFrame({'key': block.to_numpy(), 'row': range(len(block))}).dropna(subset=['key'])
+        sizes = block['key'].map(block['key'].value_counts())
+        oversized = block.loc[sizes > MAX_BLOCK_SIZE, 'key'].unique()
+        if len(oversized):
+            print(f"   ⚠️ Skipping {len(oversized)} oversized '{name}' blocks during record linkage")
+        block = block[(sizes > 1) & (sizes <= MAX_BLOCK_SIZE)]
+        if block.empty:
+            continue
+        
+        # City + house number only stands in for a missing ZIP, so one side must lack it
+        left = block[~has_zip[block['row'].to_numpy()]] if name == 'city_house' else block
+        merged = left.merge(block, on='key', suffixes=('_l', '_r'))
+        merged = merged[merged['row_l'] != merged['row_r']]
+        pairs.append(pd.DataFrame({
+            'row_l': merged[['row_l', 'row_r']].min(axis=1),
+            'row_r': merged[['row_l', 'row_r']].max(axis=1),
+        }))
+
+    if not pairs:
+        return pd.DataFrame({'row_l': pd.Series(dtype=int), 'row_r': pd.Series(dtype=int)})
+    return pd.concat(pairs, ignore_index=True).drop_duplicates().reset_index(drop=True).astype(int)
+
+# --- Scoring ---
+def string_similarity(a, b):
+    """SequenceMatcher ratio, short-circuited through its cheaper upper bounds"""
+    matcher = SequenceMatcher(None, a, b)
+    for bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+        upper = bound()
+        if upper < MIN_STREET_SIMILARITY:
+            return upper
+    return matcher.ratio()
+
+def similarity_scores(left_values, right_values):
+    """Pairwise string similarity; exact matches and empty values are resolved without SequenceMatcher"""
+    scores = np.where(left_values == right_values, 1.0, np.nan)
+    empty = (left_values == "") | (right_values == "")
+    todo = np.flatnonzero(np.isnan(scores) & ~empty)
+    scores[todo] = [string_similarity(left_values[i], right_values[i]) for i in todo]
+    scores[empty] = np.nan
+    return scores
+
+def score_pairs(keys, pairs):
+    """Weighted similarity for each candidate pair; missing city/date scores neutral (0.5).
+    Pairs whose house numbers are both known and differ score 0, however close the street names are."""
+    left = pairs['row_l'].to_numpy()
+    right = pairs['row_r'].to_numpy()
+    street = keys['street'].to_numpy(dtype=object)
+    city = keys['city'].to_numpy(dtype=object)
+
+    street_scores = np.nan_to_num(similarity_scores(street[left], street[right]), nan=0.0)
+    city_scores = np.nan_to_num(similarity_scores(city[left], city[right]), nan=0.5)
+
+    date = keys['date'].to_numpy(dtype='datetime64[ns]')
+    gap_days = np.abs((date[left] - date[right]) / np.timedelta64(1, 'D'))
+    date_scores = np.clip(1 - gap_days / MAX_DATE_GAP_DAYS, 0.0, 1.0)
+    date_scores = np.where(np.isnan(gap_days), 0.5, date_scores)
+
+    house = keys['house_number'].to_numpy(dtype=object)
+    house_conflict = pd.notna(house[left]) & pd.notna(house[right]) & (house[left] != house[right])
+
+    scored = pairs.copy()
+    scored['street_score'] = street_scores
+    scored['score'] = np.where(house_conflict, 0.0,
+                               WEIGHTS['street'] * street_scores
+                               + WEIGHTS['city'] * city_scores
+                               + WEIGHTS['date'] * date_scores)
+    return scored
+
+# --- Clustering ---
+def cluster_pairs(n_records, matches):
+    """Union-find over matched pairs; returns a cluster root per record"""
+    parent = list(range(n_records))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for left, right in matches:
+        root_l, root_r = find(left), find(right)
+        if root_l != root_r:
+            parent[max(root_l, root_r)] = min(root_l, root_r)
+    return [find(i) for i in range(n_records)]
+
+def link_records(df):
+    """Assign a PROPERTY_ID shared by records that describe the same property"""
+    if df.empty:
+        df['PROPERTY_ID'] = pd.Series(dtype=object)
+        return df
+
+    keys = build_link_keys(df)
+    pairs = candidate_pairs(keys)
+    scored = score_pairs(keys, pairs)
+    matched = scored[(scored['score'] >= MATCH_THRESHOLD) & (scored['street_score'] >= MIN_STREET_SIMILARITY)]
+    roots = pd.Series(cluster_pairs(len(df), zip(matched['row_l'], matched['row_r'])), index=df.index)
+
+    # The ID hashes the cluster's smallest ZIP|street key, so it is stable across runs and postponements.
+    # Separate sales of one building (same key, dates too far apart to link) are numbered by their earliest
+    # date; records without a street line can't be linked and get no ID
+    clusters = pd.DataFrame({
+        'root': roots,
+        'key': canonical_keys(keys).groupby(roots).transform('min'),
+        'date': keys['date'].groupby(roots).transform('min'),
+    }).drop_duplicates(subset=['root']).dropna(subset=['key'])
+    clusters = clusters.sort_values(['key', 'date'], kind='stable')
+    sale = clusters.groupby('key').cumcount()
+    identity = clusters['key'].where(sale == 0, clusters['key'] + '|' + sale.astype(str))
+    ids = {root: hashlib.sha1(key.encode('utf-8')).hexdigest()[:12] for root, key in zip(clusters['root'], identity)}
+    df['PROPERTY_ID'] = roots.map(ids).astype(object).where(roots.isin(list(ids)), None)
+
+    linked = len(df) - roots.nunique()
+    print(f"   🔗 Record linkage: {len(pairs)} candidate pairs, {len(matched)} matches, "
+          f"{linked} records linked to an existing property")
+    return df
@@ -0,0 +1,45 @@
+import time
+from datetime import datetime, timedelta
+
+# --- Configuration ---
+RUN_DEADLINE_SECONDS = 45 * 60   # Default bound on a whole run
+# Share of the run by which each stage must be done; time a stage doesn't use passes to the next one
+STAGE_BUDGETS = {'scrape': 0.5, 'geocode': 0.85, 'publish': 1.0}
+DEADLINE_METHOD_SUFFIX = '_deadline'   # GEOCODE_METHOD of centroid fallbacks used because geocoding ran out of time
+
+class RunBudget:
+    """A run's deadline, split into stage budgets that end at fixed points of the run.
+
+    Stages check their own deadline and degrade instead of overrunning it: scrapers still running are
+    stopped (their sources keep last run's data), geocoding falls back to ZIP/city centroids.
+    """
+    def __init__(self, seconds=RUN_DEADLINE_SECONDS, stage_budgets=STAGE_BUDGETS):
+        self.started = time.monotonic()
+        self.seconds = seconds
+        self.stage_budgets = stage_budgets
+
+    @classmethod
+    def until(cls, clock_time, now=None, **kwargs):
+        """A budget ending at the next occurrence of clock_time ('HH:MM', local time)"""
+        now = now or datetime.now()
+        hour, minute = (int(part) for part in clock_time.split(':'))
+        end = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if end <= now:
+            end += timedelta(days=1)
+        return cls((end - now).total_seconds(), **kwargs)
+
+    def deadline(self, stage=None):
+        """time.monotonic() by which `stage` (or the whole run) must be done"""
+        return self.started + self.seconds * self.stage_budgets.get(stage, 1.0)
+
+    def remaining(self, stage=None):
+        return max(self.deadline(stage) - time.monotonic(), 0.0)
+
+    def expired(self, stage=None):
+        return time.monotonic() >= self.deadline(stage)
+
+    def describe(self):
+        end = datetime.now() + timedelta(seconds=self.remaining())
+        stages = ', '.join(f"{stage} by {(datetime.now() + timedelta(seconds=self.remaining(stage))):%H:%M}"
+                           for stage in self.stage_budgets)
+        return f"run deadline {end:%H:%M} ({stages})"
@@ -0,0 +1,297 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# --- Configuration ---
+RUN_REPORT_FILENAME = "pipeline_run_report.json"
+PROMETHEUS_TEXTFILE = "pipeline_metrics.prom"      # Point node_exporter's textfile collector at this
+METRICS_EXPORT_ENV = 'PIPELINE_METRICS_EXPORT'     # Set for scraper subprocesses; they write their metrics there on exit
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30)   # Seconds, Prometheus histogram upper bounds
+CIRCUIT_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+def host_of(url):
+    return urlsplit(url).hostname or url
+
+class RunMetrics:
+    """Process-wide counters for one pipeline run; every update is a dict write under one lock"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.observers = []   # Objects with stage_started(name) / stage_finished(name), e.g. the profiler
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.stages = {}            # name -> wall_seconds, cpu_seconds, calls, rows_in, rows_out
+            self.hosts = {}             # host -> requests, errors, statuses, latency bucket counts, latency sum
+            self.caches = {}            # name -> hits, misses
+            self.geocode_methods = {}   # method -> count
+            self.pages = {}             # browser page -> loads, bytes, requests
+            self.circuits = {}          # host -> breaker state, concurrency limit, trips, rejected calls
+            self.throttles = {}         # host -> rate-limited calls, seconds spent waiting for a slot
+
+    # --- Stages ---
+    def _stage(self, name):
+        return self.stages.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'calls': 0,
+                                             'rows_in': 0, 'rows_out': 0})
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as a stage; CPU time is process-wide, so it includes helper threads"""
+        self._notify('stage_started', name)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.add_stage_time(name, time.perf_counter() - wall, time.process_time() - cpu)
+            self._notify('stage_finished', name)
+
+    def _notify(self, event, name):
+        for observer in list(self.observers):
+            getattr(observer, event)(name)
+
+    def add_stage_time(self, name, wall_seconds, cpu_seconds=0.0):
+        with self._lock:
+            stage = self._stage(name)
+            stage['wall_seconds'] += wall_seconds
+            stage['cpu_seconds'] += cpu_seconds
+            stage['calls'] += 1
+
+    def rows(self, name, rows_in=0, rows_out=0):
+        with self._lock:
+            stage = self._stage(name)
+            stage['rows_in'] += int(rows_in)
+            stage['rows_out'] += int(rows_out)
+
+    # --- Outbound requests ---
+    def record_request(self, host, seconds, status=None, error=False):
+        with self._lock:
+            entry = self.hosts.setdefault(host, {'requests': 0, 'errors': 0, 'statuses': {},
+                                                 'latency_buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                                                 'latency_sum': 0.0})
+            entry['requests'] += 1
+            entry['errors'] += int(bool(error) or (status is not None and status >= 400))
+            if status is not None:
+                entry['statuses'][str(status)] = entry['statuses'].get(str(status), 0) + 1
+            bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound), len(LATENCY_BUCKETS))
+            entry['latency_buckets'][bucket] += 1
+            entry['latency_sum'] += seconds
+
+    @contextmanager
+    def request(self, url):
+        """Time one outbound call: `with METRICS.request(url) as call: ...; call['status'] = response.status_code`"""
+        call = {'status': None}
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            self.record_request(host_of(url), time.perf_counter() - start, call['status'], error=True)
+            raise
+        self.record_request(host_of(url), time.perf_counter() - start, call['status'])
+
+    def circuit(self, host, **fields):
+        """Latest breaker state and concurrency limit of a host (see host_guard)"""
+        with self._lock:
+            self.circuits.setdefault(host, {}).update(fields)
+
+    def throttle(self, host, waited):
+        """One call that went through the host's shared rate limit (see rate_limiter)"""
+        with self._lock:
+            entry = self.throttles.setdefault(host, {'calls': 0, 'delayed': 0, 'wait_seconds': 0.0})
+            entry['calls'] += 1
+            entry['delayed'] += int(waited > 0)
+            entry['wait_seconds'] += waited
+
+    # --- Caches and geocoding ---
+    def cache(self, name, hits=0, misses=0):
+        with self._lock:
+            entry = self.caches.setdefault(name, {'hits': 0, 'misses': 0})
+            entry['hits'] += int(hits)
+            entry['misses'] += int(misses)
+
+    def geocode_counts(self, counts):
+        with self._lock:
+            for method, count in counts.items():
+                self.geocode_methods[method] = self.geocode_methods.get(method, 0) + int(count)
+
+    def page_bytes(self, page, transferred, requests=0):
+        with self._lock:
+            entry = self.pages.setdefault(page, {'loads': 0, 'bytes': 0, 'requests': 0})
+            entry['loads'] += 1
+            entry['bytes'] += int(transferred)
+            entry['requests'] += int(requests)
+
+    # --- Snapshots ---
+    def snapshot(self):
+        with self._lock:
+            caches = {name: dict(entry, hit_rate=entry['hits'] / max(entry['hits'] + entry['misses'], 1))
+                      for name, entry in self.caches.items()}
+            return json.loads(json.dumps({
+                'started_at': datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds'),
+                'duration_seconds': time.time() - self.started_at,
+                'stages': self.stages,
+                'hosts': self.hosts,
+                'latency_buckets': list(LATENCY_BUCKETS),
+                'caches': caches,
+                'geocode_methods': self.geocode_methods,
+                'pages': self.pages,
+                'circuits': self.circuits,
+                'throttles': self.throttles,
+            }))
+
+    def merge(self, snapshot):
+        """Fold in a snapshot exported by a subprocess"""
+        for name, stage in snapshot.get('stages', {}).items():
+            self.add_stage_time(name, stage['wall_seconds'], stage['cpu_seconds'])
+            self.rows(name, stage['rows_in'], stage['rows_out'])
+        with self._lock:
+            for host, other in snapshot.get('hosts', {}).items():
+                entry = self.hosts.setdefault(host, {'requests': 0, 'errors': 0, 'statuses': {},
+                                                     'latency_buckets': [0] * (len(LATENCY_BUCKETS) + 1),
+                                                     'latency_sum': 0.0})
+                entry['requests'] += other['requests']
+                entry['errors'] += other['errors']
+                for status, count in other['statuses'].items():
+                    entry['statuses'][status] = entry['statuses'].get(status, 0) + count
+                entry['latency_buckets'] = [a + b for a, b in zip(entry['latency_buckets'], other['latency_buckets'])]
+                entry['latency_sum'] += other['latency_sum']
+        for name, entry in snapshot.get('caches', {}).items():
+            self.cache(name, entry['hits'], entry['misses'])
+        self.geocode_counts(snapshot.get('geocode_methods', {}))
+        for page, entry in snapshot.get('pages', {}).items():
+            with self._lock:
+                mine = self.pages.setdefault(page, {'loads': 0, 'bytes': 0, 'requests': 0})
+                for key in mine:
+                    mine[key] += entry[key]
+        for host, entry in snapshot.get('circuits', {}).items():
+            with self._lock:
+                mine = self.circuits.setdefault(host, {'trips': 0, 'rejected': 0})
+                # A subprocess's state and limit are its last word on the host; trips and rejections add up
+                mine.update(entry, trips=mine.get('trips', 0) + entry.get('trips', 0),
+                            rejected=mine.get('rejected', 0) + entry.get('rejected', 0))
+        for host, entry in snapshot.get('throttles', {}).items():
+            with self._lock:
+                mine = self.throttles.setdefault(host, {'calls': 0, 'delayed': 0, 'wait_seconds': 0.0})
+                for key in mine:
+                    mine[key] += entry[key]
+
+    def merge_file(self, path):
+        """Merge and delete a subprocess export, if the subprocess got as far as writing one"""
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.merge(json.load(f))
+        finally:
+            os.remove(path)
+        return True
+
+    # --- Exports ---
+    def write_json_report(self, path=RUN_REPORT_FILENAME, **extra):
+        report = self.snapshot()
+        report.update(extra)
+        _write_atomically(path, json.dumps(report, indent=2, default=str))
+        return path
+
+    def prometheus_text(self):
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        stages = snapshot['stages']
+        metric('pipeline_run_duration_seconds', 'gauge', 'Wall-clock seconds of the last run',
+               [({}, round(snapshot['duration_seconds'], 3))])
+        metric('pipeline_stage_wall_seconds', 'gauge', 'Wall-clock seconds spent per stage',
+               [({'stage': name}, round(stage['wall_seconds'], 3)) for name, stage in stages.items()])
+        metric('pipeline_stage_cpu_seconds', 'gauge', 'Process CPU seconds spent per stage',
+               [({'stage': name}, round(stage['cpu_seconds'], 3)) for name, stage in stages.items()])
+        metric('pipeline_stage_rows_in', 'gauge', 'Rows entering each stage',
+               [({'stage': name}, stage['rows_in']) for name, stage in stages.items()])
+        metric('pipeline_stage_rows_out', 'gauge', 'Rows leaving each stage',
+               [({'stage': name}, stage['rows_out']) for name, stage in stages.items()])
+
+        hosts = snapshot['hosts']
+        metric('pipeline_http_requests_total', 'counter', 'Outbound requests per host',
+               [({'host': host}, entry['requests']) for host, entry in hosts.items()])
+        metric('pipeline_http_errors_total', 'counter', 'Failed or >=400 outbound requests per host',
+               [({'host': host}, entry['errors']) for host, entry in hosts.items()])
+        lines.append("# HELP pipeline_http_request_duration_seconds Outbound request latency per host")
+        lines.append("# TYPE pipeline_http_request_duration_seconds histogram")
+        for host, entry in hosts.items():
+            cumulative = 0
+            for bound, count in zip(list(LATENCY_BUCKETS) + ['+Inf'], entry['latency_buckets']):
+                cumulative += count
+                lines.append(f'pipeline_http_request_duration_seconds_bucket{{host="{_escape(host)}",le="{bound}"}} '
+                             f'{cumulative}')
+        lines.extend(f'pipeline_http_request_duration_seconds_sum{{host="{_escape(host)}"}} '
+                     f'{round(entry["latency_sum"], 3)}' for host, entry in hosts.items())
+        lines.extend(f'pipeline_http_request_duration_seconds_count{{host="{_escape(host)}"}} {entry["requests"]}'
+                     for host, entry in hosts.items())
+
+        caches = snapshot['caches']
+        metric('pipeline_cache_hits_total', 'counter', 'Cache hits per cache',
+               [({'cache': name}, entry['hits']) for name, entry in caches.items()])
+        metric('pipeline_cache_misses_total', 'counter', 'Cache misses per cache',
+               [({'cache': name}, entry['misses']) for name, entry in caches.items()])
+        metric('pipeline_geocode_method_total', 'counter', 'Records resolved by each geocoding strategy',
+               [({'method': method}, count) for method, count in snapshot['geocode_methods'].items()])
+        metric('pipeline_browser_page_bytes_total', 'counter', 'Bytes downloaded by browser page loads',
+               [({'page': page}, entry['bytes']) for page, entry in snapshot['pages'].items()])
+        metric('pipeline_browser_page_loads_total', 'counter', 'Browser page loads',
+               [({'page': page}, entry['loads']) for page, entry in snapshot['pages'].items()])
+
+        circuits = snapshot['circuits']
+        metric('pipeline_circuit_state', 'gauge', 'Circuit breaker state per host (0 closed, 1 half-open, 2 open)',
+               [({'host': host}, CIRCUIT_STATE_VALUES.get(entry.get('state'), 0)) for host, entry in circuits.items()])
+        metric('pipeline_circuit_trips_total', 'counter', 'Times a host\'s circuit opened',
+               [({'host': host}, entry.get('trips', 0)) for host, entry in circuits.items()])
+        metric('pipeline_circuit_rejected_total', 'counter', 'Calls fast-failed by an open circuit',
+               [({'host': host}, entry.get('rejected', 0)) for host, entry in circuits.items()])
+        metric('pipeline_host_concurrency_limit', 'gauge', 'Adaptive concurrency limit per host',
+               [({'host': host}, entry.get('concurrency_limit', 0)) for host, entry in circuits.items()])
+
+        throttles = snapshot['throttles']
+        metric('pipeline_rate_limit_delayed_total', 'counter', 'Calls held back by a host\'s shared rate limit',
+               [({'host': host}, entry['delayed']) for host, entry in throttles.items()])
+        metric('pipeline_rate_limit_wait_seconds_total', 'counter', 'Seconds spent waiting for a host\'s rate limit',
+               [({'host': host}, round(entry['wait_seconds'], 3)) for host, entry in throttles.items()])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus_textfile(self, path=PROMETHEUS_TEXTFILE):
+        _write_atomically(path, self.prometheus_text())
+        return path
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _write_atomically(path, text):
+    tmp_path = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+METRICS = RunMetrics()
+
+def export_on_exit():
+    """In a scraper subprocess started by the unifier, write this process's metrics (and profile, under
+    --profile) for the parent to merge"""
+    from profiling import PROFILE_DIR_ENV, start_subprocess_profiling
+
+    path = os.environ.get(METRICS_EXPORT_ENV)
+    if path:
+        atexit.register(lambda: _write_atomically(path, json.dumps(METRICS.snapshot())))
+    if os.environ.get(PROFILE_DIR_ENV):
+        start_subprocess_profiling(f"scrape_{os.path.splitext(os.path.basename(sys.argv[0]))[0]}")
@@ -0,0 +1,112 @@
+import importlib
+import json
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from run_metrics import METRICS
+
+# --- Configuration ---
+SCHEDULER_STATE_FILENAME = "scheduler_state.json"   # Last start and last probe result per source, kept across restarts
+IDLE_POLL_SECONDS = 60     # Longest sleep between checks for due sources
+HTTP_WORKERS = 4           # Plain-HTTP sources scraping at once; Chrome sources always run one at a time
+
+def load_scheduler_state(path=SCHEDULER_STATE_FILENAME):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read {path} ({e}), every source is due now")
+        return {}
+
+def save_scheduler_state(state, path=SCHEDULER_STATE_FILENAME):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+def next_due(spec, entry):
+    """Epoch seconds at which a source should run again; never-run sources are due immediately"""
+    return entry.get('last_started', 0) + spec['cadence_minutes'] * 60
+
+def run_source(source_name, spec, entry):
+    """Run one source's scraper inside this process, so its imports, HTTP session and caches stay warm.
+
+    With a 'probe', the scraper only runs when the probe's result differs from the last run's.
+    Returns True if the source's CSV was refreshed.
+    """
+    module = importlib.import_module(os.path.splitext(spec['script'])[0])
+    marker = None
+    if spec.get('probe'):
+        marker = getattr(module, spec['probe'])()
+        if marker is not None and marker == entry.get('marker'):
+            print(f"   💤 {source_name}: unchanged since its last run, skipping")
+            return False
+    with METRICS.stage(f"scrape_{source_name}"):
+        module.main()
+    if marker is not None:
+        entry['marker'] = marker
+    return True
+
+def _stop_on_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
+def run_daemon(source_specs, refresh):
+    """Run each source on its own cadence until interrupted, calling refresh() after sources complete.
+
+    refresh rebuilds the unified output from every source's latest CSV; the location state makes
+    that incremental, so only records a source has just added or changed are geocoded.
+    """
+    state = load_scheduler_state()
+    pools = {'thread': ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix='scheduler-http'),
+             'browser': ThreadPoolExecutor(max_workers=1, thread_name_prefix='scheduler-browser')}
+    running = {}   # future -> source name
+    signal.signal(signal.SIGTERM, _stop_on_sigterm)
+    print(f"🗓️ Scheduler running {len(source_specs)} sources: " +
+          ', '.join(f"{name} every {spec['cadence_minutes']}m" for name, spec in source_specs.items()))
+
+    try:
+        while True:
+            now = time.time()
+            for source_name, spec in source_specs.items():
+                entry = state.setdefault(source_name, {})
+                if source_name in running.values() or now < next_due(spec, entry):
+                    continue
+                entry['last_started'] = now
+                pool = pools['browser' if spec.get('browser') else 'thread']
+                print(f"▶️ {source_name} started")
+                running[pool.submit(run_source, source_name, spec, entry)] = source_name
+
+            idle = [next_due(spec, state[name]) for name, spec in source_specs.items() if name not in running.values()]
+            timeout = min([IDLE_POLL_SECONDS] + [max(due - time.time(), 1) for due in idle])
+            if not running:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            refreshed = []
+            for future in done:
+                source_name = running.pop(future)
+                try:
+                    if future.result():
+                        refreshed.append(source_name)
+                except Exception as e:
+                    print(f"❌ {source_name} failed: {e}")
+            if refreshed:
+                print(f"🔄 Refreshing unified output after {', '.join(refreshed)}")
+                try:
+                    refresh()
+                except Exception as e:
+                    print(f"❌ Refresh failed: {e}")
+                # The refresh exported this cycle's metrics (its scrapes and itself); the next cycle counts from zero
+                METRICS.reset()
+            save_scheduler_state(state)
+    except KeyboardInterrupt:
+        print(f"\n🛑 Scheduler stopped" + (f", abandoning {', '.join(running.values())}" if running else ""))
+    finally:
+        for pool in pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        save_scheduler_state(state)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+# The pipeline scripts import each other as top-level modules, the way they run from Scripts/
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, SCRIPTS_DIR)
+
+def fixture_path(name):
+    return os.path.join(FIXTURES_DIR, name)
+
+def read_fixture(name):
+    with open(fixture_path(name), encoding='utf-8') as f:
+        return f.read()
@@ -0,0 +1,51 @@
+"""Two offline batch runs over the fixture CSVs: the second reuses the location state the first left on disk"""
+import os
+import shutil
+
+import pytest
+
+import incremental_state
+import unifier
+from conftest import fixture_path
+
+@pytest.fixture
+def offline_pipeline(tmp_path, monkeypatch):
+    """The fixture CSVs where the scrapers write them, a working directory of its own and no geocoding service;
+    yields the list of addresses each run sent to the geocoder"""
+    for source_name, spec in unifier.SOURCE_SPECS.items():
+        target = tmp_path / spec['file']
+        os.makedirs(target.parent, exist_ok=True)
+        shutil.copy(fixture_path(f'standardize_{source_name}.csv'), target)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('PIPELINE_RATE_LIMIT_FILE', str(tmp_path / 'rate_limits.json'))
+    monkeypatch.setattr(unifier, 'COLUMNAR_OUTPUT', False)
+    monkeypatch.delenv(unifier.DATABASE_URL_ENV, raising=False)
+
+    processor = unifier.LocationProcessor
+    monkeypatch.setattr(processor, 'geocode_with_nominatim', staticmethod(lambda *args, **kwargs: (None, None)))
+    monkeypatch.setattr(processor, 'geocode_city_fallback', staticmethod(
+        lambda city, state="TN": processor.TN_CITY_COORDINATES.get(str(city or '').lower().strip(), (None, None))))
+
+    geocoded = []
+    geocode_address = unifier.geocode_address
+
+    def counting_geocode_address(address, city):
+        geocoded.append(address)
+        return geocode_address(address, city)
+
+    monkeypatch.setattr(unifier, 'geocode_address', counting_geocode_address)
+    yield geocoded
+
+def test_second_run_geocodes_only_unlocated_addresses(offline_pipeline):
+    first = unifier.unify_sources('batch')
+    first_calls = len(offline_pipeline)
+    assert os.path.exists(incremental_state.STATE_FILENAME)
+    located = int(first['LAT'].notna().sum())
+    assert 0 < located < len(first)
+
+    # Addresses without a location (including the empty ClearRecon one) come back as new records
+    second = unifier.unify_sources('batch')
+    assert len(offline_pipeline) - first_calls < first_calls
+    assert len(second) == len(first)
+    assert int(second['LAT'].notna().sum()) == located
+    assert sorted(second['PROPERTY_ID'].dropna()) == sorted(first['PROPERTY_ID'].dropna())
@@ -0,0 +1,68 @@
+"""PROPERTY_ID assignment: formatting variants and postponements link, neighbours and separate sales don't"""
+import pandas as pd
+
+import record_linkage
+import unifier
+
+def records(rows):
+    """Standardized records from (ADDRESS, CTY, DATE[, SOURCE_NAME]) tuples"""
+    df = pd.DataFrame([row + ('phillipjones',) * (4 - len(row)) for row in rows],
+                      columns=['ADDRESS', 'CTY', 'DATE', 'SOURCE_NAME'])
+    df['DATE'] = pd.to_datetime(df['DATE'], format='%m/%d/%Y')
+    for column in unifier.STANDARD_COLUMNS:
+        if column not in df.columns:
+            df[column] = None
+    return df
+
+def located(df, lat, lon, method):
+    df['LAT'], df['LON'], df['GEOCODE_METHOD'] = lat, lon, method
+    return df
+
+def property_ids(df):
+    return list(record_linkage.link_records(df)['PROPERTY_ID'])
+
+def test_formatting_variants_and_postponements_link():
+    ids = property_ids(records([
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025', 'phillipjones'),
+        ('1512 ELM HILL PIKE, NASHVILLE, TN 37210', 'Nashville', '07/22/2025', 'powerbi'),
+        ('1512 Elm Hill Pk Nashville TN 37210', 'Nashville', '08/19/2025', 'tnledger'),
+    ]))
+    assert ids[0] is not None and len(set(ids)) == 1
+
+def test_neighbouring_houses_in_one_geocode_cell_stay_apart():
+    df = located(records([
+        ('1510 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025'),
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025'),
+        ('12 Main St, Murfreesboro, TN 37130', 'Murfreesboro', '08/05/2025'),
+        ('14 Main St, Murfreesboro, TN 37130', 'Murfreesboro', '08/05/2025'),
+    ]), [36.1390, 36.1390, 35.8456, 35.8456], [-86.7250, -86.7250, -86.3903, -86.3903], 'full_address')
+    assert len(set(property_ids(df))) == 4
+
+def test_centroid_geocodes_do_not_block_together():
+    df = located(records([
+        ('100 Oak Ln, Lebanon, TN 37087', 'Lebanon', '07/29/2025'),
+        ('100 Oak Lane, TN 37087', '', '07/29/2025'),
+        ('400 Lake Rd, Lebanon, TN 37087', 'Lebanon', '07/29/2025'),
+    ]), 36.2081, -86.2911, ['zip_code', 'city_fallback', 'zip_code_deadline'])
+    assert record_linkage.build_link_keys(df)['geo_cell'].isna().all()
+    ids = property_ids(df)
+    assert ids[0] == ids[1] != ids[2]
+
+def test_separate_sales_of_one_address_keep_their_own_ids():
+    df = records([
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025', 'phillipjones'),
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '01/20/2026', 'tnledger'),
+    ])
+    ids = property_ids(df.copy())
+    assert None not in ids and ids[0] != ids[1]
+
+    merged = unifier.link_and_merge(df)
+    assert sorted(merged['DATE'].dt.strftime('%m/%d/%Y')) == ['01/20/2026', '07/22/2025']
+
+def test_first_sale_keeps_the_address_id():
+    alone = property_ids(records([('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025')]))
+    both = property_ids(records([
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '01/20/2026'),
+        ('1512 Elm Hill Pike, Nashville, TN 37210', 'Nashville', '07/22/2025'),
+    ]))
+    assert both[1] == alone[0] != both[0]
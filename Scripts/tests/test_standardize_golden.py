@@ -0,0 +1,61 @@
+"""Golden-file check of source standardization: a small raw CSV per source against the records it must produce.
+
+standardize_expected.csv is the output of the row-wise standardize_* code (bench_standardize.legacy_*) with one
+intended change pinned below, so any other drift in the vectorized specs shows up as a failing cell.
+"""
+import pandas as pd
+import pytest
+
+import bench_standardize
+import unifier
+from conftest import fixture_path
+
+EXPECTED_FILE = 'standardize_expected.csv'
+# The columns the row-wise code produced; STATUS came later
+GOLDEN_COLUMNS = ['SOURCE_NAME', 'SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY']
+NOTICE_URL = 'https://www.tnledger.com/Search/Details/ViewNotice.aspx?id='
+# The one intended difference: a missing substitute_trustee (NaN from a failed or partial detail page) used to
+# leak into FIRM as the string 'nan'; it now falls through to the attorney, then to "TN Ledger"
+NAN_FIRM_FIXES = {
+    NOTICE_URL + '2025-0702': ('nan', 'TN Ledger'),
+    NOTICE_URL + '2025-0733': ('nan', 'Brock & Scott, PLLC'),
+}
+
+def read_source(source_name):
+    return pd.read_csv(fixture_path(f'standardize_{source_name}.csv'))
+
+def as_text(df):
+    """The golden columns as CSV text, missing values as empty strings"""
+    df = df[GOLDEN_COLUMNS].reset_index(drop=True)
+    return df.astype(object).where(df.notna(), '').astype(str)
+
+def current_output():
+    frames = []
+    for source_name in unifier.SOURCE_SPECS:
+        std_df, _ = unifier.standardize_source(source_name, read_source(source_name))
+        std_df = unifier.format_for_csv(std_df)
+        std_df['SOURCE_NAME'] = source_name
+        frames.append(std_df)
+    return as_text(pd.concat(frames, ignore_index=True))
+
+def legacy_output():
+    frames = []
+    for source_name in unifier.SOURCE_SPECS:
+        std_df = bench_standardize.LEGACY_STANDARDIZERS[source_name](read_source(source_name))
+        std_df['SOURCE_NAME'] = source_name
+        frames.append(std_df)
+    return as_text(pd.concat(frames, ignore_index=True))
+
+@pytest.fixture(scope='module')
+def expected():
+    return pd.read_csv(fixture_path(EXPECTED_FILE), dtype=str, keep_default_na=False)
+
+def test_standardized_output_matches_golden_file(expected):
+    pd.testing.assert_frame_equal(current_output(), expected)
+
+def test_only_nan_firm_differs_from_row_wise_code(expected):
+    legacy = legacy_output()
+    differing = (legacy != expected).to_numpy().nonzero()
+    changes = {(expected.at[row, 'SOURCE'], GOLDEN_COLUMNS[column]): (legacy.iat[row, column], expected.iat[row, column])
+               for row, column in zip(*differing)}
+    assert changes == {(source, 'FIRM'): values for source, values in NAN_FIRM_FIXES.items()}
@@ -0,0 +1,52 @@
+"""gvSales parsing of saved server responses: ASP.NET's GridView HTML has no <tbody>, unlike the browser DOM"""
+from bs4 import BeautifulSoup
+
+import wilson
+from conftest import read_fixture
+
+PAGE_1 = read_fixture('wilson_gvsales_page1.html')
+PAGE_2 = read_fixture('wilson_gvsales_page2.html')
+
+def test_results_table_body_without_tbody():
+    soup = BeautifulSoup(PAGE_1, 'html.parser')
+    assert soup.find('table', id='gvSales').find('tbody') is None
+    table_body = wilson.results_table_body(soup)
+    assert table_body is not None and table_body.get('id') == 'gvSales'
+
+def test_rows_skip_header_and_pager():
+    rows = wilson.soup_table_rows(wilson.results_table_body(BeautifulSoup(PAGE_1, 'html.parser')))
+    assert rows[0]['header']
+    assert [row['nested'] for row in rows[1:3]] == [False, False]
+    assert all(row['nested'] for row in rows[3:])   # The pager row and its nested table's row
+
+    sales = wilson.sales_from_rows(rows)
+    assert [sale['PropertyAddress'] for sale in sales] == ['400 Lake Rd', '1512 Elm Hill Pike']
+    assert sales[1] == {'SourceWebsite': 'sales.wilson-assoc.com', 'SaleDate': '7/24/2025', 'SaleTime': '10:00 AM',
+                        'PriorSaleDate': '6/26/2025', 'PropertyAddress': '1512 Elm Hill Pike', 'City': 'Nashville',
+                        'County': 'Davidson', 'State': 'TN', 'ZipCode': '37210',
+                        'SaleLocation': 'Davidson County Courthouse', 'Auctioneer': 'Wilson & Associates'}
+
+def test_form_state_from_response():
+    state = wilson.soup_form_state(BeautifulSoup(PAGE_1, 'html.parser'), wilson.SALES_URL)
+    fields = dict(state['fields'])
+    assert state['action'] == wilson.SALES_URL
+    assert fields['ddlState'] == 'TN' and '__VIEWSTATE' in fields and 'btnSearch' not in fields
+    assert wilson.pager_arguments(state['links']) == {2: 'Page$2'}
+
+def test_search_over_http_reads_every_page(monkeypatch):
+    posted = []
+
+    def post_form(session, state, overrides):
+        posted.append(overrides)
+        return PAGE_2 if overrides.get('__EVENTARGUMENT') == 'Page$2' else PAGE_1
+
+    monkeypatch.setattr(wilson, 'post_form', post_form)
+    form_state = wilson.soup_form_state(BeautifulSoup(PAGE_1, 'html.parser'), wilson.SALES_URL)
+    form_state['search_button'] = ['btnSearch', 'Search']
+    search = {'state': 'AR', 'begin': '2025-07-01', 'end': '2025-07-31'}
+
+    pages = wilson.search_over_http(form_state, search)
+    sales = [sale for rows in pages for sale in wilson.sales_from_rows(rows)]
+    assert [sale['PropertyAddress'] for sale in sales] == ['400 Lake Rd', '1512 Elm Hill Pike', '88 Cedar Ct']
+    assert posted[0]['ddlState'] == 'AR' and posted[0]['btnSearch'] == 'Search'
+    assert [overrides.get('__EVENTARGUMENT') for overrides in posted[1:]] == ['Page$2']
@@ -1,16 +1,20 @@
+import hashlib
+import os
 import requests
-from bs4 import BeautifulSoup
-import time
-import pandas as pd # Optional, but recommended for data handling and CSV export
 import re # For parsing the javascript link
 from urllib.parse import unquote # For decoding URL encoded characters like %2f
+from checkpoint import Journal, exit_with_partial_results, interrupt_on_sigterm
+from host_guard import CircuitOpenError, guarded_request
+from run_metrics import METRICS, export_on_exit
 
 # --- Configuration ---
 BASE_URL = "https://tnledger.com"
-# The initial page with the list of notices
-# You can change the date in the URL to scrape different days
-NOTICES_LIST_URL = "https://tnledger.com/Notices.aspx?noticesDate=7/4/2025"
-REQUEST_DELAY = 1 # Seconds to wait between requests to be polite to the server
+# The list page without a date shows the latest publication date's notices
+CURRENT_NOTICES_URL = f"{BASE_URL}/Notices.aspx"
+# Set a date (M/D/YYYY, e.g. "7/4/2025") to scrape that day's list instead of the latest one
+NOTICES_DATE = None
+NOTICES_LIST_URL = f"{CURRENT_NOTICES_URL}?noticesDate={NOTICES_DATE}" if NOTICES_DATE else CURRENT_NOTICES_URL
+SESSION = requests.Session()   # One connection pool for the list page and every detail page
 
 # --- Helper Function to Fetch Page Content ---
 def fetch_page(url):
@@ -23,7 +27,9 @@ def fetch_page(url):
     }
     try:
         print(f"Fetching URL: {url}")
-        response = requests.get(url, headers=headers, timeout=20) # Increased timeout
+        with guarded_request(url) as call:
+            response = SESSION.get(url, headers=headers, timeout=20) # Increased timeout
+            call['status'] = response.status_code
         response.raise_for_status() # Raises an HTTPError for bad responses (4XX or 5XX)
         print(f"Successfully fetched {url} (Status: {response.status_code})")
         return response.text
@@ -36,6 +42,9 @@ def fetch_page(url):
     except requests.exceptions.RequestException as e:
         print(f"Generic error fetching {url}: {e}")
         return None
+    except CircuitOpenError as e:
+        print(f"Skipping {url}: {e}")
+        return None
 
 # --- Function to Parse the Main Foreclosure Notices List Page ---
 def parse_notices_list(html_content):
@@ -43,6 +52,7 @@ def parse_notices_list(html_content):
     Parses the HTML of the main notices list page to extract individual notice details.
     Returns a list of dictionaries.
     """
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     notices_data = []
     notices_table = soup.find('table', id='ContentPane_ForeclosureGridView')
@@ -107,6 +117,16 @@ def parse_notices_list(html_content):
     return notices_data
 
 
+# --- Change check used by the scheduler ---
+def notices_fingerprint():
+    """Hash of the detail URLs on the current notices list (they carry its publication date), so a newly
+    posted date or notice changes it; the scheduler only rescrapes when it changes"""
+    main_page_html = fetch_page(CURRENT_NOTICES_URL)
+    if not main_page_html:
+        return None
+    urls = sorted(notice['details_url'] for notice in parse_notices_list(main_page_html) if notice.get('details_url'))
+    return hashlib.sha1('\n'.join(urls).encode('utf-8')).hexdigest()
+
 # --- Helper function to safely extract text from a BeautifulSoup element ---
 def get_safe_text(element, default="Not found"):
     """Returns the stripped text of an element or a default value if element is None."""
@@ -118,6 +138,7 @@ def parse_notice_detail_page(html_content):
     Parses the HTML of an individual notice detail page.
     Returns a dictionary with all the extracted fields.
     """
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     details = {}
 
@@ -200,49 +221,76 @@ def parse_notice_detail_page(html_content):
     return details
 
 # --- Main Script Logic ---
-if __name__ == "__main__":
+def main():
+    """
+    Scrape the notices list and every notice's detail page into foreclosure_notices_tnledger_detailed.csv.
+    Parsed detail pages are checkpointed, so a run that was stopped or crashed resumes where it left off;
+    when stopped (SIGTERM, Ctrl+C), the notices not reached yet are saved with their list data only.
+    Returns True when it was stopped and saved those partial results.
+    """
     print(f"--- Starting Scraper for {NOTICES_LIST_URL} ---")
     main_page_html = fetch_page(NOTICES_LIST_URL)
     all_foreclosure_data = []
+    details = Journal('tnledger_details')
+    interrupted = saved = False
 
     if main_page_html:
         print("\n--- Parsing Main Notices List Page ---")
-        notices_on_list_page = parse_notices_list(main_page_html)
+        with METRICS.stage('tnledger_parse'):
+            notices_on_list_page = parse_notices_list(main_page_html)
+        METRICS.rows('tnledger_parse', rows_out=len(notices_on_list_page))
         print(f"Found {len(notices_on_list_page)} notice(s) with valid detail URLs on the list page.")
 
         if not notices_on_list_page:
              print("\nNo notices with valid detail URLs found on the list page. Exiting.")
         else:
-            for i, notice_summary in enumerate(notices_on_list_page):
-                print(f"\n--- Processing Notice {i+1} of {len(notices_on_list_page)} ---")
-                detail_url = notice_summary.get('details_url')
-
-                if not detail_url: # Should ideally not happen if parse_notices_list filters correctly
-                    print(f"Skipping notice due to missing detail URL: {notice_summary.get('borrower_list', 'N/A')}")
-                    continue
-
-                print(f"Fetching detail page: {detail_url}")
-                detail_page_html = fetch_page(detail_url)
-
-                if detail_page_html:
-                    print("Parsing detail page...")
-                    detailed_info = parse_notice_detail_page(detail_page_html)
-                    combined_data = {**notice_summary, **detailed_info}
-                    all_foreclosure_data.append(combined_data)
-                    print(f"Successfully processed and stored data for: {notice_summary.get('borrower_list', 'N/A')}")
-                else:
-                    print(f"Failed to fetch detail page: {detail_url}. Storing list data only.")
-                    error_data = {**notice_summary, 'detail_page_error': f'Failed to fetch or parse {detail_url}'}
-                    all_foreclosure_data.append(error_data)
-
-                print(f"Waiting for {REQUEST_DELAY} seconds before next request...")
-                time.sleep(REQUEST_DELAY)
+            try:
+                for i, notice_summary in enumerate(notices_on_list_page):
+                    print(f"\n--- Processing Notice {i+1} of {len(notices_on_list_page)} ---")
+                    detail_url = notice_summary.get('details_url')
+
+                    if not detail_url: # Should ideally not happen if parse_notices_list filters correctly
+                        print(f"Skipping notice due to missing detail URL: {notice_summary.get('borrower_list', 'N/A')}")
+                        continue
+
+                    detailed_info = details.get(detail_url)
+                    if detailed_info is not None:
+                        print(f"Using the checkpointed detail page: {detail_url}")
+                        all_foreclosure_data.append({**notice_summary, **detailed_info})
+                        continue
+
+                    print(f"Fetching detail page: {detail_url}")
+                    detail_page_html = fetch_page(detail_url)
+
+                    if detail_page_html:
+                        print("Parsing detail page...")
+                        with METRICS.stage('tnledger_parse_detail'):
+                            detailed_info = parse_notice_detail_page(detail_page_html)
+                        METRICS.rows('tnledger_parse_detail', rows_in=1, rows_out=1)
+                        details.record(detail_url, detailed_info)
+                        combined_data = {**notice_summary, **detailed_info}
+                        all_foreclosure_data.append(combined_data)
+                        print(f"Successfully processed and stored data for: {notice_summary.get('borrower_list', 'N/A')}")
+                    else:
+                        print(f"Failed to fetch detail page: {detail_url}. Storing list data only.")
+                        error_data = {**notice_summary, 'detail_page_error': f'Failed to fetch or parse {detail_url}'}
+                        all_foreclosure_data.append(error_data)
+            except KeyboardInterrupt:
+                interrupted = True
+                processed = {row['details_url'] for row in all_foreclosure_data}
+                remaining = [notice for notice in notices_on_list_page
+                             if notice.get('details_url') and notice['details_url'] not in processed]
+                print(f"\n⏰ Stopped with {len(remaining)} detail pages left; saving them with list data only, "
+                      f"the next run resumes from the checkpoint")
+                all_foreclosure_data.extend({**notice, 'detail_page_error': 'Not fetched before the scraper was stopped'}
+                                            for notice in remaining)
     else:
         print("\nFailed to fetch the main notices list page. Cannot proceed.")
 
     if all_foreclosure_data:
         print(f"\n--- Scraping Complete ---")
         print(f"Total records processed: {len(all_foreclosure_data)}")
+        import pandas as pd
         df = pd.DataFrame(all_foreclosure_data)
 
         print("\n--- First 5 Rows of Scraped Data (sample) ---")
@@ -263,11 +311,22 @@ if __name__ == "__main__":
 
         try:
             csv_filename = "foreclosure_notices_tnledger_detailed.csv"
-            df.to_csv(csv_filename, index=False, encoding='utf-8')
+            df.to_csv(f"{csv_filename}.tmp", index=False, encoding='utf-8')
+            os.replace(f"{csv_filename}.tmp", csv_filename)
             print(f"\nData saved to {csv_filename}")
+            saved = True
+            if not interrupted:
+                details.clear()
         except Exception as e:
             print(f"Error saving to CSV: {e}")
     else:
         print("\nNo data was scraped. Please check your parsing logic, selectors, or the website structure/availability.")
 
     print("\n--- End of Script ---")
+    return interrupted and saved
+
+if __name__ == "__main__":
+    export_on_exit()
+    interrupt_on_sigterm()
+    if main():
+        exit_with_partial_results()
@@ -1,50 +1,171 @@
 import subprocess
 import sys
 import os
-import pandas as pd
 import re
-from datetime import datetime
 import logging
-import requests
+import threading
 import time
+from datetime import datetime
 from math import radians, cos, sin, asin, sqrt
+from record_linkage import build_link_keys, canonical_keys, link_records
+from incremental_state import changed_records, fingerprint_records, load_state, location_keys, save_state, split_by_state
+from change_feed import append_change_feed, detect_changes, load_snapshot, summarize_changes
+from columnar_output import columnar_available, write_intermediate, write_partitioned_dataset
+from postgres_loader import DATABASE_URL_ENV, database_url, load_unified_records, postgres_available
+from orchestrator import Node, print_dag_report, run_dag
+from checkpoint import PARTIAL_RESULTS_EXIT_CODE, Journal
+from run_budget import DEADLINE_METHOD_SUFFIX, RUN_DEADLINE_SECONDS, RunBudget
+from run_metrics import METRICS, METRICS_EXPORT_ENV
+from host_guard import CircuitOpenError, guarded_request
+from profiling import PROFILE_ROOT, profile_pipeline
+from lazy_imports import lazy_import
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+# Heavy libraries load on first use, so scrapers start before pandas has finished importing
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+requests = lazy_import('requests')
 
-print("🏠 UNIFIED FORECLOSURE DATA PIPELINE - PRODUCTION VERSION")
-print("=" * 60)
+# Also write Parquet copies (partitioned unified dataset + per-source intermediates) when pyarrow is available
+COLUMNAR_OUTPUT = True
+# Also load into the vnext properties/distress_events tables when DATABASE_URL is set (needs psycopg2)
+DATABASE_LOAD = True
+
+# Seconds to wait for Ctrl+C before an interactive run starts; runs without a terminal don't wait
+CANCEL_DELAY_SECONDS = 3
+
+logger = logging.getLogger(__name__)
 
 # Step 1: Run all scraper scripts
-def run_scrapers():
-    """Run all your existing scraper scripts"""
-    scripts = [
-        'clearrecon.py',
-        'phillipjoneslaw.py', 
-        'tnledger.py',
-        'wabipowerbi.py',
-        'wilson.py'
-    ]
+SCRAPER_TIMEOUT_SECONDS = 300    # A scraper still running after this is asked to stop (SIGTERM)...
+SCRAPER_GRACE_SECONDS = 20       # ...and killed if it hasn't saved its partial results and exited by then
+
+def run_scrapers(completed=None, budget=None):
+    """Run all your existing scraper scripts (concurrently, Selenium ones one at a time).
     
+    With a `completed` journal, sources that finished before an interrupted run died are not scraped again.
+    With a `budget`, scrapers still running at the end of its 'scrape' stage are stopped, and ones that
+    haven't started by then are skipped; those sources keep their last run's CSV.
+    """
     print("🤖 Running all scraper scripts...")
     
-    for script in scripts:
-        if os.path.exists(script):
+    deadline = budget.deadline('scrape') if budget else None
+    nodes = [Node(f"scrape_{source_name}",
+                  lambda source_name=source_name: scrape_source(source_name, completed=completed, deadline=deadline),
+                  executor=scraper_executor(source_name))
+             for source_name in SOURCE_SPECS]
+    # Scrapers stop themselves at the deadline; the DAG's own bound only catches one that hangs past its grace
+    run_stage_dag(nodes, budget.remaining('scrape') + 2 * SCRAPER_GRACE_SECONDS if budget else None)
+
+def run_stage_dag(nodes, deadline=None):
+    """Run a stage DAG within `deadline` seconds (default RUN_DEADLINE_SECONDS) and record each node as a
+    stage in the run metrics"""
+    stats = run_dag(nodes, deadline=RUN_DEADLINE_SECONDS if deadline is None else deadline,
+                    on_deadline=stop_running_scrapers)
+    print_dag_report(stats)
+    for name, node_stats in stats.items():
+        METRICS.add_stage_time(f"dag_{name}", node_stats.seconds)
+        METRICS.rows(f"dag_{name}", node_stats.items_in, node_stats.items_out)
+    return stats
+
+def scraper_executor(source_name):
+    """Selenium scrapers share the single 'browser' slot; the HTTP ones run side by side"""
+    return 'browser' if SOURCE_SPECS[source_name].get('browser') else 'thread'
+
+def scrape_source(source_name, chunk_rows=None, completed=None, deadline=None):
+    """Run a source's scraper; with chunk_rows, then yield (source_name, raw chunk) pairs from its CSV.
+    
+    Sources already in the `completed` journal keep the CSV the interrupted run scraped; the ones
+    scraped cleanly now are added to it. The scraper is stopped at `deadline` (a time.monotonic() value).
+    """
+    spec = SOURCE_SPECS[source_name]
+    timeout = SCRAPER_TIMEOUT_SECONDS if deadline is None else min(SCRAPER_TIMEOUT_SECONDS, deadline - time.monotonic())
+    if completed is not None and source_name in completed:
+        print(f"   ⏭️ {spec['script']} already completed before the last run was interrupted")
+    elif timeout < 1:
+        print(f"   ⏰ No time left in the scrape budget for {spec['script']}, keeping its last CSV")
+    elif run_scraper(spec['script'], timeout) and completed is not None:
+        completed.record(source_name, time.time())
+    if chunk_rows is None:
+        return
+    
+    filename = spec['file']
+    if not os.path.exists(filename):
+        print(f"   📁 {filename} not found, skipping...")
+        return
+    for chunk in pd.read_csv(filename, chunksize=chunk_rows):
+        yield source_name, chunk
+
+_running_scrapers = set()   # Scraper subprocesses started by run_scraper and not finished yet
+_running_scrapers_lock = threading.Lock()
+
+def stop_running_scrapers(grace=SCRAPER_GRACE_SECONDS):
+    """SIGTERM every scraper subprocess still running, e.g. once a stage DAG's deadline has abandoned the threads
+    waiting on them, and kill the ones that haven't exited after `grace` seconds"""
+    with _running_scrapers_lock:
+        processes = list(_running_scrapers)
+    if not processes:
+        return
+    print(f"   🛑 Stopping {len(processes)} scraper subprocesses still running")
+    for process in processes:
+        process.terminate()
+    end = time.monotonic() + grace
+    for process in processes:
+        try:
+            process.wait(timeout=max(end - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def run_scraper(script, timeout=SCRAPER_TIMEOUT_SECONDS):
+    """Run one scraper script, stopping it after `timeout` seconds; returns True if it exited cleanly"""
+    if not os.path.exists(script):
+        print(f"   📁 {script} not found, skipping...")
+        return False
+    # The scraper writes its own request/parse metrics here on exit; they are merged into this run's
+    name = os.path.splitext(os.path.basename(script))[0]
+    metrics_path = os.path.abspath(f".metrics-{name}-{os.getpid()}.json")
+    env = dict(os.environ, **{METRICS_EXPORT_ENV: metrics_path})
+    try:
+        print(f"   Running {script}...")
+        with METRICS.stage(f"scrape_{name}"):
+            process = subprocess.Popen([sys.executable, script], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                       text=True, env=env)
+            with _running_scrapers_lock:
+                _running_scrapers.add(process)
             try:
-                print(f"   Running {script}...")
-                result = subprocess.run([sys.executable, script], 
-                                      capture_output=True, text=True, timeout=300)
-                if result.returncode == 0:
-                    print(f"   ✅ {script} completed successfully")
-                else:
-                    print(f"   ⚠️ {script} completed with warnings")
+                process.communicate(timeout=timeout)
             except subprocess.TimeoutExpired:
-                print(f"   ⏰ {script} timed out after 5 minutes")
-            except Exception as e:
-                print(f"   ❌ Error running {script}: {e}")
-        else:
-            print(f"   📁 {script} not found, skipping...")
+                # Scrapers that handle SIGTERM (checkpoint.interrupt_on_sigterm) save what they have and exit with
+                # PARTIAL_RESULTS_EXIT_CODE; the others just stop. Kill only if they hang
+                process.terminate()
+                try:
+                    process.communicate(timeout=SCRAPER_GRACE_SECONDS)
+                    if process.returncode == PARTIAL_RESULTS_EXIT_CODE:
+                        print(f"   ⏰ {script} timed out after {timeout:.0f}s and saved its partial results")
+                    else:
+                        print(f"   ⏰ {script} timed out after {timeout:.0f}s and was stopped; its source keeps the last run's data")
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                    print(f"   ⏰ {script} timed out after {timeout:.0f}s and was killed")
+                return False
+            finally:
+                with _running_scrapers_lock:
+                    _running_scrapers.discard(process)
+        if process.returncode == 0:
+            print(f"   ✅ {script} completed successfully")
+            return True
+        if process.returncode == PARTIAL_RESULTS_EXIT_CODE:
+            print(f"   ⏰ {script} was stopped and saved its partial results")
+            return False
+        if process.returncode < 0:
+            print(f"   🛑 {script} was stopped (signal {-process.returncode}); its source keeps the last run's data")
+            return False
+        print(f"   ⚠️ {script} completed with warnings")
+    except Exception as e:
+        print(f"   ❌ Error running {script}: {e}")
+    finally:
+        METRICS.merge_file(metrics_path)
+    return False
 
 # Step 2: Distance calculation utilities
 class LocationProcessor:
@@ -181,7 +302,9 @@ class LocationProcessor:
             }
             headers = {'User-Agent': 'RealEstateForeclosurePipeline/1.0'}
             
-            response = requests.get(url, params=params, headers=headers, timeout=15)
+            with guarded_request(url) as call:
+                response = requests.get(url, params=params, headers=headers, timeout=15)
+                call['status'] = response.status_code
             data = response.json()
             
             if data and len(data) > 0:
@@ -202,8 +325,10 @@ class LocationProcessor:
                 if 35.0 <= lat <= 36.7 and -90.0 <= lon <= -81.0:
                     return lat, lon
             
+        except CircuitOpenError:
+            pass   # Nominatim is failing; the next strategy takes over without waiting out a timeout
         except Exception as e:
-            logger.debug(f"Nominatim geocoding failed for {address}: {e}")
+            logger.warning(f"Nominatim geocoding failed for {address}: {e}")
         
         return None, None
     
@@ -230,7 +355,9 @@ class LocationProcessor:
             }
             headers = {'User-Agent': 'RealEstateForeclosurePipeline/1.0'}
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            with guarded_request(url) as call:
+                response = requests.get(url, params=params, headers=headers, timeout=10)
+                call['status'] = response.status_code
             data = response.json()
             
             if data and len(data) > 0:
@@ -302,27 +429,55 @@ class LocationProcessor:
             'DISTANCE_MILES': round(min_distance, 1) if min_distance != float('inf') else None,
             'EST_DRIVE_TIME': round(closest_drive_time, 0) if closest_drive_time else None
         }
+    
+    @staticmethod
+    def hub_proximity(lat, lon, max_drive_time_minutes=30):
+        """Vectorized distance and within-drive-time flag to each reference location
+        (DISTANCE_<HUB> / WITHIN_30MIN_<HUB> columns, NaN where there are no coordinates)"""
+        lat = pd.to_numeric(lat, errors='coerce')
+        lon = pd.to_numeric(lon, errors='coerce')
+        result = pd.DataFrame(index=lat.index)
+        
+        for city_name, (ref_lat, ref_lon) in LocationProcessor.REFERENCE_LOCATIONS.items():
+            lat1, lon1, lat2, lon2 = np.radians(lat), np.radians(lon), np.radians(ref_lat), np.radians(ref_lon)
+            a = np.sin((lat2 - lat1)/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1)/2)**2
+            distance = 2 * np.arcsin(np.sqrt(a)) * 3956
+            
+            # Same speed bands as estimate_drive_time_minutes
+            avg_speed = np.select([distance <= 5, distance <= 15, distance <= 30], [25, 35, 45], 55)
+            drive_time = distance / avg_speed * 60
+            
+            hub = city_name.upper()
+            result[f'DISTANCE_{hub}'] = distance.round(2)
+            result[f'WITHIN_30MIN_{hub}'] = (drive_time <= max_drive_time_minutes).astype(object).where(distance.notna())
+        
+        return result
 
 # Step 3: Address and data parsing utilities
 class AddressParser:
+    # City patterns, tried in order; the first match wins
+    CITY_PATTERNS = [
+        r',\s*([A-Za-z\s]+)\s+TN\s*,?\s*\d{5}',
+        r',\s*([A-Za-z\s]+)\s*,\s*TN',
+        r',\s*([A-Za-z\s]+)\s+Tennessee',
+        r'\b([A-Za-z\s]+),\s*Tennessee\s*\d{5}',
+    ]
+    CITY_STATE_SUFFIX = r'\s+(TN|Tennessee)$'
+    COUNTY_PATTERN = r'(\w+)\s+County'
+    COUNTY_TN_PATTERN = r'(\w+)\s+County,?\s+Tennessee'
+    SALE_TIME_PATTERN = r'(\d{1,2}:\d{2}\s*[AP]M)'
+
     @staticmethod
     def extract_city_from_address(address):
         if not address or pd.isna(address):
             return ""
         
         address = str(address)
-        patterns = [
-            r',\s*([A-Za-z\s]+)\s+TN\s*,?\s*\d{5}',
-            r',\s*([A-Za-z\s]+)\s*,\s*TN',
-            r',\s*([A-Za-z\s]+)\s+Tennessee',
-            r'\b([A-Za-z\s]+),\s*Tennessee\s*\d{5}',
-        ]
-        
-        for pattern in patterns:
+        for pattern in AddressParser.CITY_PATTERNS:
             match = re.search(pattern, address, re.IGNORECASE)
             if match:
                 city = match.group(1).strip()
-                city = re.sub(r'\s+(TN|Tennessee)$', '', city, flags=re.IGNORECASE)
+                city = re.sub(AddressParser.CITY_STATE_SUFFIX, '', city, flags=re.IGNORECASE)
                 return city.title()
         return ""
     
@@ -332,174 +487,462 @@ class AddressParser:
             return ""
         county = str(county).strip()
         return county[0].upper() if county else ""
-    
+
+    # Vectorized counterparts of the scalar helpers above, used by the standardize_* functions
     @staticmethod
-    def standardize_date(date_str):
-        if not date_str or pd.isna(date_str):
-            return ""
+    def as_text(values):
+        """Series as strings, with missing values turned into empty strings"""
+        return values.astype(object).where(values.notna(), "").astype(str)
+
+    @staticmethod
+    def extract_city_series(addresses):
+        """Vectorized extract_city_from_address"""
+        text = AddressParser.as_text(addresses)
+        city = pd.Series(np.nan, index=text.index, dtype=object)
         
-        try:
-            dt = pd.to_datetime(date_str, errors='coerce')
-            if pd.notna(dt):
-                return dt.strftime('%m/%d/%Y')
-        except:
-            pass
-        return str(date_str)
+        for pattern in AddressParser.CITY_PATTERNS:
+            unmatched = city.isna()
+            if not unmatched.any():
+                break
+            city[unmatched] = text[unmatched].str.extract(pattern, flags=re.IGNORECASE, expand=False)
+        
+        city = city.str.strip().str.replace(AddressParser.CITY_STATE_SUFFIX, '', case=False, regex=True)
+        return city.str.title().fillna("")
+
+    @staticmethod
+    def county_first_letter_series(counties):
+        """Vectorized get_county_first_letter"""
+        county = AddressParser.as_text(counties).str.strip()
+        return county.str[0].str.upper().fillna("")
     
+# Date and time normalization: each distinct value is parsed once, then broadcast back by its code
+class DateTimeNormalizer:
+    # Known formats per source, tried before the generic cascade
+    SOURCE_DATE_FORMATS = {
+        'clearrecon': ['%m/%d/%Y'],
+        'phillipjones': ['%m/%d/%Y'],
+        'tnledger': ['%m/%d/%Y'],
+        'powerbi': ['%Y-%m-%dT%H:%M:%S', '%m/%d/%Y'],
+        'wilson': ['%m/%d/%Y'],
+    }
+    SOURCE_TIME_FORMATS = {
+        'phillipjones': ['%I:%M %p'],
+        'tnledger': ['%I:%M %p', '%I:%M%p'],
+        'powerbi': ['ms', '%I:%M %p'],  # 'ms' = milliseconds from midnight, as in convert_ms_to_time
+        'wilson': ['%I:%M %p'],
+    }
+    DATE_FORMATS = ['%m/%d/%Y', '%Y-%m-%d', '%m/%d/%y', '%B %d, %Y', '%b %d, %Y', '%Y-%m-%dT%H:%M:%S']
+    TIME_FORMATS = ['%I:%M %p', '%H:%M', '%I:%M:%S %p', '%H:%M:%S', '%I:%M%p']
+    OUTPUT_DATE_FORMAT = '%m/%d/%Y'
+    OUTPUT_TIME_FORMAT = '%I:%M %p'
+
     @staticmethod
-    def standardize_time(time_str):
-        if not time_str or pd.isna(time_str):
-            return ""
+    def _parse_by_code(values, parse_uniques, empty):
+        """Parse the distinct values of a Series once and map the results back via factorize codes"""
+        codes, uniques = pd.factorize(values)
+        if len(uniques) == 0:
+            return pd.Series(empty, index=values.index, dtype=object)
         
-        time_str = str(time_str).strip()
-        time_formats = ['%I:%M %p', '%H:%M', '%I:%M:%S %p', '%H:%M:%S']
+        parsed = parse_uniques(pd.Series(uniques, dtype=object).astype(str).str.strip())
+        # Code -1 (missing) picks the trailing empty slot
+        lookup = pd.concat([parsed, pd.Series([empty], dtype=parsed.dtype)], ignore_index=True)
+        return pd.Series(lookup.to_numpy()[codes], index=values.index)
+
+    @staticmethod
+    def _parse_dates(text, formats):
+        parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
+        for fmt in formats:
+            pending = parsed.isna() & (text != "")
+            if not pending.any():
+                return parsed
+            parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce')
         
-        for fmt in time_formats:
+        # Stragglers go through the generic parser one at a time
+        for idx in text.index[parsed.isna() & (text != "")]:
             try:
-                dt = datetime.strptime(time_str, fmt)
-                return dt.strftime('%I:%M %p')
-            except ValueError:
+                ts = pd.to_datetime(text[idx])
+            except (ValueError, TypeError, OverflowError):
+                logger.debug(f"Unparseable date value: {text[idx]!r}")
                 continue
-        return time_str
+            if pd.notna(ts):
+                parsed[idx] = ts.tz_localize(None) if ts.tzinfo else ts
+        return parsed.dt.normalize()
 
-# Step 4: Data standardization functions
-def standardize_clearrecon(df):
-    if df.empty:
-        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
-    
-    result = pd.DataFrame()
-    result['SOURCE'] = df['SourceWebsite']
-    result['DATE'] = df['SaleDate'].apply(AddressParser.standardize_date)
-    result['TIME'] = ""
-    result['ADDRESS'] = df['PropertyAddress']
-    result['CTY'] = df['PropertyAddress'].apply(AddressParser.extract_city_from_address)
-    result['FIRM'] = "ClearRecon"
-    
-    # Extract county from address for PL
-    county_from_address = df['PropertyAddress'].apply(lambda x: re.search(r'(\w+)\s+County', str(x), re.IGNORECASE))
-    result['PL'] = county_from_address.apply(lambda x: x.group(1)[0].upper() if x else "")
-    
-    return result
+    @staticmethod
+    def _parse_times(text, formats):
+        parsed = pd.Series(pd.NaT, index=text.index, dtype='timedelta64[ns]')
+        for fmt in formats:
+            pending = parsed.isna() & (text != "")
+            if not pending.any():
+                break
+            if fmt == 'ms':
+                ms = pd.to_numeric(text[pending], errors='coerce')
+                ms = ms[(ms >= 0) & (ms < 86400000)]
+                parsed[ms.index] = pd.to_timedelta(ms, unit='ms')
+            else:
+                dt = pd.to_datetime(text[pending], format=fmt, errors='coerce')
+                parsed[pending] = dt - dt.dt.normalize()
+        return parsed.dt.floor('min')
 
-def standardize_phillipjones(df):
-    if df.empty:
-        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
-    
-    result = pd.DataFrame()
-    result['SOURCE'] = df['SourceWebsite']
-    result['DATE'] = df['SaleDate'].apply(AddressParser.standardize_date)
-    result['TIME'] = df['SaleTime'].apply(AddressParser.standardize_time)
-    result['ADDRESS'] = df['PropertyAddress']
-    result['CTY'] = df['PropertyAddress'].apply(AddressParser.extract_city_from_address)
-    result['FIRM'] = "Phillip Jones Law"
-    result['PL'] = df['County'].apply(AddressParser.get_county_first_letter)
-    
-    return result
+    @staticmethod
+    def normalize_dates(values, source=None):
+        """Sale dates as a datetime64 column (NaT where unparseable)"""
+        formats = DateTimeNormalizer.SOURCE_DATE_FORMATS.get(source, []) + DateTimeNormalizer.DATE_FORMATS
+        return DateTimeNormalizer._parse_by_code(
+            values, lambda text: DateTimeNormalizer._parse_dates(text, formats), pd.NaT
+        ).astype('datetime64[ns]')
 
-def standardize_tnledger(df):
-    if df.empty:
-        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
-    
-    result = pd.DataFrame()
-    result['SOURCE'] = df.get('details_url', 'tnledger.com')
+    @staticmethod
+    def normalize_times(values, source=None):
+        """Sale times as a timedelta64 column measured from midnight (NaT where unparseable)"""
+        formats = DateTimeNormalizer.SOURCE_TIME_FORMATS.get(source, []) + DateTimeNormalizer.TIME_FORMATS
+        return DateTimeNormalizer._parse_by_code(
+            values, lambda text: DateTimeNormalizer._parse_times(text, formats), pd.NaT
+        ).astype('timedelta64[ns]')
+
+    @staticmethod
+    def format_dates(dates):
+        return dates.dt.strftime(DateTimeNormalizer.OUTPUT_DATE_FORMAT).fillna("")
+
+    @staticmethod
+    def format_times(times):
+        clock = pd.Timestamp('1900-01-01') + times
+        return clock.dt.strftime(DateTimeNormalizer.OUTPUT_TIME_FORMAT).fillna("")
+
+# Step 4: Data standardization
+STANDARD_COLUMNS = ['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY', 'STATUS']
+TNLEDGER_PLACEHOLDERS = ["Not found", "Record details div not found"]
+
+# Declarative mapping from each scraper's CSV to the standard columns.
+# Every output column takes one rule:
+#   'from'      - input column, or a list of columns coalesced left to right (first non-empty wins);
+#                 a list entry may be a (column, regex) pair to extract from that column only
+#   'const'     - constant value instead of 'from'
+#   'regex'     - pattern whose first group is extracted from the coalesced value
+#   'skip'      - placeholder values treated as empty before coalescing
+#   'transform' - one of TRANSFORMS, applied last
+#   'default'   - value for rows that are still empty
+# Each source also names its scraper ('script'), the CSV it writes ('file') and whether it drives Chrome ('browser');
+# the scheduler daemon reruns it every 'cadence_minutes', or, with a 'probe' (a function in the scraper), only when
+# that function's result changes
+SOURCE_SPECS = {
+    'clearrecon': {
+        'script': 'clearrecon.py',
+        'browser': True,
+        'cadence_minutes': 360,
+        'file': 'clearrecon_tn_foreclosures.csv',
+        'columns': {
+            'SOURCE': {'from': 'SourceWebsite'},
+            'DATE': {'from': 'SaleDate', 'transform': 'date'},
+            'TIME': {'const': None, 'transform': 'time'},
+            'ADDRESS': {'from': 'PropertyAddress'},
+            'CTY': {'from': 'PropertyAddress', 'transform': 'city'},
+            'FIRM': {'const': "ClearRecon"},
+            'PL': {'from': 'PropertyAddress', 'regex': AddressParser.COUNTY_PATTERN, 'transform': 'first_letter'},
+            'STATUS': {'const': None},
+        },
+    },
+    'phillipjones': {
+        'script': 'phillipjoneslaw.py',
+        'cadence_minutes': 60,
+        'file': 'phillipjoneslaw_foreclosures.csv',
+        'columns': {
+            'SOURCE': {'from': 'SourceWebsite'},
+            'DATE': {'from': 'SaleDate', 'transform': 'date'},
+            'TIME': {'from': 'SaleTime', 'transform': 'time'},
+            'ADDRESS': {'from': 'PropertyAddress'},
+            'CTY': {'from': 'PropertyAddress', 'transform': 'city'},
+            'FIRM': {'const': "Phillip Jones Law"},
+            'PL': {'from': 'County', 'transform': 'first_letter'},
+            'STATUS': {'from': 'Status'},
+        },
+    },
+    'tnledger': {
+        'script': 'tnledger.py',
+        'cadence_minutes': 30,
+        'probe': 'notices_fingerprint',
+        'file': 'foreclosure_notices_tnledger_detailed.csv',
+        'columns': {
+            'SOURCE': {'from': 'details_url', 'default': 'tnledger.com'},
+            'DATE': {'from': ['advertised_auction_date_detail', 'advertised_auction_date_list'],
+                     'skip': TNLEDGER_PLACEHOLDERS, 'transform': 'date'},
+            'TIME': {'from': 'sale_details_text', 'regex': AddressParser.SALE_TIME_PATTERN, 'transform': 'time'},
+            'ADDRESS': {'from': ['address_detail', 'property_address_list'], 'skip': TNLEDGER_PLACEHOLDERS},
+            'CTY': {'from': ['address_detail', 'property_address_list'], 'skip': TNLEDGER_PLACEHOLDERS,
+                    'transform': 'city'},
+            'FIRM': {'from': ['substitute_trustee', 'attorney'], 'skip': TNLEDGER_PLACEHOLDERS,
+                     'default': "TN Ledger"},
+            'PL': {'from': [('address_detail', AddressParser.COUNTY_PATTERN),
+                            ('sale_details_text', AddressParser.COUNTY_TN_PATTERN)],
+                   'transform': 'first_letter'},
+            'STATUS': {'const': None},
+        },
+    },
+    'powerbi': {
+        'script': 'wabipowerbi.py',
+        'cadence_minutes': 60,
+        'file': 'logs_com_powerbi_data.csv',
+        'columns': {
+            'SOURCE': {'from': 'SourceWebsite'},
+            'DATE': {'from': 'SALE_DATE', 'transform': 'date'},
+            'TIME': {'from': 'SALE_TIME', 'transform': 'time'},
+            'ADDRESS': {'from': 'FULL_ADDRESS'},
+            'CTY': {'from': 'FULL_ADDRESS', 'transform': 'city'},
+            'FIRM': {'const': "Logs.com"},
+            'PL': {'from': 'COUNTY_NAME', 'transform': 'first_letter'},
+            'STATUS': {'const': None},
+        },
+    },
+    'wilson': {
+        'script': 'wilson.py',
+        'browser': True,
+        'cadence_minutes': 360,
+        'file': 'wilson_assoc_foreclosures/SearchState=TN/sales.csv',   # wilson.py's Tennessee partition
+        'columns': {
+            'SOURCE': {'from': 'SourceWebsite'},
+            'DATE': {'from': 'SaleDate', 'transform': 'date'},
+            'TIME': {'from': 'SaleTime', 'transform': 'time'},
+            'ADDRESS': {'from': 'PropertyAddress'},
+            'CTY': {'from': 'City', 'default': ""},
+            'FIRM': {'from': 'Auctioneer', 'default': "Wilson Associates"},
+            'PL': {'from': 'County', 'transform': 'first_letter'},
+            'STATUS': {'const': None},
+        },
+    },
+}
+
+# Vectorized transforms available to specs: (values, source) -> Series
+TRANSFORMS = {
+    'date': lambda values, source: DateTimeNormalizer.normalize_dates(values, source),
+    'time': lambda values, source: DateTimeNormalizer.normalize_times(values, source),
+    'city': lambda values, source: AddressParser.extract_city_series(values),
+    'first_letter': lambda values, source: AddressParser.county_first_letter_series(values),
+}
+RULE_KEYS = {'from', 'const', 'regex', 'skip', 'transform', 'default'}
+
+def is_empty(values):
+    """Missing values and blank strings"""
+    return values.isna() | (values.astype(object) == "")
+
+class TransformPlan:
+    """Compiled form of a source spec: one vectorized step per output column"""
     
-    # Use detailed date if available, otherwise list date
-    date_field = df['advertised_auction_date_detail'].fillna(df['advertised_auction_date_list'])
-    result['DATE'] = date_field.apply(AddressParser.standardize_date)
+    def __init__(self, source, steps):
+        self.source = source
+        self.steps = steps
     
-    # Extract time from sale details text
-    def extract_time(row):
-        sale_text = row.get('sale_details_text', '')
-        if not sale_text or pd.isna(sale_text):
-            return ""
+    def run(self, df):
+        """Standardize df; returns (standardized DataFrame, per-column null/failure rates)"""
+        if df.empty:
+            return pd.DataFrame(columns=STANDARD_COLUMNS), {}
         
-        time_match = re.search(r'(\d{1,2}:\d{2}\s*[AP]M)', str(sale_text), re.IGNORECASE)
-        return AddressParser.standardize_time(time_match.group(1)) if time_match else ""
-    
-    result['TIME'] = df.apply(extract_time, axis=1)
+        result = pd.DataFrame(index=df.index)
+        report = {}
+        for column, step in self.steps:
+            values, had_input = step(df)
+            missing = is_empty(values)
+            result[column] = values
+            report[column] = {
+                'null_rate': float(missing.mean()),
+                'failure_rate': float((missing & had_input).mean()),
+            }
+        return result[STANDARD_COLUMNS], report
+
+def compile_rule(source, column, rule):
+    """Turn one column rule into a step: df -> (values, mask of rows that had input)"""
+    unknown = set(rule) - RULE_KEYS
+    if unknown:
+        raise ValueError(f"{source}.{column}: unknown rule keys {sorted(unknown)}")
+    if ('from' in rule) == ('const' in rule):
+        raise ValueError(f"{source}.{column}: exactly one of 'from' or 'const' is required")
+    transform = rule.get('transform')
+    if transform is not None and transform not in TRANSFORMS:
+        raise ValueError(f"{source}.{column}: unknown transform '{transform}'")
     
-    # Use detailed address if available
-    address_field = df['address_detail'].fillna(df['property_address_list'])
-    result['ADDRESS'] = address_field
-    result['CTY'] = address_field.apply(AddressParser.extract_city_from_address)
+    candidates = rule.get('from', [])
+    if not isinstance(candidates, list):
+        candidates = [candidates]
+    candidates = [c if isinstance(c, tuple) else (c, rule.get('regex')) for c in candidates]
+    skip = list(rule.get('skip', []))
+    transform_fn = TRANSFORMS.get(transform)
     
-    # Extract firm from attorney or substitute_trustee
-    def extract_firm(row):
-        attorney = row.get('attorney', '')
-        substitute_trustee = row.get('substitute_trustee', '')
-        
-        if substitute_trustee and substitute_trustee not in ["Not found", "", None]:
-            return str(substitute_trustee)
-        elif attorney and attorney not in ["Not found", "", None]:
-            return str(attorney)
+    def step(df):
+        if 'const' in rule:
+            values = pd.Series(rule['const'], index=df.index, dtype=object)
+            had_input = pd.Series(False, index=df.index)
         else:
-            return "TN Ledger"
+            values = pd.Series(np.nan, index=df.index, dtype=object)
+            had_input = pd.Series(False, index=df.index)
+            for name, pattern in candidates:
+                if name not in df.columns:
+                    continue
+                candidate = df[name].astype(object)
+                if skip:
+                    candidate = candidate.where(~candidate.isin(skip))
+                present = ~is_empty(candidate)
+                had_input |= present
+                if pattern:
+                    candidate = AddressParser.as_text(candidate).str.extract(pattern, flags=re.IGNORECASE, expand=False)
+                values = values.where(~is_empty(values), candidate)
+        
+        if transform_fn is not None:
+            values = transform_fn(values, source)
+        if 'default' in rule:
+            values = values.where(~is_empty(values), rule['default'])
+        return values, had_input
     
-    result['FIRM'] = df.apply(extract_firm, axis=1)
+    return step
+
+def compile_source_spec(source, spec):
+    """Compile a SOURCE_SPECS entry into a TransformPlan"""
+    missing = set(STANDARD_COLUMNS) - set(spec['columns'])
+    if missing:
+        raise ValueError(f"{source}: spec is missing columns {sorted(missing)}")
+    steps = [(column, compile_rule(source, column, rule)) for column, rule in spec['columns'].items()]
+    return TransformPlan(source, steps)
+
+TRANSFORM_PLANS = {source: compile_source_spec(source, spec) for source, spec in SOURCE_SPECS.items()}
+
+def standardize_source(source, df):
+    """Standardize one source's raw DataFrame using its compiled plan"""
+    return TRANSFORM_PLANS[source].run(df)
+
+# Field-level survivorship: per output field, sources in priority order (earlier wins when non-empty)
+SURVIVORSHIP_PRIORITY = {
+    'SOURCE': ['phillipjones', 'wilson', 'powerbi', 'clearrecon', 'tnledger'],
+    'DATE': ['phillipjones', 'wilson', 'powerbi', 'clearrecon', 'tnledger'],
+    'TIME': ['phillipjones', 'wilson', 'powerbi', 'tnledger', 'clearrecon'],
+    'PL': ['phillipjones', 'wilson', 'powerbi', 'tnledger', 'clearrecon'],
+    'FIRM': ['tnledger', 'wilson', 'clearrecon', 'phillipjones', 'powerbi'],
+    'ADDRESS': ['powerbi', 'phillipjones', 'clearrecon', 'tnledger', 'wilson'],
+    'CTY': ['wilson', 'powerbi', 'phillipjones', 'clearrecon', 'tnledger'],
+    'STATUS': ['phillipjones'],
+}
+# A spec 'default' (e.g. FIRM "TN Ledger") only wins when no source has a real value
+FILLER_PENALTY = 100
+
+def merge_duplicates(df, group_key):
+    """Collapse rows sharing group_key into one, choosing every field from the best available source.
     
-    # Extract county from address or sale details
-    def extract_county_pl(row):
-        address = row.get('address_detail', row.get('property_address_list', ''))
-        sale_text = row.get('sale_details_text', '')
-        
-        # Try address first
-        county_match = re.search(r'(\w+)\s+County', str(address), re.IGNORECASE)
-        if county_match:
-            return county_match.group(1)[0].upper()
-        
-        # Try sale details
-        county_match = re.search(r'(\w+)\s+County,?\s+Tennessee', str(sale_text), re.IGNORECASE)
-        if county_match:
-            return county_match.group(1)[0].upper()
-        
-        return ""
+    Uses one groupby idxmin over a per-field rank table; FIELD_SOURCES records which source supplied each field.
+    """
+    sources = df['SOURCE_NAME']
+    ranks = pd.DataFrame(index=df.index)
+    for field in STANDARD_COLUMNS:
+        priority = SURVIVORSHIP_PRIORITY.get(field, list(SOURCE_SPECS))
+        rank = sources.map({source: i for i, source in enumerate(priority)}).fillna(len(priority)).astype(float)
+        defaults = sources.map({
+            source: spec['columns'][field]['default']
+            for source, spec in SOURCE_SPECS.items() if 'default' in spec['columns'][field]
+        })
+        rank = rank.where(df[field].astype(object) != defaults, rank + FILLER_PENALTY)
+        ranks[field] = rank.where(~is_empty(df[field]), np.inf)
     
-    result['PL'] = df.apply(extract_county_pl, axis=1)
+    best = ranks.groupby(group_key.to_numpy(), sort=False, dropna=False).idxmin()
     
-    return result
+    merged = pd.DataFrame({field: df[field].loc[best[field]].to_numpy() for field in STANDARD_COLUMNS})
+    for column in df.columns.difference(STANDARD_COLUMNS + ['SOURCE_NAME']):
+        merged[column] = df[column].loc[best['ADDRESS']].to_numpy()
+    merged['SOURCE_NAME'] = sources.loc[best['SOURCE']].to_numpy()
+    field_sources = [field + '=' + sources.loc[best[field]].astype(str).to_numpy() for field in STANDARD_COLUMNS]
+    merged['FIELD_SOURCES'] = field_sources[0]
+    for part in field_sources[1:]:
+        merged['FIELD_SOURCES'] = merged['FIELD_SOURCES'] + ';' + part
+    return merged
+
+# Step 5: Location processing function
+# Geocoding order: soonest and nearest sales first, so a run cut short by its deadline has located those
+PRIORITY_MILES_PER_DAY = 10      # Being 10 miles farther from the nearest hub weighs the same as a sale one day later
+PRIORITY_UNKNOWN_MILES = 40      # Assumed distance when neither the ZIP code nor the city has a known centroid
+PRIORITY_UNDATED_DAYS = 60       # Assumed days until a sale without a parseable date
+PRIORITY_PAST_DAYS = 365         # Sales already held go after every upcoming one
+
+def estimated_distance_miles(df):
+    """Cheap pre-geocoding distance to the nearest reference location, from ZIP code or city centroids
+    (NaN where neither is known)"""
+    zip_codes = df['ADDRESS'].astype(str).str.extract(r'\b(\d{5})\b', expand=False)
+    centroids = zip_codes.map(LocationProcessor.ZIP_COORDINATES)
+    cities = df.get('CTY', pd.Series('', index=df.index)).fillna('').astype(str).str.lower().str.strip()
+    centroids = centroids.where(centroids.notna(), cities.map(LocationProcessor.TN_CITY_COORDINATES))
+    lat = centroids.map(lambda centroid: centroid[0] if isinstance(centroid, tuple) else np.nan)
+    lon = centroids.map(lambda centroid: centroid[1] if isinstance(centroid, tuple) else np.nan)
+    return LocationProcessor.hub_proximity(lat, lon).filter(like='DISTANCE_').min(axis=1)
 
-def standardize_powerbi(df):
+def enrichment_priority(df, today=None):
+    """Urgency score per record, lower first: days until the sale plus the estimated distance in
+    PRIORITY_MILES_PER_DAY units"""
+    today = pd.Timestamp(today or datetime.now()).normalize()
+    dates = pd.to_datetime(df['DATE'], errors='coerce') if 'DATE' in df.columns else pd.Series(pd.NaT, index=df.index)
+    days = (dates - today).dt.days
+    days = days.mask(days < 0, PRIORITY_PAST_DAYS).fillna(PRIORITY_UNDATED_DAYS)
+    miles = estimated_distance_miles(df).fillna(PRIORITY_UNKNOWN_MILES)
+    return days + miles / PRIORITY_MILES_PER_DAY
+
+def by_priority(df):
+    """df's rows in enrichment_priority order (index kept, ties in their original order)"""
     if df.empty:
-        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+        return df
+    return df.loc[enrichment_priority(df).sort_values(kind='stable').index]
+
+def geocode_address(address, city):
+    """Run the 5 geocoding strategies in order; returns (lat, lon, method), method 'failed' if none worked"""
+    original_address = str(address)
     
-    result = pd.DataFrame()
-    result['SOURCE'] = df['SourceWebsite']
-    result['DATE'] = df['SALE_DATE'].apply(AddressParser.standardize_date)
-    result['TIME'] = df['SALE_TIME'].apply(AddressParser.standardize_time)
-    result['ADDRESS'] = df['FULL_ADDRESS']
-    result['CTY'] = df['FULL_ADDRESS'].apply(AddressParser.extract_city_from_address)
-    result['FIRM'] = "Logs.com"
-    result['PL'] = df['COUNTY_NAME'].apply(AddressParser.get_county_first_letter)
+    # Strategy 1: Full address geocoding
+    lat, lon = LocationProcessor.geocode_with_nominatim(address, city, "TN")
+    if lat is not None and lon is not None:
+        return lat, lon, 'full_address'
     
-    return result
-
-def standardize_wilson(df):
-    if df.empty:
-        return pd.DataFrame(columns=['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY'])
+    # Strategy 2: Street only (remove TN/Tennessee)
+    street_only = re.sub(r',\s*.*?(TN|Tennessee).*$', '', original_address, flags=re.IGNORECASE)
+    if street_only != original_address:
+        lat, lon = LocationProcessor.geocode_with_nominatim(street_only, city, "TN")
+        if lat is not None and lon is not None:
+            return lat, lon, 'street_only'
     
-    result = pd.DataFrame()
-    result['SOURCE'] = df['SourceWebsite']
-    result['DATE'] = df['SaleDate'].apply(AddressParser.standardize_date)
-    result['TIME'] = df['SaleTime'].apply(AddressParser.standardize_time)
-    result['ADDRESS'] = df['PropertyAddress']
-    result['CTY'] = df.get('City', '')
-    result['FIRM'] = df.get('Auctioneer', 'Wilson Associates')
-    result['PL'] = df['County'].apply(AddressParser.get_county_first_letter)
+    # Strategy 3: ZIP code lookup
+    lat, lon = LocationProcessor.estimate_by_zip_code(address)
+    if lat is not None and lon is not None:
+        return lat, lon, 'zip_code'
     
-    return result
+    # Strategy 4: City fallback
+    lat, lon = LocationProcessor.geocode_city_fallback(city, "TN")
+    if lat is not None and lon is not None:
+        return lat, lon, 'city_fallback'
+    
+    # Strategy 5: Extract city from address
+    extracted_city = AddressParser.extract_city_from_address(address)
+    if extracted_city and extracted_city != city:
+        lat, lon = LocationProcessor.geocode_city_fallback(extracted_city, "TN")
+        if lat is not None and lon is not None:
+            return lat, lon, 'extracted_city'
+    
+    return None, None, 'failed'
 
-# Step 5: Location processing function
-def add_location_flags(df, max_drive_time=30):
-    """Add location-based flags with robust geocoding"""
-    print(f"\n📍 Adding location flags (within {max_drive_time} min of Nashville/Mt. Juliet)...")
-    print("   Using 5 geocoding strategies for maximum accuracy...")
+def geocode_offline(address, city):
+    """Centroid-only location (ZIP code, then known city) for when geocoding has run out of time.
+    Methods carry DEADLINE_METHOD_SUFFIX, so these records are geocoded properly by the next run."""
+    lat, lon = LocationProcessor.estimate_by_zip_code(address)
+    if lat is not None and lon is not None:
+        return lat, lon, 'zip_code' + DEADLINE_METHOD_SUFFIX
+    for candidate in (city, AddressParser.extract_city_from_address(address)):
+        coordinates = LocationProcessor.TN_CITY_COORDINATES.get(str(candidate or '').lower().strip())
+        if coordinates:
+            return coordinates[0], coordinates[1], 'city' + DEADLINE_METHOD_SUFFIX
+    return None, None, 'failed'
+
+def geocode_records(df, show_progress=True, journal=None, deadline=None):
+    """Fill LAT/LON/GEOCODE_METHOD row by row, soonest and nearest sales first (by_priority); returns how
+    many rows each strategy resolved.
     
-    # Initialize new columns
-    df['WITHIN_30MIN'] = 'Unknown'
-    df['CLOSEST_CITY'] = 'Unknown'
-    df['DISTANCE_MILES'] = None
-    df['EST_DRIVE_TIME'] = None
-    df['GEOCODE_METHOD'] = 'Failed'
+    With a `journal`, each result is checkpointed under the record's LOCATION_KEY as soon as it is known,
+    and addresses checkpointed by an interrupted run are not geocoded again. Rows reached after `deadline`
+    (a time.monotonic() value) get geocode_offline centroids instead of Nominatim lookups.
+    """
+    checkpointed = journal is not None and 'LOCATION_KEY' in df.columns
+    for column, initial in (('GEOCODE_METHOD', 'Failed'), ('LAT', np.nan), ('LON', np.nan)):
+        if column not in df.columns:
+            df[column] = initial
     
     total_records = len(df)
     processed = 0
@@ -509,79 +952,87 @@ def add_location_flags(df, max_drive_time=30):
         'city_fallback': 0, 'extracted_city': 0, 'failed': 0
     }
     
-    for idx, row in df.iterrows():
+    offline = False
+    for idx, row in by_priority(df).iterrows():
+        address = row['ADDRESS']
+        if not offline and deadline is not None and time.monotonic() >= deadline:
+            offline = True
+            print(f"   ⏰ Geocoding budget used up, {total_records - processed} remaining records get ZIP/city centroids")
         try:
-            address = row['ADDRESS']
-            city = row['CTY']
-            
             if pd.isna(address) or address == "":
                 processed += 1
                 geocode_methods['failed'] += 1
                 continue
             
-            original_address = str(address)
-            method_used = 'failed'
-            lat = None
-            lon = None
-            
-            # Strategy 1: Full address geocoding
-            lat, lon = LocationProcessor.geocode_with_nominatim(address, city, "TN")
-            if lat is not None and lon is not None:
-                method_used = 'full_address'
+            checkpoint = journal.get(row['LOCATION_KEY']) if checkpointed else None
+            if checkpoint is not None:
+                lat, lon, method_used = checkpoint
+            elif offline:
+                lat, lon, method_used = geocode_offline(address, row['CTY'])
             else:
-                # Strategy 2: Street only (remove TN/Tennessee)
-                street_only = re.sub(r',\s*.*?(TN|Tennessee).*$', '', original_address, flags=re.IGNORECASE)
-                if street_only != original_address:
-                    lat, lon = LocationProcessor.geocode_with_nominatim(street_only, city, "TN")
-                    if lat is not None and lon is not None:
-                        method_used = 'street_only'
-                
-                if lat is None or lon is None:
-                    # Strategy 3: ZIP code lookup
-                    lat, lon = LocationProcessor.estimate_by_zip_code(address)
-                    if lat is not None and lon is not None:
-                        method_used = 'zip_code'
-                
-                if lat is None or lon is None:
-                    # Strategy 4: City fallback
-                    lat, lon = LocationProcessor.geocode_city_fallback(city, "TN")
-                    if lat is not None and lon is not None:
-                        method_used = 'city_fallback'
-                
-                if lat is None or lon is None:
-                    # Strategy 5: Extract city from address
-                    extracted_city = AddressParser.extract_city_from_address(address)
-                    if extracted_city and extracted_city != city:
-                        lat, lon = LocationProcessor.geocode_city_fallback(extracted_city, "TN")
-                        if lat is not None and lon is not None:
-                            method_used = 'extracted_city'
-            
-            geocode_methods[method_used] += 1
+                lat, lon, method_used = geocode_address(address, row['CTY'])
+                if checkpointed:
+                    journal.record(row['LOCATION_KEY'], [lat, lon, method_used])
+            geocode_methods[method_used] = geocode_methods.get(method_used, 0) + 1
             
             if lat is not None and lon is not None:
-                proximity_data = LocationProcessor.check_proximity_to_targets(lat, lon, max_drive_time)
-                
-                df.loc[idx, 'WITHIN_30MIN'] = proximity_data['WITHIN_30MIN']
-                df.loc[idx, 'CLOSEST_CITY'] = proximity_data['CLOSEST_CITY']
-                df.loc[idx, 'DISTANCE_MILES'] = proximity_data['DISTANCE_MILES']
-                df.loc[idx, 'EST_DRIVE_TIME'] = proximity_data['EST_DRIVE_TIME']
                 df.loc[idx, 'GEOCODE_METHOD'] = method_used
-                
+                df.loc[idx, 'LAT'] = lat
+                df.loc[idx, 'LON'] = lon
                 successful_geocodes += 1
             
             processed += 1
             
-            if processed % 5 == 0:
+            if show_progress and processed % 5 == 0:
                 success_rate = (successful_geocodes / processed) * 100
                 print(f"   Processed {processed}/{total_records} addresses... Success rate: {success_rate:.1f}%")
             
-            time.sleep(0.3)  # Rate limiting
-            
         except Exception as e:
             logger.debug(f"Error processing location for {address}: {e}")
             processed += 1
             geocode_methods['failed'] += 1
     
+    METRICS.geocode_counts(geocode_methods)
+    return geocode_methods
+
+def apply_proximity(df, max_drive_time=30):
+    """Fill WITHIN_30MIN/CLOSEST_CITY/DISTANCE_MILES/EST_DRIVE_TIME from LAT/LON"""
+    for column, initial in (('WITHIN_30MIN', 'Unknown'), ('CLOSEST_CITY', 'Unknown'),
+                            ('DISTANCE_MILES', np.nan), ('EST_DRIVE_TIME', np.nan)):
+        if column not in df.columns:
+            df[column] = initial
+        elif isinstance(initial, str):
+            df[column] = df[column].astype(object).where(df[column].notna(), initial)
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    
+    located = df.index[df['LAT'].notna() & df['LON'].notna()] if 'LAT' in df.columns else []
+    for idx in located:
+        proximity_data = LocationProcessor.check_proximity_to_targets(df.at[idx, 'LAT'], df.at[idx, 'LON'], max_drive_time)
+        for column, value in proximity_data.items():
+            df.at[idx, column] = value
+    return df
+
+def add_location_flags(df, max_drive_time=30, journal=None, deadline=None):
+    """Add location-based flags with robust geocoding (checkpointed to `journal` and bounded by `deadline`,
+    see geocode_records)"""
+    print(f"\n📍 Adding location flags (within {max_drive_time} min of Nashville/Mt. Juliet)...")
+    print("   Using 5 geocoding strategies for maximum accuracy, soonest and nearest sales first...")
+    
+    # Initialize new columns
+    df['WITHIN_30MIN'] = 'Unknown'
+    df['CLOSEST_CITY'] = 'Unknown'
+    df['DISTANCE_MILES'] = np.nan
+    df['EST_DRIVE_TIME'] = np.nan
+    df['GEOCODE_METHOD'] = 'Failed'
+    df['LAT'] = np.nan
+    df['LON'] = np.nan
+    
+    total_records = len(df)
+    geocode_methods = geocode_records(df, journal=journal, deadline=deadline)
+    apply_proximity(df, max_drive_time)
+    successful_geocodes = int(df['LAT'].notna().sum())
+    
     print(f"   ✅ Location processing complete!")
     print(f"   📊 Successfully geocoded: {successful_geocodes}/{total_records} addresses ({(successful_geocodes/total_records)*100:.1f}%)")
     
@@ -605,56 +1056,174 @@ def add_location_flags(df, max_drive_time=30):
             print(f"      {city}: {count} properties (avg: {avg_distance:.1f} mi, {avg_time:.0f} min)")
     
     # Show successful geocoding examples
-    successful_samples = df[df['GEOCODE_METHOD'] != 'failed'].head(3)
+    successful_samples = df[df['LAT'].notna()].head(3)
     if not successful_samples.empty:
         print(f"\n   📋 Sample successful geocodes:")
         for _, row in successful_samples.iterrows():
-            print(f"      {row['ADDRESS'][:50]}... -> {row['CLOSEST_CITY']} ({row['DISTANCE_MILES']} mi, {row['GEOCODE_METHOD']})")
+            print(f"      {str(row['ADDRESS'])[:50]}... -> {row['CLOSEST_CITY']} ({row['DISTANCE_MILES']} mi, {row['GEOCODE_METHOD']})")
     
     return df
 
 # Step 6: Main pipeline execution
-def run_unified_pipeline():
-    """Run the complete unified pipeline"""
+OUTPUT_FILENAME = "Auction_Info_Unified.csv"
+OUTPUT_COLUMNS = ['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY', 
+                  'WITHIN_30MIN', 'CLOSEST_CITY', 'DISTANCE_MILES', 'EST_DRIVE_TIME', 'GEOCODE_METHOD',
+                  'STATUS', 'PROPERTY_ID', 'FIELD_SOURCES', 'LAT', 'LON', 'FRESHNESS']
+
+def load_source(source_name, df, write_columnar=False):
+    """Standardize one source's raw records, tagged with SOURCE_NAME"""
+    std_df, report = standardize_source(source_name, df)
+    std_df['SOURCE_NAME'] = source_name
+    if write_columnar and not std_df.empty:
+        write_intermediate(std_df, source_name)
+    
+    if not std_df.empty:
+        print(f"   ✅ Standardized {source_name}: {len(std_df)} records")
+        for column, rates in report.items():
+            if rates['failure_rate'] > 0:
+                print(f"      ⚠️ {column}: {rates['failure_rate']:.1%} failed to parse, "
+                      f"{rates['null_rate']:.1%} empty")
+    return std_df
+
+def link_and_merge(combined_df):
+    """Link the same property across sources despite formatting differences or postponed dates,
+    then merge each property's records field by field; unlinked rows fall back to exact address + date"""
+    # Same row order however the records arrived, so ties between empty fields resolve the same way
+    source_order = {source: i for i, source in enumerate(SOURCE_SPECS)}
+    combined_df = combined_df.sort_values('SOURCE_NAME', key=lambda names: names.map(source_order),
+                                          kind='stable').reset_index(drop=True)
+    combined_df = link_records(combined_df)
+    exact_key = combined_df['ADDRESS'].astype(str) + '|' + combined_df['DATE'].astype(str)
+    return merge_duplicates(combined_df, combined_df['PROPERTY_ID'].fillna(exact_key))
+
+def format_for_csv(final_df):
+    """DATE/TIME keep their MM/DD/YYYY and HH:MM AM/PM text layout in the CSV"""
+    csv_df = final_df.copy()
+    csv_df['DATE'] = DateTimeNormalizer.format_dates(csv_df['DATE'])
+    csv_df['TIME'] = DateTimeNormalizer.format_times(csv_df['TIME'])
+    return csv_df
+
+def write_csv_atomically(csv_df, path=OUTPUT_FILENAME):
+    """Readers of the unified CSV never see a half-written file"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    csv_df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def publish_unified_output(combined_df, previous_snapshot, write_columnar=False):
+    """Write the unified CSV (plus Parquet copy), append the change feed and load the database"""
+    final_df = combined_df[OUTPUT_COLUMNS].copy()
+    csv_df = format_for_csv(final_df)
+    write_csv_atomically(csv_df)
+    if write_columnar:
+        dataset_path = write_partitioned_dataset(final_df)
     
-    # Run all scrapers first
-    run_scrapers()
+    print(f"\n🎉 SUCCESS!")
+    print(f"📊 Total unified records: {len(final_df)}")
+    print(f"📁 Saved to: {OUTPUT_FILENAME}")
+    if write_columnar:
+        print(f"📁 Columnar copy: {dataset_path}/ (Parquet, partitioned by sale month)")
     
+    # Change feed against the previous run's output
+    loaded_sources = set(combined_df['SOURCE_NAME'].dropna())
+    changes = detect_changes(previous_snapshot, csv_df, loaded_sources)
+    append_change_feed(changes)
+    if previous_snapshot is not None:
+        counts = summarize_changes(changes)
+        print(f"🔔 Changes since last run: {counts['new']} new, {counts['postponed']} postponed, "
+              f"{counts['disappeared']} disappeared, {counts['field_changed']} changed")
+    
+    # Load into the vnext tables
+    if DATABASE_LOAD and database_url():
+        if not postgres_available():
+            print(f"   ⚠️ psycopg2 is not installed, skipping the database load")
+        else:
+            try:
+                db_df = csv_df.join(LocationProcessor.hub_proximity(csv_df['LAT'], csv_df['LON']))
+                counts = load_unified_records(db_df)
+                print(f"🗄️ Database load: {counts['properties_inserted']} new properties, "
+                      f"{counts['properties_updated']} updated; {counts['events_inserted']} new events, "
+                      f"{counts['events_updated']} updated")
+            except Exception as e:
+                print(f"   ❌ Database load failed ({DATABASE_URL_ENV}): {e}")
+    
+    return final_df, csv_df
+
+def print_summary(final_df, csv_df):
+    print(f"\n📋 COMPREHENSIVE SUMMARY:")
+    print(f"   Counties (PL): {final_df['PL'].value_counts().to_dict()}")
+    print(f"   Sources: {final_df['SOURCE'].value_counts().to_dict()}")
+    print(f"   Records with TIME: {final_df['TIME'].notna().sum()}")
+    print(f"   Properties within 30 min: {(final_df['WITHIN_30MIN'] == 'Yes').sum()}")
+    print(f"   Average distance to Nashville/Mt. Juliet: {final_df['DISTANCE_MILES'].mean():.1f} miles")
+    
+    # Show high-priority properties (within 30 minutes)
+    priority_properties = final_df[final_df['WITHIN_30MIN'] == 'Yes']
+    if not priority_properties.empty:
+        print(f"\n🎯 HIGH-PRIORITY PROPERTIES (Within 30 minutes):")
+        print(f"   Total: {len(priority_properties)} properties")
+        for _, prop in priority_properties.head(5).iterrows():
+            sale_date = prop['DATE'].strftime('%m/%d/%Y') if pd.notna(prop['DATE']) else 'no date'
+            print(f"   • {prop['ADDRESS'][:40]}... - {prop['DISTANCE_MILES']} mi, {prop['EST_DRIVE_TIME']} min ({sale_date})")
+    
+    # Show sample data
+    print(f"\n📋 SAMPLE DATA (first 3 records):")
+    sample_cols = ['SOURCE', 'DATE', 'TIME', 'PL', 'ADDRESS', 'CTY', 'WITHIN_30MIN']
+    print(csv_df[sample_cols].head(3).to_string(index=False))
+    
+    print(f"\n📄 Output file '{OUTPUT_FILENAME}' contains these columns:")
+    print(f"   {', '.join(OUTPUT_COLUMNS)}")
+
+def export_run_metrics(mode):
+    report_path = METRICS.write_json_report(mode=mode)
+    textfile_path = METRICS.write_prometheus_textfile()
+    print(f"📈 Run metrics: {report_path}, {textfile_path}")
+
+def run_unified_pipeline(budget=None):
+    """Run the complete unified pipeline, within `budget` (a RunBudget; default RUN_DEADLINE_SECONDS)"""
+    METRICS.reset()
+    budget = budget or RunBudget()
+    print(f"⏱️ {budget.describe()}")
+    
+    # Run all scrapers first; a rerun after a crash skips the sources the crashed run had finished
+    completed = Journal('completed_sources')
+    with METRICS.stage('scrape'):
+        run_scrapers(completed, budget)
+    cached_sources = {source_name for source_name in SOURCE_SPECS if source_name not in completed}
+    result = unify_sources('batch', budget, cached_sources)
+    completed.clear()
+    return result
+
+def unify_sources(mode, budget=None, cached_sources=()):
+    """Standardize, link, geocode and publish whatever each source's CSV holds right now.
+    
+    Records of `cached_sources` (not scraped cleanly this run) are marked FRESHNESS 'cached', the rest 'fresh';
+    geocoding stops calling Nominatim at the end of the budget's 'geocode' stage.
+    """
     print("\n📊 Loading and processing data...")
     
-    # File mapping
-    source_files = {
-        'clearrecon': 'clearrecon_tn_foreclosures.csv',
-        'phillipjones': 'phillipjoneslaw_foreclosures.csv',
-        'tnledger': 'foreclosure_notices_tnledger_detailed.csv',
-        'powerbi': 'logs_com_powerbi_data.csv',
-        'wilson': 'wilson_assoc_foreclosures.csv'
-    }
+    write_columnar = COLUMNAR_OUTPUT and columnar_available()
+    if COLUMNAR_OUTPUT and not write_columnar:
+        print("   ⚠️ pyarrow is not installed, writing CSV output only")
     
     # Load and standardize each source
     all_standardized = []
     
-    for source_name, filename in source_files.items():
+    for source_name, spec in SOURCE_SPECS.items():
+        filename = spec['file']
         if os.path.exists(filename):
             try:
                 df = pd.read_csv(filename)
                 print(f"   📁 Loaded {filename}: {len(df)} records")
                 
-                # Standardize based on source
-                if source_name == 'clearrecon':
-                    std_df = standardize_clearrecon(df)
-                elif source_name == 'phillipjones':
-                    std_df = standardize_phillipjones(df)
-                elif source_name == 'tnledger':
-                    std_df = standardize_tnledger(df)
-                elif source_name == 'powerbi':
-                    std_df = standardize_powerbi(df)
-                elif source_name == 'wilson':
-                    std_df = standardize_wilson(df)
-                
+                with METRICS.stage('standardize'):
+                    std_df = load_source(source_name, df, write_columnar)
+                METRICS.rows('standardize', len(df), len(std_df))
+                std_df['FRESHNESS'] = 'cached' if source_name in cached_sources else 'fresh'
+                if source_name in cached_sources:
+                    scraped_at = datetime.fromtimestamp(os.path.getmtime(filename))
+                    print(f"   🕰️ {source_name} wasn't scraped this run, using its data from {scraped_at:%Y-%m-%d %H:%M}")
                 if not std_df.empty:
                     all_standardized.append(std_df)
-                    print(f"   ✅ Standardized {source_name}: {len(std_df)} records")
                 
             except Exception as e:
                 print(f"   ❌ Error processing {filename}: {e}")
@@ -668,83 +1237,206 @@ def run_unified_pipeline():
         
         # Clean and deduplicate
         print("🧹 Cleaning and deduplicating...")
-        combined_df = combined_df.dropna(how='all')
-        
-        # Remove duplicates based on address and date
+        combined_df = combined_df.dropna(how='all', subset=STANDARD_COLUMNS).reset_index(drop=True)
         initial_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates(subset=['ADDRESS', 'DATE'], keep='first')
-        final_count = len(combined_df)
-        
-        if initial_count != final_count:
-            print(f"   Removed {initial_count - final_count} duplicates")
-        
-        # Add location flags with robust geocoding
-        combined_df = add_location_flags(combined_df, max_drive_time=30)
-        
-        # Ensure correct column order
-        column_order = ['SOURCE', 'DATE', 'TIME', 'PL', 'FIRM', 'ADDRESS', 'CTY', 
-                       'WITHIN_30MIN', 'CLOSEST_CITY', 'DISTANCE_MILES', 'EST_DRIVE_TIME', 'GEOCODE_METHOD']
-        
-        final_df = combined_df[column_order].copy()
+        with METRICS.stage('link_merge'):
+            combined_df = link_and_merge(combined_df)
+        METRICS.rows('link_merge', initial_count, len(combined_df))
         
-        # Save results
-        output_filename = "Auction_Info_Unified.csv"
-        final_df.to_csv(output_filename, index=False)
+        if len(combined_df) != initial_count:
+            print(f"   Merged {initial_count - len(combined_df)} duplicate records")
         
-        print(f"\n🎉 SUCCESS!")
-        print(f"📊 Total unified records: {len(final_df)}")
-        print(f"📁 Saved to: {output_filename}")
+        # Reuse location fields for addresses already geocoded in an earlier run (of either mode)
+        combined_df['FINGERPRINT'] = fingerprint_records(combined_df)
+        combined_df['LOCATION_KEY'] = location_keys(combined_df)
+        state = load_state()
+        reused_df, fresh_df = split_by_state(combined_df, state)
+        print(f"   ♻️ Reusing location data for {len(reused_df)} known addresses "
+              f"({int(changed_records(reused_df, state).sum())} with changed sale details), {len(fresh_df)} new")
+        METRICS.cache('location_state', hits=len(reused_df), misses=len(fresh_df))
         
-        # Show comprehensive summary
-        print(f"\n📋 COMPREHENSIVE SUMMARY:")
-        print(f"   Counties (PL): {final_df['PL'].value_counts().to_dict()}")
-        print(f"   Sources: {final_df['SOURCE'].value_counts().to_dict()}")
-        print(f"   Records with TIME: {(final_df['TIME'] != '').sum()}")
-        print(f"   Properties within 30 min: {(final_df['WITHIN_30MIN'] == 'Yes').sum()}")
-        print(f"   Average distance to Nashville/Mt. Juliet: {final_df['DISTANCE_MILES'].mean():.1f} miles")
-        
-        # Show high-priority properties (within 30 minutes)
-        priority_properties = final_df[final_df['WITHIN_30MIN'] == 'Yes']
-        if not priority_properties.empty:
-            print(f"\n🎯 HIGH-PRIORITY PROPERTIES (Within 30 minutes):")
-            print(f"   Total: {len(priority_properties)} properties")
-            for _, prop in priority_properties.head(5).iterrows():
-                print(f"   • {prop['ADDRESS'][:40]}... - {prop['DISTANCE_MILES']} mi, {prop['EST_DRIVE_TIME']} min ({prop['DATE']})")
-        
-        # Show sample data
-        print(f"\n📋 SAMPLE DATA (first 3 records):")
-        sample_cols = ['SOURCE', 'DATE', 'TIME', 'PL', 'ADDRESS', 'CTY', 'WITHIN_30MIN']
-        print(final_df[sample_cols].head(3).to_string(index=False))
-        
-        print(f"\n📄 Output file '{output_filename}' contains these columns:")
-        print(f"   {', '.join(column_order)}")
+        # Add location flags with robust geocoding (new or changed records only)
+        geocodes = Journal('geocodes')
+        if not fresh_df.empty:
+            with METRICS.stage('geocode'):
+                fresh_df = add_location_flags(fresh_df, max_drive_time=30, journal=geocodes,
+                                              deadline=budget.deadline('geocode') if budget else None)
+            METRICS.rows('geocode', len(fresh_df), int(fresh_df['LAT'].notna().sum()))
+        combined_df = pd.concat([reused_df, fresh_df]).sort_index()
+        save_state(combined_df, state)
+        geocodes.clear()   # The location state now holds every result
         
+        with METRICS.stage('publish'):
+            previous_snapshot = load_snapshot(OUTPUT_FILENAME)
+            final_df, csv_df = publish_unified_output(combined_df, previous_snapshot, write_columnar)
+        METRICS.rows('publish', len(combined_df), len(final_df))
+        print_summary(final_df, csv_df)
+        export_run_metrics(mode)
         return final_df
     
     else:
         print("❌ No data was processed successfully")
         return None
 
+# Step 7: Streaming mode
+STREAM_CHUNK_ROWS = 25       # Records per chunk flowing through the stages
+STREAM_FLUSH_SECONDS = 5     # Minimum gap between partial rewrites of the unified CSV
+
+def run_streaming_pipeline(budget=None):
+    """Scrape → standardize → canonical key → geocode → proximity → publish, as a DAG of stages.
+    
+    Scrapers run concurrently and their records flow through bounded channels one chunk at a time, so
+    the unified CSV is rewritten with the records processed so far while slower scrapers are still running.
+    Stage deadlines come from `budget`, as in run_unified_pipeline.
+    """
+    print("🌊 Streaming mode: unified records are published as each source finishes")
+    METRICS.reset()
+    budget = budget or RunBudget()
+    print(f"⏱️ {budget.describe()}")
+    start = time.monotonic()
+    previous_snapshot = load_snapshot(OUTPUT_FILENAME)
+    state = load_state()
+    completed = Journal('completed_sources')
+    geocodes = Journal('geocodes')
+    geocoded = {}   # CANONICAL_KEY -> (LAT, LON, GEOCODE_METHOD) for properties located earlier this run
+    chunks = []
+    last_flush = [None]
+    
+    def standardize_chunk(item):
+        source_name, raw = item
+        std_df, _ = standardize_source(source_name, raw)
+        std_df['SOURCE_NAME'] = source_name
+        std_df['FRESHNESS'] = 'fresh' if source_name in completed else 'cached'
+        std_df = std_df.dropna(how='all', subset=STANDARD_COLUMNS)
+        return std_df if not std_df.empty else None
+    
+    def key_chunk(df):
+        df['FINGERPRINT'] = fingerprint_records(df)
+        df['LOCATION_KEY'] = location_keys(df)
+        df['CANONICAL_KEY'] = canonical_keys(build_link_keys(df))
+        return df
+    
+    def geocode_chunk(df):
+        reused, fresh = split_by_state(df, state)
+        METRICS.cache('location_state', hits=len(reused), misses=len(fresh))
+        fresh['LAT'] = np.nan
+        fresh['LON'] = np.nan
+        fresh['GEOCODE_METHOD'] = 'Failed'
+        # The same property listed by another source, located earlier in this run
+        known = fresh['CANONICAL_KEY'].isin(list(geocoded))
+        METRICS.cache('geocode_run_cache', hits=known.sum(), misses=(~known).sum())
+        located = [geocoded[key] for key in fresh.loc[known, 'CANONICAL_KEY']]
+        for position, column in enumerate(['LAT', 'LON', 'GEOCODE_METHOD']):
+            fresh.loc[known, column] = [location[position] for location in located]
+        todo = fresh[~known].copy()
+        if not todo.empty:
+            geocode_records(todo, show_progress=False, journal=geocodes, deadline=budget.deadline('geocode'))
+            for key, lat, lon, method in todo[['CANONICAL_KEY', 'LAT', 'LON', 'GEOCODE_METHOD']].itertuples(index=False):
+                if pd.notna(key) and pd.notna(lat):
+                    geocoded[key] = (lat, lon, method)
+        return pd.concat([reused, fresh[known], todo])
+    
+    def proximity_chunk(df):
+        return apply_proximity(df, max_drive_time=30)
+    
+    def publish_chunk(df):
+        chunks.append(df)
+        if last_flush[0] is None or time.monotonic() - last_flush[0] >= STREAM_FLUSH_SECONDS:
+            partial = link_and_merge(pd.concat(chunks, ignore_index=True))
+            write_csv_atomically(format_for_csv(partial[OUTPUT_COLUMNS]))
+            last_flush[0] = time.monotonic()
+            print(f"   📤 {len(partial)} unified records published after {last_flush[0] - start:.1f}s")
+    
+    scrape_nodes = [Node(f"scrape_{source_name}",
+                         lambda source_name=source_name: scrape_source(source_name, STREAM_CHUNK_ROWS, completed,
+                                                                       budget.deadline('scrape')),
+                         executor=scraper_executor(source_name))
+                    for source_name in SOURCE_SPECS]
+    nodes = scrape_nodes + [
+        Node('standardize', standardize_chunk, inputs=[node.name for node in scrape_nodes],
+             concurrency=2, executor='thread'),
+        Node('key', key_chunk, inputs=['standardize'], executor='thread'),
+        # One geocoder at a time: Nominatim allows a single client ~1 request/second
+        Node('geocode', geocode_chunk, inputs=['key'], executor='thread'),
+        Node('proximity', proximity_chunk, inputs=['geocode'], executor='thread'),
+        Node('publish', publish_chunk, inputs=['proximity'], executor='thread'),
+    ]
+    # Past the geocode deadline chunks only get centroids, so the DAG drains well before the run deadline
+    run_stage_dag(nodes, budget.remaining('geocode') + 2 * SCRAPER_GRACE_SECONDS)
+    
+    if not chunks:
+        print("❌ No data was processed successfully")
+        return None
+    
+    records = pd.concat(chunks, ignore_index=True)
+    with METRICS.stage('publish'):
+        combined_df = link_and_merge(records)
+        # Merged records' fingerprints, as batch runs store them, so either mode's next run compares like with like
+        combined_df['FINGERPRINT'] = fingerprint_records(combined_df)
+        save_state(pd.concat([records, combined_df], ignore_index=True), state)
+        geocodes.clear()
+        final_df, csv_df = publish_unified_output(combined_df, previous_snapshot,
+                                                  COLUMNAR_OUTPUT and columnar_available())
+    METRICS.rows('publish', len(records), len(final_df))
+    print_summary(final_df, csv_df)
+    export_run_metrics('streaming')
+    completed.clear()
+    return final_df
+
 # Execute the pipeline
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Unified foreclosure data pipeline")
+    parser.add_argument('--stream', action='store_true',
+                        help="publish records as each source finishes instead of after all of them")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile every stage (CPU, memory peak, network/browser waits), scrapers included")
+    parser.add_argument('--profile-dir', help=f"where --profile writes its output (default {PROFILE_ROOT}/<timestamp>)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running, scrape each source on its own cadence and refresh the output after each "
+                             "(scrapers run in-process, so Chrome stays warm between runs)")
+    parser.add_argument('--deadline', metavar='HH:MM',
+                        help="finish by this local time, degrading scrapes and geocoding as needed")
+    parser.add_argument('--budget-minutes', type=float,
+                        help=f"finish within this many minutes (default {RUN_DEADLINE_SECONDS // 60})")
+    parser.add_argument('--non-interactive', action='store_true',
+                        help="start immediately, without the Ctrl+C window (implied when not run from a terminal)")
+    args = parser.parse_args()
+    interactive = not args.non_interactive and sys.stdin.isatty()
+    
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    print("🏠 UNIFIED FORECLOSURE DATA PIPELINE - PRODUCTION VERSION")
+    print("=" * 60)
     print("Starting the Unified Foreclosure Data Pipeline...")
     print("This will:")
     print("1. Run all your scraper scripts")
     print("2. Standardize data into unified format")
     print("3. Add Nashville/Mt. Juliet proximity flags")
     print("4. Save to 'Auction_Info_Unified.csv'")
-    print("\nPress Ctrl+C to cancel, or wait 3 seconds to continue...")
+    if interactive:
+        print(f"\nPress Ctrl+C to cancel, or wait {CANCEL_DELAY_SECONDS} seconds to continue...")
     
     try:
-        time.sleep(3)
-        result = run_unified_pipeline()
-        
-        if result is not None:
-            print(f"\n✅ PIPELINE COMPLETED SUCCESSFULLY!")
-            print(f"🎯 Found {(result['WITHIN_30MIN'] == 'Yes').sum()} properties within 30 minutes of Nashville/Mt. Juliet")
-            print(f"📁 Check 'Auction_Info_Unified.csv' for your unified foreclosure data")
+        if interactive:
+            time.sleep(CANCEL_DELAY_SECONDS)
+        if args.daemon:
+            from scheduler import run_daemon
+            run_daemon(SOURCE_SPECS, lambda: unify_sources('daemon'))
         else:
-            print(f"\n⚠️ Pipeline completed but no data was unified")
+            if args.deadline:
+                budget = RunBudget.until(args.deadline)
+            else:
+                budget = RunBudget(args.budget_minutes * 60 if args.budget_minutes else RUN_DEADLINE_SECONDS)
+            run = run_streaming_pipeline if args.stream else run_unified_pipeline
+            pipeline = lambda: run(budget)
+            result = profile_pipeline(pipeline, args.profile_dir) if args.profile else pipeline()
+        
+            if result is not None:
+                print(f"\n✅ PIPELINE COMPLETED SUCCESSFULLY!")
+                print(f"🎯 Found {(result['WITHIN_30MIN'] == 'Yes').sum()} properties within 30 minutes of Nashville/Mt. Juliet")
+                print(f"📁 Check 'Auction_Info_Unified.csv' for your unified foreclosure data")
+            else:
+                print(f"\n⚠️ Pipeline completed but no data was unified")
             
     except KeyboardInterrupt:
         print(f"\n🛑 Pipeline cancelled by user")
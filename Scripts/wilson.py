@@ -1,52 +1,56 @@
 import time
-import pandas as pd
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-
-# --- Selenium Imports ---
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+from urllib.parse import urljoin
+from browser import USER_AGENT, browser_pool, extract_table_rows, report_page_bytes, soup_table_rows
+from checkpoint import exit_with_partial_results, interrupt_on_sigterm
+from host_guard import guarded_request
+from run_metrics import METRICS, export_on_exit
 
 # --- Configuration ---
 SALES_URL = "https://sales.wilson-assoc.com/"
-CSV_OUTPUT_FILENAME = "wilson_assoc_foreclosures.csv"
+DATASET_DIR = "wilson_assoc_foreclosures"  # One partition per searched state: <DATASET_DIR>/SearchState=TN/sales.csv
+PARTITION_FILENAME = "sales.csv"
 SOURCE_WEBSITE_NAME = "sales.wilson-assoc.com"
 SELENIUM_TIMEOUT = 20  # Timeout for waiting for elements
-STATE_TO_SELECT = "TN" # For Tennessee
+SEARCH_STATES = ["TN", "AR", "MS", "AL", "GA"] # ddlState values; the unifier only reads the TN partition
+SEARCH_WINDOWS = [(0, 30)] # (first, last) day of each search's date range, counted from today
+PARALLEL_SEARCHES = 3 # Searches running at once after the first
+PAGE_WORKERS = 4 # gvSales result pages requested at once
+PAGER_ARGUMENT_PATTERN = re.compile(r"__doPostBack\(\s*'gvSales'\s*,\s*'(Page\$(\d+))'\s*\)")
 
 # --- Helper Function to Fetch Page Content using Selenium ---
-def fetch_sales_data_with_selenium(url):
+def fetch_sales_data_with_selenium(url, search):
     """
     Automates interactions to fetch sales data:
     1. Agrees to terms.
-    2. Sets date range (next 30 days).
-    3. Selects state.
+    2. Sets the search's date range.
+    3. Selects the search's state.
     4. Clicks search.
-    5. Waits for and returns the HTML of the results table.
+    5. Waits for the results table and returns (pages, form_state): the rows of every results page, in
+       page order (None if the search failed), and the results form for search_over_http to replay.
     """
-    html_content = None
-    chrome_options = webdriver.ChromeOptions()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("window-size=1920x1080")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    # Selenium is imported here, not at startup, so the script reaches its first request sooner
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support.ui import Select
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementNotInteractableException
+
+    pages, form_state = None, None
 
     driver = None
     try:
-        print("Initializing Selenium WebDriver for Chrome...")
-        driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=chrome_options)
-        driver.set_page_load_timeout(60)
+        print("Acquiring a headless Chrome session from the browser pool...")
+        with METRICS.stage('wilson_browser_start'):
+            driver = browser_pool().acquire()
 
         print(f"Navigating to URL: {url}")
-        driver.get(url)
+        with METRICS.request(url):
+            driver.get(url)
         time.sleep(3) # Allow initial page elements to settle
 
         # 1. Click "I AGREE" button
@@ -65,12 +69,9 @@ def fetch_sales_data_with_selenium(url):
             print(f"Error clicking 'I AGREE' button: {e_agree}")
             # Continue, as it might already be on the sales page if run before
 
-        # 2. Set Date Range (Next 30 days)
-        print("Setting date range for the next 30 days...")
-        today = datetime.now()
-        date_begin_str = today.strftime("%Y-%m-%d")
-        date_end = today + timedelta(days=30)
-        date_end_str = date_end.strftime("%Y-%m-%d")
+        # 2. Set Date Range
+        date_begin_str, date_end_str = search['begin'], search['end']
+        print(f"Setting date range {date_begin_str} to {date_end_str}...")
 
         try:
             # These are <input type="date">, so we can send keys or use JS
@@ -94,15 +95,15 @@ def fetch_sales_data_with_selenium(url):
             print(f"Error setting date fields: {e_date}")
             raise
 
-        # 3. Select State (Tennessee)
+        # 3. Select State
         try:
-            print(f"Selecting state: {STATE_TO_SELECT}...")
+            print(f"Selecting state: {search['state']}...")
             state_dropdown_element = WebDriverWait(driver, SELENIUM_TIMEOUT).until(
                 EC.presence_of_element_located((By.ID, "ddlState"))
             )
             select_state = Select(state_dropdown_element)
-            select_state.select_by_value(STATE_TO_SELECT)
-            print(f"State '{STATE_TO_SELECT}' selected.")
+            select_state.select_by_value(search['state'])
+            print(f"State '{search['state']}' selected.")
             # This site uses __doPostBack on state change, so wait for potential partial reload
             print("Waiting for 5 seconds after state selection for potential page update...")
             time.sleep(5) 
@@ -137,8 +138,11 @@ def fetch_sales_data_with_selenium(url):
         
         # It's good to wait a bit more for all table rows to render if it's a large table
         time.sleep(5) 
-        html_content = driver.page_source
-        print("Successfully fetched page content with sales data.")
+        report_page_bytes(driver, 'wilson_sales')
+        first_page = browser_page_rows(driver)
+        print(f"Read {len(first_page)} table rows from the first results page.")
+        form_state = read_form_state(driver)
+        pages = [first_page] + fetch_remaining_pages(form_state, driver)
 
     except TimeoutException as te:
         print(f"TimeoutException during automation: {te}")
@@ -155,117 +159,374 @@ def fetch_sales_data_with_selenium(url):
         traceback.print_exc()
     finally:
         if driver:
-            print("Closing Selenium WebDriver.")
-            driver.quit()
+            print("Returning the Chrome session to the pool.")
+            browser_pool().release(driver)
             
-    return html_content
+    return pages, form_state
+
+def browser_page_rows(driver):
+    """The current gvSales page's rows, read inside the browser or, failing that, from the page source"""
+    from bs4 import BeautifulSoup
+
+    rows = extract_table_rows(driver, 'table#gvSales')
+    if rows is None:
+        table_body = results_table_body(BeautifulSoup(driver.page_source, 'html.parser'))
+        rows = soup_table_rows(table_body) if table_body else []
+    return rows
+
+# --- Replaying the results form over HTTP ---
+# The form as the browser would post it (FormData leaves out submit buttons), the search button and the gvSales pager links
+FORM_STATE_SCRIPT = """
+const form = document.forms[0];
+if (!form) return null;
+const search = document.getElementById('btnSearch');
+return {
+    action: form.action,
+    fields: Array.from(new FormData(form).entries()),
+    search_button: search ? [search.name, search.value] : null,
+    links: Array.from(document.querySelectorAll('#gvSales a'), a => a.getAttribute('href') || ''),
+};
+"""
+
+def read_form_state(driver):
+    """FORM_STATE_SCRIPT's result plus the browser's cookies, or None if the form can't be read"""
+    try:
+        state = driver.execute_script(FORM_STATE_SCRIPT)
+        if state:
+            state['cookies'] = driver.get_cookies()
+        return state
+    except Exception as e:
+        print(f"Could not read the results form: {e}")
+        return None
+
+def http_session(form_state):
+    """A requests session carrying the browser's cookies, so postbacks continue its search session"""
+    import requests
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    for cookie in form_state.get('cookies', []):
+        session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    return session
+
+def pager_arguments(links):
+    """{page number: postback argument} for the numbered gvSales pager links"""
+    arguments = {}
+    for link in links:
+        for argument, number in PAGER_ARGUMENT_PATTERN.findall(link):
+            arguments[int(number)] = argument
+    return arguments
+
+def soup_form_state(soup, url):
+    """FORM_STATE_SCRIPT's result, from a postback response"""
+    form = soup.find('form')
+    fields = []
+    for element in form.find_all(['input', 'select', 'textarea']) if form else []:
+        name = element.get('name')
+        if not name or element.has_attr('disabled'):
+            continue
+        if element.name == 'input':
+            kind = (element.get('type') or 'text').lower()
+            if kind in ('submit', 'button', 'image', 'reset', 'file'):
+                continue
+            if kind in ('checkbox', 'radio'):
+                if element.has_attr('checked'):
+                    fields.append((name, element.get('value', 'on')))
+                continue
+            fields.append((name, element.get('value', '')))
+        elif element.name == 'select':
+            options = element.find_all('option')
+            selected = [option for option in options if option.has_attr('selected')] or options[:1]
+            fields.extend((name, option.get('value', option.text)) for option in selected)
+        else:
+            fields.append((name, element.text))
+    table = soup.find('table', id='gvSales')
+    return {'action': urljoin(url, form.get('action', '')) if form else url,
+            'fields': fields,
+            'links': [link.get('href', '') for link in table.find_all('a')] if table else []}
+
+def post_form(session, state, overrides):
+    """Post the form with the fields in `overrides` (name -> value) replaced; returns the response HTML"""
+    fields = [(name, value) for name, value in state['fields'] if name not in overrides] + list(overrides.items())
+    with guarded_request(state['action']) as call:
+        response = session.post(state['action'], data=fields, timeout=30)
+        call['status'] = response.status_code
+    response.raise_for_status()
+    return response.text
 
-# --- Function to Parse the Sales Data Table ---
-def parse_sales_data(html_content):
+def post_page(session, state, argument):
+    """Replay a page's form with a gvSales pager postback; returns the response HTML"""
+    return post_form(session, state, {'__EVENTTARGET': 'gvSales', '__EVENTARGUMENT': argument})
+
+def results_table_body(soup):
+    """gvSales' <tbody>, or the table itself: the GridView's raw HTML has none (only browsers add one)"""
+    table = soup.find('table', id='gvSales')
+    if not table:
+        return None
+    return table.find('tbody', recursive=False) or table
+
+@contextmanager
+def interruptible_pool(max_workers):
+    """A thread pool that, when interrupted (SIGTERM, Ctrl+C), drops its queued work instead of waiting for it"""
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        yield pool
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
+def fetch_other_pages(session, first_page_state):
     """
-    Parses the HTML content to extract sales data from the table.
+    Fetches gvSales pages over HTTP as concurrent postbacks.
+    Every page the first pager links to is requested in one parallel wave, each from a copy of that page's
+    form state. The pager only shows a window of pages, so each wave's responses reveal the next window.
+    Returns ({page number: rows}, [page numbers that failed]).
     """
-    if not html_content:
-        print("HTML content is empty, cannot parse.")
+    from bs4 import BeautifulSoup
+
+    pages, failed = {}, []
+    frontier = {number: (argument, first_page_state)
+                for number, argument in pager_arguments(first_page_state['links']).items()}
+    seen = {1} | set(frontier)
+    with interruptible_pool(PAGE_WORKERS) as pool:
+        while frontier:
+            print(f"Requesting result pages {', '.join(str(number) for number in sorted(frontier))}...")
+            futures = {pool.submit(post_page, session, state, argument): number
+                       for number, (argument, state) in frontier.items()}
+            frontier = {}
+            for future in as_completed(futures):
+                number = futures[future]
+                try:
+                    soup = BeautifulSoup(future.result(), 'html.parser')
+                except Exception as e:
+                    print(f"Page {number}: postback failed: {e}")
+                    failed.append(number)
+                    continue
+                table_body = results_table_body(soup)
+                if table_body is None:
+                    print(f"Page {number}: response has no gvSales table")
+                    failed.append(number)
+                    continue
+                pages[number] = soup_table_rows(table_body)
+                state = soup_form_state(soup, first_page_state['action'])
+                for next_number, argument in pager_arguments(state['links']).items():
+                    if next_number not in seen:
+                        seen.add(next_number)
+                        frontier[next_number] = (argument, state)
+    return pages, sorted(failed)
+
+def fetch_pages_in_browser(driver, numbers):
+    """Fallback for pages the HTTP postbacks couldn't load: page through gvSales in the browser, one at a time"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    pages = {}
+    for number in numbers:
+        try:
+            table = driver.find_element(By.ID, "gvSales")
+            driver.execute_script("__doPostBack('gvSales', arguments[0]);", f"Page${number}")
+            WebDriverWait(driver, SELENIUM_TIMEOUT).until(EC.staleness_of(table))
+            WebDriverWait(driver, SELENIUM_TIMEOUT).until(EC.presence_of_element_located((By.ID, "gvSales")))
+            pages[number] = browser_page_rows(driver)
+        except Exception as e:
+            print(f"Page {number}: could not load it in the browser either: {e}")
+    return pages
+
+def fetch_remaining_pages(form_state, driver=None, session=None):
+    """
+    Rows of gvSales pages 2..n, in page order; [] when the results fit on one page.
+    Pages the postbacks can't load are paged to in the browser when there is one, otherwise this raises.
+    """
+    if not form_state or not pager_arguments(form_state['links']):
         return []
+    with METRICS.stage('wilson_pages'):
+        pages, failed = fetch_other_pages(session or http_session(form_state), form_state)
+        if failed and driver is None:
+            raise RuntimeError(f"result pages {failed} could not be fetched")
+        if failed:
+            pages.update(fetch_pages_in_browser(driver, failed))
+    METRICS.rows('wilson_pages', rows_out=len(pages))
+    print(f"Fetched {len(pages)} more result pages.")
+    return [pages[number] for number in sorted(pages)]
 
-    soup = BeautifulSoup(html_content, 'html.parser')
-    sales_list = []
+# --- Multi-state searches ---
+def planned_searches(states=SEARCH_STATES, windows=SEARCH_WINDOWS, today=None):
+    """One search per state and date window: [{'state', 'begin', 'end'}], dates as the form's YYYY-MM-DD"""
+    today = today or datetime.now()
+    return [{'state': state,
+             'begin': (today + timedelta(days=first_day)).strftime("%Y-%m-%d"),
+             'end': (today + timedelta(days=last_day)).strftime("%Y-%m-%d")}
+            for state in states for first_day, last_day in windows]
 
-    sales_table = soup.find('table', id='gvSales')
-    if not sales_table:
-        print("Could not find the sales table with id='gvSales'.")
-        # Check if the "no sales" message is present
-        no_sales_message = soup.find(text=lambda t: "Selected parameters returned no sales" in t if t else False)
-        if no_sales_message:
-            print("Found 'Selected parameters returned no sales' message. No data to parse.")
-        else:
-            print("Sales table not found, and no 'no sales' message detected. HTML structure might have changed.")
-            # print(f"HTML snippet (first 2000 chars): {html_content[:2000]}") # For debugging
-        return sales_list
+def search_over_http(form_state, search):
+    """
+    Runs another search without a browser, by posting a finished search's form with a different state and
+    date range (what the page would submit with JavaScript off). Returns the rows of every results page.
+    """
+    from bs4 import BeautifulSoup
 
-    print("Successfully found sales table with id='gvSales'.")
+    if not form_state.get('search_button'):
+        raise RuntimeError("the results form has no search button")
+    session = http_session(form_state)
+    button_name, button_value = form_state['search_button']
+    fields = {'__EVENTTARGET': '', '__EVENTARGUMENT': '', 'ddlState': search['state'],
+              'txtRangeBegin': search['begin'], 'txtRangeEnd': search['end'], button_name: button_value}
+    soup = BeautifulSoup(post_form(session, form_state, fields), 'html.parser')
+    table_body = results_table_body(soup)
+    if table_body is None:
+        raise RuntimeError("response has no gvSales table")
+    state = soup_form_state(soup, form_state['action'])
+    return [soup_table_rows(table_body)] + fetch_remaining_pages(state, session=session)
 
-    table_body = sales_table.find('tbody')
-    if not table_body:
-        print("Could not find tbody within the sales table.")
-        return sales_list
-    
-    rows = table_body.find_all('tr')
+def run_searches(url, searches, results=None):
+    """
+    Runs every search and returns their pages, in the order of `searches` (None for a failed search).
+    The first search runs in Chrome, which agrees to the terms and yields a results form; the rest replay
+    that form over HTTP, PARALLEL_SEARCHES at a time. Searches that fail over HTTP, or all of them if the
+    first produced no form, run in pooled browsers instead, also PARALLEL_SEARCHES at a time.
+    A `results` list is filled in place as searches finish, so an interrupted caller keeps the finished ones.
+    """
+    results = results if results is not None else [None] * len(searches)
+    print(f"--- Search 1/{len(searches)}: {searches[0]['state']} {searches[0]['begin']} to {searches[0]['end']} ---")
+    results[0], form_state = fetch_sales_data_with_selenium(url, searches[0])
+    remaining = list(range(1, len(searches)))
 
+    if form_state and remaining:
+        print(f"Replaying the search form for {len(remaining)} more searches over HTTP...")
+        with METRICS.stage('wilson_http_searches'), interruptible_pool(PARALLEL_SEARCHES) as pool:
+            futures = {pool.submit(search_over_http, form_state, searches[index]): index for index in remaining}
+            remaining = []
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"Search {searches[index]['state']} {searches[index]['begin']}: HTTP replay failed ({e}), "
+                          f"retrying in a browser")
+                    remaining.append(index)
+
+    if remaining:
+        print(f"Running {len(remaining)} searches in the browser...")
+        browser_pool().grow(PARALLEL_SEARCHES)
+        with interruptible_pool(PARALLEL_SEARCHES) as pool:
+            futures = {pool.submit(fetch_sales_data_with_selenium, url, searches[index]): index
+                       for index in sorted(remaining)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()[0]
+    return results
+
+SALE_COLUMNS = ['SourceWebsite', 'SaleDate', 'SaleTime', 'PriorSaleDate', 'PropertyAddress', 'City', 'County',
+                'State', 'ZipCode', 'SaleLocation', 'Auctioneer']
+
+def sales_from_rows(rows):
+    """Sale dicts from gvSales rows (see browser.TABLE_ROWS_SCRIPT), however they were read"""
+    sales_list = []
     if not rows or len(rows) <= 1: # First row is header
         print("No data rows found in the sales table.")
         return sales_list
 
     # Column headers from the HTML: Date, Time, Prior Sale Date, Address, City, County, State, Zip, Location, Auctioneer
-    # Skip header row (index 0)
-    for row_index, row in enumerate(rows[1:], start=1):
-        cells = row.find_all('td')
+    # Skip the header row and the pager (a nested table)
+    for row_index, row in enumerate(rows):
+        if row['header'] or row['nested']:
+            continue
+        cells = row['cells']
         
         if len(cells) == 10: # Expecting 10 columns
-            try:
-                sale_date = cells[0].text.strip()
-                sale_time = cells[1].text.strip()
-                prior_sale_date = cells[2].text.strip()
-                address = cells[3].text.strip()
-                city = cells[4].text.strip()
-                county = cells[5].text.strip()
-                state = cells[6].text.strip()
-                zip_code = cells[7].text.strip()
-                location = cells[8].text.strip()
-                auctioneer = cells[9].text.strip()
-
-                sales_list.append({
-                    'SourceWebsite': SOURCE_WEBSITE_NAME,
-                    'SaleDate': sale_date,
-                    'SaleTime': sale_time,
-                    'PriorSaleDate': prior_sale_date,
-                    'PropertyAddress': address, # Using a common name
-                    'City': city,
-                    'County': county,
-                    'State': state,
-                    'ZipCode': zip_code,
-                    'SaleLocation': location, # Using a more descriptive name
-                    'Auctioneer': auctioneer
-                })
-            except Exception as e:
-                print(f"Row {row_index}: Error parsing row. Details: {e}. Row content: {row.get_text(strip=True, separator='|')}")
-                continue
+            sale_date, sale_time, prior_sale_date, address, city, county, state, zip_code, location, auctioneer = cells
+            sales_list.append({
+                'SourceWebsite': SOURCE_WEBSITE_NAME,
+                'SaleDate': sale_date,
+                'SaleTime': sale_time,
+                'PriorSaleDate': prior_sale_date,
+                'PropertyAddress': address, # Using a common name
+                'City': city,
+                'County': county,
+                'State': state,
+                'ZipCode': zip_code,
+                'SaleLocation': location, # Using a more descriptive name
+                'Auctioneer': auctioneer
+            })
         else:
             # Check for "colspan" message like "No sales found for this criteria"
-            if len(cells) == 1 and cells[0].get('colspan'):
-                message = cells[0].text.strip()
-                print(f"Found a single cell row (likely a message): {message}")
+            if row['colspan']:
+                print(f"Found a single cell row (likely a message): {cells[0]}")
             else:
-                print(f"Row {row_index}: Skipping row, expected 10 cells, got {len(cells)}. Content: {row.get_text(strip=True, separator='|')}")
+                print(f"Row {row_index}: Skipping row, expected 10 cells, got {len(cells)}. Content: {'|'.join(cells)}")
             
     return sales_list
 
+# --- Partitioned output ---
+def partition_path(state, root=DATASET_DIR):
+    return os.path.join(root, f"SearchState={state}", PARTITION_FILENAME)
+
+def write_partitions(df, states, root=DATASET_DIR):
+    """Replace the partitions of the given states (each written atomically); other states keep their last data"""
+    for state in states:
+        path = partition_path(state, root)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df[df['SearchState'] == state].to_csv(f"{path}.tmp", index=False, encoding='utf-8')
+        os.replace(f"{path}.tmp", path)
+    return root
+
 # --- Main Script Logic ---
-if __name__ == "__main__":
+def main():
+    """
+    Scrape the Wilson & Associates sales search for every state and window into the DATASET_DIR partitions.
+    When stopped (SIGTERM, Ctrl+C), the states whose searches all finished are still written.
+    Returns True when it was stopped and saved those partial results.
+    """
     print(f"--- Starting Scraper for {SOURCE_WEBSITE_NAME} ---")
-    
-    html_content_selenium = fetch_sales_data_with_selenium(SALES_URL)
-    
-    if html_content_selenium:
-        print("\n--- Parsing Sales Data (from Selenium-fetched content) ---")
-        sales_entries = parse_sales_data(html_content_selenium)
-        print(f"Found {len(sales_entries)} sales entries.")
-        
-        if sales_entries:
-            df = pd.DataFrame(sales_entries)
-            
-            print(f"\n--- First 5 Sales Entries ---")
-            print(df.head().to_string())
-            
-            try:
-                df.to_csv(CSV_OUTPUT_FILENAME, index=False, encoding='utf-8')
-                print(f"\nData successfully saved to {CSV_OUTPUT_FILENAME}")
-            except Exception as e:
-                print(f"Error saving data to CSV: {e}")
-        else:
-            print("No sales data was extracted.")
+    searches = planned_searches()
+    results = [None] * len(searches)
+    interrupted = saved = False
+    try:
+        run_searches(SALES_URL, searches, results)
+    except KeyboardInterrupt:
+        interrupted = True
+        unfinished = sum(pages is None for pages in results)
+        print(f"\n⏰ Stopped with {unfinished} of {len(searches)} searches unfinished; saving the states that completed")
+
+    print("\n--- Parsing Sales Data ---")
+    sales_entries, searched_states = [], set()
+    failed_states = {search['state'] for search, pages in zip(searches, results) if pages is None}
+    with METRICS.stage('wilson_parse'):
+        for search, pages in zip(searches, results):
+            if pages is None:
+                continue
+            searched_states.add(search['state'])
+            for page_rows in pages:
+                sales_entries.extend(dict(sale, SearchState=search['state']) for sale in sales_from_rows(page_rows))
+    METRICS.rows('wilson_parse', rows_out=len(sales_entries))
+    print(f"Found {len(sales_entries)} sales entries across {len(searched_states)} states.")
+    if failed_states:
+        print(f"Searches failed for {', '.join(sorted(failed_states))}; their partitions keep the last run's data.")
+
+    # A state is only replaced when all of its windows succeeded, so a failed window can't drop its sales
+    complete_states = searched_states - failed_states
+    if complete_states:
+        import pandas as pd
+        df = pd.DataFrame(sales_entries, columns=SALE_COLUMNS + ['SearchState']).drop_duplicates()
+
+        print(f"\n--- First 5 Sales Entries ---")
+        print(df.head().to_string())
+
+        try:
+            write_partitions(df, sorted(complete_states))
+            print(f"\nData successfully saved to {DATASET_DIR}/ ({', '.join(sorted(complete_states))})")
+            saved = True
+        except Exception as e:
+            print(f"Error saving data to CSV: {e}")
     else:
-        print("Failed to fetch HTML content using Selenium. Scraper cannot proceed.")
-        
+        print("No search completed. Scraper cannot proceed.")
+
     print(f"\n--- End of Scraper for {SOURCE_WEBSITE_NAME} ---")
+    return interrupted and saved
+
+if __name__ == "__main__":
+    export_on_exit()
+    interrupt_on_sigterm()
+    if main():
+        exit_with_partial_results()